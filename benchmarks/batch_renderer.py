@@ -0,0 +1,110 @@
+"""GL calls and CPU time of one radar frame: immediate mode vs the batched VBO renderer.
+
+Builds the polygon layer of a seeded simulation the way Radar draws it (15
+soft-edge layers, the body and a 33-vertex gradient fan per noise point) and
+sends it through a GL stand-in that only counts calls. Immediate mode pays one
+Python -> GL call per vertex, the BatchRenderer one upload and one glDrawArrays
+per run of primitives, with the soft edge and fill taken from the cached
+Polygon.mesh. Real PyOpenGL calls cost more than the stand-in's, so
+the immediate-mode times are a lower bound.
+
+Run from the repository root, so that the radar package is importable:
+
+    python -m benchmarks.batch_renderer --noise-points 50 --noise-points 200
+"""
+import math
+import time
+
+import click
+import numpy as np
+
+from radar.BatchRenderer import BatchRenderer, unit_circle
+from radar.Simulation import Simulation
+
+
+class CountingGL:
+    """Accepts any gl* call and only counts it"""
+    def __init__(self):
+        self.calls = 0
+
+    def __getattr__(self, name):
+        def call(*args):
+            self.calls += 1
+            return 1
+        return call
+
+
+def layers(polygon):
+    """Soft-edge rings and the body of a polygon as (vertices, rgba) like Radar.draw_polygon"""
+    r, g, b = polygon.color
+    vertices = np.array(polygon.vertices)
+    center = vertices.mean(axis=0)
+    for layer in range(14, -1, -1):
+        yield center + (vertices - center) * (1.0 + layer * 0.008), (r * 0.3, g * 0.3, b * 0.3, 0.1 * (1 - layer / 15))
+    yield vertices, (r, g, b, 0.7)
+
+
+def noise(polygon, points, rng):
+    centers = np.array(polygon.vertices).mean(axis=0) + rng.uniform(-0.3, 0.3, (points, 2))
+    return centers, rng.uniform(0.02, 0.08, points)
+
+
+def immediate_frame(gl, scene):
+    for polygon, centers, radii in scene:
+        for ring, color in layers(polygon):
+            gl.glBegin(9)
+            gl.glColor4f(*color)
+            for x, y in ring.tolist():
+                gl.glVertex2f(x, y)
+            gl.glEnd()
+        r, g, b = polygon.color
+        for (x, y), radius in zip(centers.tolist(), radii.tolist()):
+            gl.glBegin(6)
+            gl.glColor4f(r, g, b, 0.2)
+            gl.glVertex2f(x, y)
+            gl.glColor4f(r, g, b, 0)
+            for i in range(33):
+                angle = 2.0 * math.pi * i / 32
+                gl.glVertex2f(x + radius * math.cos(angle), y + radius * math.sin(angle))
+            gl.glEnd()
+
+
+def batched_frame(renderer, scene):
+    batch = renderer.frame
+    renderer.begin_frame()
+    for polygon, centers, radii in scene:
+        r, g, b = polygon.color
+        mesh = polygon.mesh
+        batch.triangles(mesh.edge_fill, mesh.edge_colors(polygon.color))
+        batch.triangles(mesh.fill, (r, g, b, 0.7))
+        rims = centers[:, None] + radii[:, None, None] * unit_circle(32)
+        batch.fans(centers, rims, (r, g, b, 0.2), (r, g, b, 0))
+    renderer.flush()
+    return renderer.end_frame()
+
+
+@click.command()
+@click.option('--noise-points', 'counts', multiple=True, type=int, default=[50, 200], help='Noise points per polygon, repeatable.')
+@click.option('--frames', default=50, help='Frames per measurement.')
+@click.option('--seed', default=1, help='Simulation seed of the polygons.')
+def main(counts, frames, seed):
+    simulation = Simulation(seed=seed)
+    polygons = simulation.polygon_manager.get_polygons()
+    rng = np.random.default_rng(seed)
+    batched_frame(BatchRenderer(CountingGL()), [])  # Imports OpenGL for the GL constants
+    for count in counts:
+        scene = [(polygon,) + noise(polygon, count, rng) for polygon in polygons]
+        results = []
+        for draw, gl in ((immediate_frame, CountingGL()), (batched_frame, None)):
+            target = gl if gl else BatchRenderer(CountingGL())
+            started = time.perf_counter()
+            for frame in range(frames):
+                draw(target, scene)
+            results.append(((time.perf_counter() - started) / frames, (gl or target.gl).calls // frames))
+        (old_time, old_calls), (new_time, new_calls) = results
+        print(f'{len(polygons)} polygons x {count:4d} noise points: immediate {old_calls:6d} GL calls '
+              f'{old_time * 1000:7.2f} ms, batched {new_calls:3d} GL calls {new_time * 1000:6.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Per-command NLP latency of AlgorithmRecognizer.recognize.
+
+Runs a corpus of recorded command strings (one per line) through the
+recognizer and, for comparison, through the old analysis path that built and
+syntax-parsed a fresh natasha Doc at every step.
+
+Run from the repository root, so that the radar package is importable:
+
+    python -m benchmarks.nlp_commands --corpus benchmarks/commands.txt
+"""
+import contextlib
+import io
+import time
+from pathlib import Path
+
+import click
+
+from radar.__main__ import prepare_NER_parser
+from radar.AlgorithmRecognition import AlgorithmRecognizer
+from radar.LazyImport import lazy_import
+from radar.TrackStore import TrackStore
+
+natasha = lazy_import('natasha')
+
+
+class CommandTarget:
+    """Just the radar state the recognizer touches"""
+    def __init__(self, objects=100):
+        tracks = TrackStore(objects)
+        self.moving_objects = [
+            tracks.add(target_id=i, start_pos=[1.0, 1.0], control_point=[0.0, 0.0], trajectory_type='straight',
+                       speed_factor=0.1, creation_time=0.0)
+            for i in range(1, objects + 1)
+        ]
+        self.moving_objects_dict = tracks.by_id
+        self.show_trajectory_ids = set()
+        self.sectors = []
+
+    def create_sector(self, distance_km, angle, type_sector):
+        self.sectors.append((distance_km, angle, type_sector))
+
+
+def legacy_analysis(text, segmenter, syntax_parser, morph, passes=5):
+    """What one command used to cost: a segmented and syntax-parsed Doc plus uncached parses per step"""
+    for _ in range(passes):
+        doc = natasha.Doc(text)
+        doc.segment(segmenter)
+        doc.parse_syntax(syntax_parser)
+        for token in doc.tokens:
+            morph.parse(token.text)[0].normal_form
+
+
+def time_per_command(function, commands, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for command in commands:
+            with contextlib.redirect_stdout(io.StringIO()):
+                function(command)
+    return (time.perf_counter() - started) / (repeat * len(commands))
+
+
+@click.command()
+@click.option('--corpus', type=Path, default=Path(__file__).with_name('commands.txt'), help='One command string per line.')
+@click.option('--repeat', default=20, help='Passes over the corpus.')
+def main(corpus: Path, repeat: int):
+    commands = [line.strip().lower() for line in corpus.read_text(encoding='utf-8').splitlines() if line.strip()]
+    segmenter, syntax_parser, morph = prepare_NER_parser()
+    recognizer = AlgorithmRecognizer(CommandTarget(), segmenter, syntax_parser, morph)
+
+    legacy = time_per_command(lambda c: legacy_analysis(c, segmenter, syntax_parser, morph.morph), commands, repeat)
+    current = time_per_command(recognizer.recognize, commands, repeat)
+    print(f'{len(commands)} commands x {repeat}')
+    print(f'legacy analysis: {legacy * 1000:8.3f} ms/command')
+    print(f'recognize():     {current * 1000:8.3f} ms/command')
+    print(f'speed-up:        {legacy / current:8.1f}x')
+    print(f'morph cache:     {morph.stats()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Throughput and randomized round-trip check of the number-word transducer.
+
+Spells random numbers with the NUM_WORDS lemmas, runs them through
+NumberTransducer and checks the digits come back, then measures how many
+commands per second the transducer rewrites.
+
+Run from the repository root, so that the radar package is importable:
+
+    python -m benchmarks.number_transducer --cases 20000 --seed 1
+"""
+import random
+import time
+from pathlib import Path
+
+import click
+
+from radar.NumberParser import NUM_WORDS, TRANSDUCER, convert_number_tokens
+
+WORD_BY_VALUE = {}
+for word, value in NUM_WORDS.items():
+    WORD_BY_VALUE.setdefault(value, word)  # Keeps "один"/"два" over "одна"/"две"
+
+
+def spell(number: int):
+    """Normal forms of a number below 10^12, e.g. 2300 -> ['два', 'тысяча', 'триста']"""
+    if number == 0:
+        return [WORD_BY_VALUE[0]]
+    words = []
+    for multiplier in (1_000_000_000, 1_000_000, 1000, 1):
+        group, number = divmod(number, multiplier)
+        if not group:
+            continue
+        hundreds, rest = divmod(group, 100)
+        if hundreds:
+            words.append(WORD_BY_VALUE[hundreds * 100])
+        if rest >= 20:
+            words.append(WORD_BY_VALUE[rest - rest % 10])
+            rest %= 10
+        if rest:
+            words.append(WORD_BY_VALUE[rest])
+        if multiplier > 1:
+            words.append(WORD_BY_VALUE[multiplier])
+    return words
+
+
+def check_round_trips(cases: int, rng: random.Random) -> int:
+    failures = 0
+    for _ in range(cases):
+        number = rng.choice([rng.randrange(100), rng.randrange(1000), rng.randrange(10 ** 6), rng.randrange(10 ** 11)])
+        other = rng.randrange(1000)
+        # A number alone, and two numbers separated by a command word
+        words = spell(number) + ['градус'] + spell(other)
+        expected = [str(number), 'градус', str(other)]
+        got = TRANSDUCER.rewrite(words, words)
+        if got != expected:
+            failures += 1
+            if failures <= 10:
+                print(f'FAIL {" ".join(words)!r}: {got} != {expected}')
+    return failures
+
+
+@click.command()
+@click.option('--cases', default=20000, help='Random numbers to round-trip.')
+@click.option('--seed', default=0, help='Seed of the random cases.')
+@click.option('--corpus', type=Path, default=Path(__file__).with_name('commands.txt'), help='Commands for the throughput run.')
+@click.option('--repeat', default=2000, help='Passes over the corpus.')
+def main(cases: int, seed: int, corpus: Path, repeat: int):
+    failures = check_round_trips(cases, random.Random(seed))
+    print(f'round trips: {cases - failures}/{cases} passed')
+
+    import pymorphy3
+    from radar.MorphCache import MorphCache
+    morph = MorphCache(pymorphy3.MorphAnalyzer())
+    commands = []
+    for line in corpus.read_text(encoding='utf-8').splitlines():
+        tokens = line.lower().replace(',', ' ').replace('.', ' ').split()
+        if tokens:
+            commands.append((tokens, [morph.normal_form(token) for token in tokens]))
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for tokens, normal_forms in commands:
+            convert_number_tokens(tokens, normal_forms)
+    elapsed = time.perf_counter() - started
+    print(f'throughput: {repeat * len(commands) / elapsed:,.0f} commands/s')
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
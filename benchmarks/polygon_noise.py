@@ -0,0 +1,96 @@
+"""Per-frame cost of the polygon radar noise at several densities: NoiseField vs the per-point loop.
+
+The old draw_polygon ran the O(vertices) point_in_polygon test for every noise
+point and vertex, and evaluated sin/cos per point, every frame. The NoiseField
+keeps only the points found inside at generation and animates all polygons with
+a handful of NumPy calls; the glow fans are built in one batch call. The two are
+also checked against each other.
+
+Run from the repository root, so that the radar package is importable:
+
+    python -m benchmarks.polygon_noise --noise-points 50 --noise-points 500
+"""
+import math
+import random
+import time
+
+import click
+import numpy as np
+
+from radar.BatchRenderer import GeometryBatch, unit_circle
+from radar.Noise import RadarNoise, NoiseField
+from radar.Simulation import Simulation
+
+
+def legacy_glows(polygons, current_time):
+    """Glow centers, radii and alphas the way the old draw_polygon computed them"""
+    glows = []
+    for polygon in polygons:
+        noise = polygon.noise
+        for x, y, intensity, speed, phase, radius in zip(*(getattr(noise, name).tolist() for name in
+                                                             ('x', 'y', 'intensity', 'speed', 'phase', 'radius'))):
+            if noise.point_in_polygon(x, y):
+                time_factor = current_time * speed + noise.time_offset
+                wave = math.sin(time_factor + phase)
+                glows.append((x + 0.02 * math.cos(time_factor), y + 0.02 * math.sin(time_factor),
+                              radius, intensity * (0.5 + 0.5 * wave) * 0.7))
+    for polygon in polygons:
+        scan_angle = (current_time * 2) % (2 * math.pi)
+        for vertex in polygon.vertices:
+            if polygon.noise.point_in_polygon(vertex[0], vertex[1]):
+                angle_diff = abs(math.atan2(vertex[1], vertex[0]) - scan_angle)
+                if angle_diff < 0.3:
+                    glows.append((vertex[0], vertex[1], 0.07, 0.2 * (1 - angle_diff / 0.3)))
+    return glows
+
+
+def legacy_frame(polygons, current_time, batch):
+    for x, y, radius, alpha in legacy_glows(polygons, current_time):
+        rim = [(x + radius * math.cos(2.0 * math.pi * i / 32), y + radius * math.sin(2.0 * math.pi * i / 32))
+               for i in range(33)]
+        batch.fan((x, y), rim, (1.0, 0.0, 0.0, alpha), (1.0, 0.0, 0.0, 0.0))
+
+
+def field_frame(field, current_time, batch):
+    centers, radii, colors = field.glows(current_time)
+    rim_colors = colors.copy()
+    rim_colors[:, 3] = 0
+    batch.fans(centers, centers[:, None] + radii[:, None, None] * unit_circle(32), colors, rim_colors)
+
+
+def build(simulation, points, seed):
+    polygons = simulation.polygon_manager.get_polygons()
+    rng = random.Random(seed)
+    for polygon in polygons:
+        polygon.noise = RadarNoise(polygon.vertices, rng, points)
+    field = NoiseField()
+    field.update([polygon.noise for polygon in polygons], [polygon.color for polygon in polygons])
+    return polygons, field
+
+
+@click.command()
+@click.option('--noise-points', 'counts', multiple=True, type=int, default=[50, 200, 1000], help='Noise points per polygon, repeatable.')
+@click.option('--frames', default=50, help='Frames per measurement.')
+@click.option('--seed', default=1, help='Simulation seed of the polygons.')
+def main(counts, frames, seed):
+    simulation = Simulation(seed=seed)
+    for count in counts:
+        polygons, field = build(simulation, count, seed)
+        centers, radii, colors = field.glows(12.3)
+        expected = np.array(legacy_glows(polygons, 12.3)).reshape(-1, 4)
+        error = np.abs(np.column_stack((centers, radii, colors[:, 3])) - expected).max() if len(expected) else 0.0
+        timings = []
+        for draw in (lambda now, batch: legacy_frame(polygons, now, batch), lambda now, batch: field_frame(field, now, batch)):
+            batch = GeometryBatch()
+            started = time.perf_counter()
+            for frame in range(frames):
+                draw(frame * 0.02, batch)
+                batch.clear()
+            timings.append((time.perf_counter() - started) / frames)
+        print(f'{len(polygons)} polygons x {count:5d} points ({len(radii):5d} glows): per-point loop '
+              f'{timings[0] * 1000:8.3f} ms, NoiseField {timings[1] * 1000:7.3f} ms '
+              f'({timings[0] / timings[1]:5.1f}x), max difference {error:.1e}')
+
+
+if __name__ == '__main__':
+    main()
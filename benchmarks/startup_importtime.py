@@ -0,0 +1,95 @@
+"""Startup import-time benchmark for the radar entry point.
+
+Runs ``python -X importtime`` on the modules imported by ``radar --help`` and
+records the numbers, so a heavy import sneaking back into module scope shows up.
+
+Run from the repository root, so that the radar package is importable:
+
+    python -m benchmarks.startup_importtime --output importtime.json
+    python -m benchmarks.startup_importtime --baseline importtime.json
+"""
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import click
+
+# Modules that must never be imported by the entry point itself
+HEAVY_MODULES = ['torch', 'transformers', 'tokenizers', 'natasha', 'pymorphy3']
+# The headless simulation and the command parser must also run without a display
+DISPLAY_MODULES = ['pygame', 'OpenGL']
+ENTRY_POINTS = {
+    'radar.__main__': HEAVY_MODULES + DISPLAY_MODULES,
+    'radar.Radar': HEAVY_MODULES,
+    'radar.Simulation': HEAVY_MODULES + DISPLAY_MODULES,
+    'radar.AlgorithmRecognition': HEAVY_MODULES + DISPLAY_MODULES,
+}
+
+
+def measure_importtime(module: str) -> dict:
+    """Import a module in a fresh interpreter with -X importtime and parse its report"""
+    code = f"import {module}"
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f'Cannot import {module}:\n{process.stderr}')
+    imports = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports[name.strip()] = {'self_us': int(self_us), 'cumulative_us': int(cumulative_us)}
+    return imports
+
+
+def measure_help_wallclock(repeat: int) -> float:
+    """Best wall-clock time of `python -m radar --help`"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'radar', '--help'], capture_output=True, check=True)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@click.command()
+@click.option('--repeat', default=5, help='Runs of `radar --help`, the best one is reported.')
+@click.option('--output', type=Path, default=None, help='Write the measurements to this JSON file.')
+@click.option('--baseline', type=Path, default=None, help='Compare with a previous JSON report.')
+@click.option('--tolerance', default=0.25, help='Allowed relative slowdown against the baseline.')
+def main(repeat: int, output: Path, baseline: Path, tolerance: float):
+    report = {'python': sys.version.split()[0], 'entry_points': {}}
+    failed = False
+    for module, forbidden in ENTRY_POINTS.items():
+        imports = measure_importtime(module)
+        heavy = [name for name in imports if name.split('.')[0] in forbidden]
+        slowest = sorted(imports.items(), key=lambda item: item[1]['self_us'], reverse=True)[:10]
+        report['entry_points'][module] = {
+            'cumulative_us': imports[module]['cumulative_us'],
+            'heavy_modules': sorted(set(name.split('.')[0] for name in heavy)),
+            'slowest': {name: stats['self_us'] for name, stats in slowest},
+        }
+        print(f'{module}: {imports[module]["cumulative_us"] / 1000:.1f} ms cumulative')
+        for name, stats in slowest:
+            print(f'    {stats["self_us"] / 1000:8.1f} ms  {name}')
+        if heavy:
+            print(f'    heavy modules imported eagerly: {", ".join(report["entry_points"][module]["heavy_modules"])}')
+            failed = True
+    report['help_wallclock_s'] = measure_help_wallclock(repeat)
+    print(f'radar --help: {report["help_wallclock_s"] * 1000:.1f} ms')
+
+    if baseline:
+        previous = json.loads(baseline.read_text())
+        for module, stats in report['entry_points'].items():
+            before = previous['entry_points'].get(module, {}).get('cumulative_us')
+            if before and stats['cumulative_us'] > before * (1 + tolerance):
+                print(f'Regression: {module} {before / 1000:.1f} ms -> {stats["cumulative_us"] / 1000:.1f} ms')
+                failed = True
+    if output:
+        output.write_text(json.dumps(report, indent=4))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
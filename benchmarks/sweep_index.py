@@ -0,0 +1,70 @@
+"""Cost of the sweep test and the spawn density check with N tracks: azimuth buckets vs full scans.
+
+The full scans are what the simulation did before: a vectorized atan2 sweep test
+over every track, and a per-object atan2 loop for each spawn density check. With
+the AzimuthIndex the atan2 runs once per tick in rebuild(), then the sweep and
+every density check only look at the buckets their arc covers.
+
+Run from the repository root, so that the radar package is importable:
+
+    python -m benchmarks.sweep_index --tracks 10 --tracks 1000 --tracks 5000
+"""
+import math
+import time
+
+import click
+import numpy as np
+
+from radar.AzimuthIndex import AzimuthIndex, in_arc
+
+
+def full_sweep(pos, angle):
+    obj_angle = np.degrees(np.arctan2(pos[:, 1], pos[:, 0])) % 360
+    return np.flatnonzero(in_arc(obj_angle, (angle - 20) % 360, angle))
+
+
+def loop_density(pos, angle, angle_width=1.0):
+    count = 0
+    for x, y in pos.tolist():
+        obj_angle = math.atan2(y, x)
+        if obj_angle < 0:
+            obj_angle += 2 * math.pi
+        if abs(obj_angle - angle) <= angle_width:
+            count += 1
+    return count
+
+
+def timed(function, repeats):
+    started = time.perf_counter()
+    for repeat in range(repeats):
+        function(repeat)
+    return (time.perf_counter() - started) / repeats
+
+
+@click.command()
+@click.option('--tracks', 'counts', multiple=True, type=int, default=[10, 100, 1000, 5000], help='Track counts to time, repeatable.')
+@click.option('--repeats', default=500, help='Queries per measurement.')
+@click.option('--buckets', default=72, help='Azimuth buckets of the index.')
+@click.option('--seed', default=0, help='RNG seed of the track positions.')
+def main(counts, repeats, buckets, seed):
+    rng = np.random.default_rng(seed)
+    for count in counts:
+        pos = rng.uniform(-1.9, 1.9, (count, 2))
+        rows = np.arange(count)
+        index = AzimuthIndex(buckets)
+        index.rebuild(rows, pos)
+        angles = rng.uniform(0, 360, repeats)
+        assert all(np.array_equal(np.sort(index.query(a - 20, a)), full_sweep(pos, a)) for a in angles[:20])
+
+        rebuild = timed(lambda i: index.rebuild(rows, pos), repeats)
+        sweep_index = timed(lambda i: index.query(angles[i] - 20, angles[i]), repeats)
+        sweep_full = timed(lambda i: full_sweep(pos, angles[i]), repeats)
+        density_index = timed(lambda i: index.count(angles[i] - 57.3, angles[i] + 57.3), repeats)
+        density_loop = timed(lambda i: loop_density(pos, math.radians(angles[i])), max(1, repeats // 10))
+        print(f'{count:6d} tracks: rebuild {rebuild * 1e6:7.1f} us/tick | '
+              f'sweep buckets {sweep_index * 1e6:6.1f} us vs full scan {sweep_full * 1e6:7.1f} us | '
+              f'density buckets {density_index * 1e6:6.1f} us vs loop {density_loop * 1e6:8.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""CPU cost per frame of the radar labels: glyph atlas batch vs a texture per text line.
+
+The old render_text rendered every line with pygame, flipped it, converted it to
+bytes and uploaded it as a fresh texture, about 30 GL calls per line. The
+TextRenderer only translates cached layouts and concatenates them, and draws the
+frame with a fixed handful of GL calls. Only the CPU side is timed here (no GL
+context needed), so the old path is measured without its uploads.
+
+Run from the repository root, so that the radar package is importable:
+
+    SDL_VIDEODRIVER=dummy python -m benchmarks.text_labels --tracks 10 --tracks 100
+"""
+import time
+
+import click
+import pygame
+
+from radar.TextRenderer import TextRenderer
+
+OLD_GL_CALLS_PER_LINE = 31
+FLUSH_GL_CALLS = 24
+
+
+def frame_labels(tracks, rng_angles):
+    """The labels of one frame: 3 lines per track, the distance rings and a few polygon ids"""
+    labels = [(f"ID: {track}\n{track * 0.37 % 30:.1f} km\nAZ: {rng_angles[track]:.1f}°", 0.01 * track - 1, 0.5)
+              for track in range(tracks)]
+    static = [(f"{distance} km", radius * 0.7, radius * 0.7) for radius, distance in
+              ((0.5, 10), (0.8, 15), (1.1, 20), (1.4, 25), (1.7, 30))]
+    static += [(str(polygon), 0.2 * polygon, -0.3) for polygon in range(1, 4)]
+    return labels, static
+
+
+def old_frame(font, labels, static):
+    for text, x, y in labels + static:
+        for line in text.split('\n'):
+            surface = pygame.transform.flip(font.render(line, True, (0, 255, 0)), False, True)
+            pygame.image.tostring(surface, "RGBA", True)
+
+
+def new_frame(renderer, labels, static):
+    for text, x, y in labels:
+        renderer.label(text, x, y)
+    for text, x, y in static:
+        renderer.static_label(text, x, y)
+    renderer.build_batch()
+
+
+@click.command()
+@click.option('--tracks', 'counts', multiple=True, type=int, default=[3, 10, 100], help='Labelled tracks, repeatable.')
+@click.option('--frames', default=100, help='Frames per measurement.')
+def main(counts, frames):
+    pygame.font.init()
+    font = pygame.font.SysFont('Arial', 24)
+    renderer = TextRenderer(font, 800, 800)
+    for count in counts:
+        angles = [(track * 37.1) % 360 for track in range(count)]
+        labels, static = frame_labels(count, angles)
+        lines = sum(text.count('\n') + 1 for text, x, y in labels + static)
+        timings = []
+        for draw in (lambda: old_frame(font, labels, static), lambda: new_frame(renderer, labels, static)):
+            started = time.perf_counter()
+            for frame in range(frames):
+                draw()
+            timings.append((time.perf_counter() - started) / frames)
+        print(f'{count:4d} tracks, {lines:4d} lines: texture per line {timings[0] * 1000:7.3f} ms '
+              f'(~{lines * OLD_GL_CALLS_PER_LINE} GL calls), atlas batch {timings[1] * 1000:7.3f} ms '
+              f'({FLUSH_GL_CALLS} GL calls)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Soak test of the track table: per-tick cost and memory over hours of simulated time.
+
+Runs the headless simulation at its fixed timestep, as fast as the CPU allows,
+and reports every --report-minutes of simulated time. With finished tracks
+retired and their rows recycled, the tick latency, the table size and the
+number of live Python objects should stay flat however long the console runs.
+
+Run from the repository root, so that the radar package is importable:
+
+    python -m benchmarks.track_soak --hours 3 --spawn-delay 0.05
+"""
+import gc
+import time
+
+import click
+import numpy as np
+
+from radar.Simulation import Simulation
+
+
+@click.command()
+@click.option('--hours', default=3.0, help='Simulated hours to run.')
+@click.option('--report-minutes', default=15.0, help='Simulated minutes between report lines.')
+@click.option('--spawn-delay', default=0.05, help='Seconds between spawns (the console uses 1.0).')
+@click.option('--max-objects', default=200, help='Track table capacity.')
+@click.option('--seed', default=0, help='RNG seed of the scenario.')
+def main(hours, report_minutes, spawn_delay, max_objects, seed):
+    simulation = Simulation(seed=seed, max_objects=max_objects)
+    simulation.spawn_delay = spawn_delay
+    ticks_per_report = int(round(report_minutes * 60 / simulation.clock.dt))
+    reports = int(round(hours * 60 / report_minutes))
+    print(f'{"sim time":>8} {"spawned":>8} {"active":>6} {"history":>7} {"rows":>5} '
+          f'{"mean ms":>8} {"p99 ms":>7} {"max ms":>7} {"py objects":>10}')
+    first_mean = None
+    for report in range(1, reports + 1):
+        latencies = np.empty(ticks_per_report)
+        for tick in range(ticks_per_report):
+            started = time.perf_counter()
+            simulation.step()
+            latencies[tick] = time.perf_counter() - started
+        mean = latencies.mean() * 1000
+        first_mean = first_mean or mean
+        print(f'{simulation.current_time / 3600:7.2f}h {simulation.next_target_id - 1:8d} '
+              f'{simulation.tracks.active_count:6d} {len(simulation.tracks.retired):7d} {simulation.tracks.size:5d} '
+              f'{mean:8.3f} {np.percentile(latencies, 99) * 1000:7.3f} {latencies.max() * 1000:7.3f} '
+              f'{len(gc.get_objects()):10d}')
+    print(f'Mean tick cost drift over the run: {mean / first_mean - 1:+.1%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Per-frame cost of moving N targets: vectorized TrackStore vs the old per-object loop.
+
+The old loop called the scalar trajectory formulas twice per object (position,
+then position at t + 0.01 for a finite-difference velocity). The store evaluates
+positions and analytic velocities of every track in one NumPy call, or with a
+plain loop up to SCALAR_ROWS tracks where NumPy's per-call overhead dominates.
+The paths are also checked against each other.
+
+Run from the repository root, so that the radar package is importable:
+
+    python -m benchmarks.track_update --tracks 10 --tracks 1000 --tracks 5000
+"""
+import math
+import random
+import time
+
+import click
+import numpy as np
+
+from radar import TrackStore as track_store
+from radar.TrackStore import TrackStore, TRAJECTORY_TYPES, FLIGHT_DURATION
+
+
+def legacy_position(start, control, kind, t):
+    """Scalar formulas of the old MovingObject.calculate_position"""
+    if t >= 1.0:
+        return -start[0], -start[1]
+    if kind == 'parabolic':
+        return ((1 - t) ** 2 * start[0] + 2 * (1 - t) * t * control[0] - t ** 2 * start[0],
+                (1 - t) ** 2 * start[1] + 2 * (1 - t) * t * control[1] - t ** 2 * start[1])
+    base_x, base_y = start[0] - 2 * t * start[0], start[1] - 2 * t * start[1]
+    if kind == 'straight':
+        return base_x, base_y
+    length = math.hypot(start[0], start[1])
+    wave = math.sin(t * 4 * math.pi) * 0.3
+    return base_x + start[1] / length * wave, base_y - start[0] / length * wave
+
+
+def legacy_update(tracks, current_time):
+    for track in tracks:
+        t = (current_time - track['created']) / FLIGHT_DURATION
+        if t * track['speed'] >= 1.0:
+            continue
+        track['pos'] = legacy_position(track['start'], track['control'], track['kind'], t * track['speed'])
+        next_pos = legacy_position(track['start'], track['control'], track['kind'], min(1.0, t + 0.01) * track['speed'])
+        track['velocity'] = ((next_pos[0] - track['pos'][0]) * 100, (next_pos[1] - track['pos'][1]) * 100)
+
+
+def build(count, seed=0):
+    rng = random.Random(seed)
+    store, legacy = TrackStore(count), []
+    for target_id in range(count):
+        angle = rng.uniform(0, 2 * math.pi)
+        start = (1.9 * math.cos(angle), 1.9 * math.sin(angle))
+        control = (rng.uniform(-1, 1), rng.uniform(-1, 1))
+        kind = rng.choice(TRAJECTORY_TYPES)
+        speed = rng.uniform(0.05, 0.1)
+        store.add(target_id, start, control, kind, speed, 0.0)
+        legacy.append({'start': start, 'control': control, 'kind': kind, 'speed': speed, 'created': 0.0})
+    return store, legacy
+
+
+def per_frame(update, frames):
+    started = time.perf_counter()
+    for frame in range(frames):
+        update(1.0 + frame * 0.02)
+    return (time.perf_counter() - started) / frames
+
+
+@click.command()
+@click.option('--tracks', 'counts', multiple=True, type=int, default=[10, 100, 1000, 5000], help='Track counts to time, repeatable.')
+@click.option('--frames', default=200, help='Frames per measurement.')
+def main(counts, frames):
+    store, legacy = build(500)
+    store.update(12.3)
+    legacy_update(legacy, 12.3)
+    position_error = max(np.abs(store.pos[row] - legacy[row]['pos']).max() for row in range(500))
+    print(f'Max position difference to the scalar formulas: {position_error:.2e}')
+    looped, batched = build(track_store.SCALAR_ROWS)[0], build(track_store.SCALAR_ROWS)[0]
+    looped.update(12.3)
+    scalar_rows, track_store.SCALAR_ROWS = track_store.SCALAR_ROWS, 0  # Force the NumPy path
+    batched.update(12.3)
+    track_store.SCALAR_ROWS = scalar_rows
+    error = max(np.abs(looped.pos - batched.pos).max(), np.abs(looped.velocity - batched.velocity).max())
+    print(f'Max difference between the loop and NumPy paths: {error:.2e}')
+
+    for count in counts:
+        store, legacy = build(count)
+        vectorized = per_frame(store.update, frames)
+        scalar = per_frame(lambda now: legacy_update(legacy, now), max(1, frames // 10))
+        path = 'loop' if count <= track_store.SCALAR_ROWS else 'NumPy'
+        print(f'{count:6d} tracks: TrackStore ({path:5s}) {vectorized * 1000:7.3f} ms/frame, '
+              f'per-object loop {scalar * 1000:8.3f} ms/frame ({scalar / vectorized:5.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import soundfile as sf
+
+from radar.NumberParser import convert_numbers_in_text
+from radar.Transcriber import Transcriber
+
+
+def load_wav(path: Path, sample_rate: int = 16000) -> np.ndarray:
+    """Read a recording as float32 mono at the transcriber sample rate"""
+    audio, file_rate = sf.read(str(path), dtype='float32', always_2d=True)
+    audio = audio.mean(axis=1)
+    if file_rate != sample_rate:
+        # Linear resampling is enough for benchmarking saved commands
+        positions = np.arange(0, len(audio), file_rate / sample_rate)
+        audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+
+def word_error_rate(reference: List[str], hypothesis: List[str]) -> float:
+    """Levenshtein distance over words divided by the reference length"""
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(reference)
+
+
+def normalize_command(text: str, segmenter, syntax_parser, morph) -> str:
+    """Same clean-up the recognizer applies before matching a command"""
+    text = convert_numbers_in_text(text.lower(), segmenter, syntax_parser, morph)
+    return ' '.join(re.findall(r'[а-яА-ЯёЁa-zA-Z0-9]+', text))
+
+
+def find_recordings(wav_dir: Path, limit: Optional[int] = None) -> List[Path]:
+    recordings = sorted(wav_dir.glob('*.wav'))
+    return recordings[:limit] if limit else recordings
+
+
+def benchmark_transcriber(transcriber: Transcriber, recordings: List[Path], nlp) -> Dict:
+    """Real-time factor and command accuracy of one backend; references are <name>.txt next to the WAV"""
+    audio_seconds, decode_seconds = 0.0, 0.0
+    errors, exact, with_reference = 0.0, 0, 0
+    for path in recordings:
+        audio = load_wav(path, transcriber.sample_rate)
+        started = time.perf_counter()
+        text = transcriber.transcribe(audio)
+        decode_seconds += time.perf_counter() - started
+        audio_seconds += len(audio) / transcriber.sample_rate
+
+        reference_path = path.with_suffix('.txt')
+        if reference_path.exists():
+            reference = normalize_command(reference_path.read_text(encoding='utf-8'), *nlp)
+            hypothesis = normalize_command(text, *nlp)
+            errors += word_error_rate(reference.split(), hypothesis.split())
+            exact += reference == hypothesis
+            with_reference += 1
+    return {
+        'backend': transcriber.name,
+        'files': len(recordings),
+        'audio_seconds': audio_seconds,
+        'decode_seconds': decode_seconds,
+        'rtf': decode_seconds / audio_seconds if audio_seconds else 0.0,
+        'wer': errors / with_reference if with_reference else None,
+        'command_accuracy': exact / with_reference if with_reference else None,
+    }
+
+
+def run_asr_benchmark(create: Callable[[str], Transcriber], backends: List[str], recordings: List[Path], nlp) -> List[Dict]:
+    rows = []
+    for backend in backends:
+        started = time.perf_counter()
+        transcriber = create(backend)
+        load_seconds = time.perf_counter() - started
+        row = benchmark_transcriber(transcriber, recordings, nlp)
+        row['load_seconds'] = load_seconds
+        rows.append(row)
+        del transcriber
+    print(f'{"backend":<14}{"load, s":>9}{"RTF":>8}{"WER":>8}{"accuracy":>10}')
+    for row in rows:
+        wer = f'{row["wer"]:.3f}' if row['wer'] is not None else '-'
+        accuracy = f'{row["command_accuracy"]:.1%}' if row['command_accuracy'] is not None else '-'
+        print(f'{row["backend"]:<14}{row["load_seconds"]:>9.1f}{row["rtf"]:>8.3f}{wer:>8}{accuracy:>10}')
+    return rows
@@ -0,0 +1,59 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def in_arc(azimuth, start: float, end: float):
+    """Whether azimuths (degrees) lie on the arc going from start up to end, across 0 if needed"""
+    if start <= end:
+        return (azimuth >= start) & (azimuth <= end)
+    return (azimuth >= start) | (azimuth <= end)
+
+
+class AzimuthIndex:
+    """Active tracks grouped into azimuth buckets, so arc queries only look at the buckets they cover.
+
+    Stored like a CSR matrix: track rows sorted by bucket plus the offset of every bucket.
+    Positions change every tick, so the index is rebuilt from scratch with a linear radix sort.
+    """
+    def __init__(self, buckets: int = 72):
+        self.buckets = buckets
+        self.width = 360.0 / buckets
+        self.rows = np.zeros(0, dtype=np.int64)
+        self.azimuth = np.zeros(0)  # Degrees in [0, 360), aligned with rows
+        self.offsets = np.zeros(buckets + 1, dtype=np.int64)
+
+    def rebuild(self, rows: np.ndarray, positions: np.ndarray):
+        azimuth = np.arctan2(positions[:, 1], positions[:, 0])
+        azimuth *= 180.0 / np.pi
+        azimuth[azimuth < 0] += 360.0  # Cheaper than a float modulo
+        bucket = (azimuth * (1.0 / self.width)).astype(np.int16)
+        np.minimum(bucket, self.buckets - 1, out=bucket)
+        order = np.argsort(bucket, kind='stable')  # Radix sort for small integer keys
+        self.rows = rows[order]
+        self.azimuth = azimuth[order]
+        np.cumsum(np.bincount(bucket, minlength=self.buckets), out=self.offsets[1:])
+
+    def bucket(self, azimuth: float) -> int:
+        return min(int(azimuth // self.width), self.buckets - 1)  # -1e-17 % 360 rounds up to 360.0
+
+    def candidates(self, start: float, end: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows and azimuths of every track in the buckets the arc from start to end touches"""
+        start, end = start % 360.0, end % 360.0
+        first = self.offsets[self.bucket(start)]
+        last = self.offsets[self.bucket(end) + 1]
+        if start <= end:
+            return self.rows[first:last], self.azimuth[first:last]
+        # The arc wraps across 0: buckets from start to the end of the table, then from 0
+        return (np.concatenate((self.rows[first:], self.rows[:last])),
+                np.concatenate((self.azimuth[first:], self.azimuth[:last])))
+
+    def query(self, start: float, end: float) -> np.ndarray:
+        """Rows of the tracks on the arc from start to end (degrees)"""
+        if end - start >= 360.0:
+            return self.rows
+        rows, azimuth = self.candidates(start, end)
+        return rows[in_arc(azimuth, start % 360.0, end % 360.0)]
+
+    def count(self, start: float, end: float) -> int:
+        return len(self.query(start, end))
@@ -0,0 +1,184 @@
+import ctypes
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from radar.LazyImport import lazy_import
+
+GL = lazy_import('OpenGL.GL')
+
+Color = Sequence[float]  # RGBA, or one RGBA per vertex
+LINES, TRIANGLES = 0x0001, 0x0004  # GL_LINES and GL_TRIANGLES, usable without importing OpenGL
+FLOATS_PER_VERTEX = 6  # x, y, r, g, b, a
+
+
+@lru_cache(maxsize=None)
+def unit_circle(segments: int) -> np.ndarray:
+    """segments + 1 points around the unit circle, the last one repeating the first"""
+    angles = np.linspace(0.0, 2.0 * np.pi, segments + 1)
+    return np.column_stack((np.cos(angles), np.sin(angles)))
+
+
+class CountedGL:
+    """OpenGL functions that count every call, to report the GL calls of a frame"""
+    def __init__(self):
+        self.calls = 0
+
+    def __getattr__(self, name):
+        function = getattr(GL, name)
+
+        def counted(*args):
+            self.calls += 1
+            return function(*args)
+        return counted
+
+
+class GeometryBatch:
+    """Colored vertices of many primitives in submission order.
+
+    Strips, loops, fans and polygons are stored as independent lines and triangles,
+    so every run of primitives of one kind is drawn with a single glDrawArrays.
+    """
+    def __init__(self):
+        self.chunks: List[np.ndarray] = []
+        self.runs: List[List[int]] = []  # [GL mode, vertex count] of consecutive chunks of one kind
+
+    def __len__(self):
+        return sum(count for mode, count in self.runs)
+
+    def add(self, mode: int, vertices, colors: Color):
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 2)
+        if not len(vertices):
+            return
+        chunk = np.empty((len(vertices), FLOATS_PER_VERTEX), dtype=np.float32)
+        chunk[:, :2] = vertices
+        chunk[:, 2:] = np.asarray(colors, dtype=np.float32).reshape(-1, 4)
+        self.chunks.append(chunk)
+        if self.runs and self.runs[-1][0] == mode:
+            self.runs[-1][1] += len(chunk)
+        else:
+            self.runs.append([mode, len(chunk)])
+
+    def lines(self, points, colors: Color):
+        """Independent segments: points 0-1, 2-3, ..."""
+        self.add(LINES, points, colors)
+
+    def triangles(self, vertices, colors: Color):
+        """Independent triangles: vertices 0-1-2, 3-4-5, ..."""
+        self.add(TRIANGLES, vertices, colors)
+
+    def line_strip(self, points, colors: Color):
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        if len(points) < 2:
+            return
+        segments = np.repeat(np.arange(len(points)), 2)[1:-1]
+        colors = np.asarray(colors, dtype=np.float32).reshape(-1, 4)
+        self.add(LINES, points[segments], colors[segments] if len(colors) > 1 else colors)
+
+    def line_loop(self, points, colors: Color):
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        self.line_strip(np.concatenate((points, points[:1])), colors)
+
+    def polygon(self, points, colors: Color):
+        """Convex polygon as a fan of triangles around its first vertex, like GL_POLYGON"""
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        if len(points) < 3:
+            return
+        fan = np.arange(1, len(points) - 1)
+        triangles = np.column_stack((np.zeros_like(fan), fan, fan + 1)).ravel()
+        self.add(TRIANGLES, points[triangles], colors)
+
+    def fans(self, centers, rims, center_colors: Color, rim_colors: Color):
+        """k triangle fans at once: centers (k, 2), rims (k, m, 2), one RGBA per fan or for all"""
+        rims = np.asarray(rims, dtype=np.float32)
+        count, points = rims.shape[:2]
+        if not count or points < 2:
+            return
+        vertices = np.empty((count, points - 1, 3, 2), dtype=np.float32)
+        vertices[:, :, 0] = np.asarray(centers, dtype=np.float32).reshape(-1, 1, 2)
+        vertices[:, :, 1] = rims[:, :-1]
+        vertices[:, :, 2] = rims[:, 1:]
+        colors = np.empty((count, points - 1, 3, 4), dtype=np.float32)
+        colors[:, :, 0] = np.asarray(center_colors, dtype=np.float32).reshape(-1, 1, 4)
+        colors[:, :, 1:] = np.asarray(rim_colors, dtype=np.float32).reshape(-1, 1, 1, 4)
+        self.add(TRIANGLES, vertices, colors)
+
+    def fan(self, center, rim, center_color: Color, rim_color: Color):
+        self.fans(center, np.asarray(rim)[None], center_color, rim_color)
+
+    def build(self) -> Tuple[np.ndarray, List[List[int]]]:
+        if not self.chunks:
+            return np.zeros((0, FLOATS_PER_VERTEX), dtype=np.float32), []
+        return np.concatenate(self.chunks), [list(run) for run in self.runs]
+
+    def clear(self):
+        self.chunks, self.runs = [], []
+
+
+class BatchRenderer:
+    """Draws GeometryBatches from vertex buffer objects and counts the GL calls of every frame.
+
+    Geometry of the frame goes into self.frame and is uploaded once by flush(). Static
+    layers are uploaded once by draw_static() and rebuilt only when their key changes.
+    """
+    def __init__(self, gl=None):
+        self.gl = gl or CountedGL()
+        self.frame = GeometryBatch()
+        self.stream_buffer = None
+        self.static: Dict[str, Tuple[int, List[List[int]], object]] = {}  # name -> (buffer, runs, key)
+        self.frame_start_calls = 0
+        self.last_frame_calls = 0  # GL calls of the last finished frame, text included
+        self.last_frame_vertices = 0
+
+    def begin_frame(self):
+        self.frame_start_calls = self.gl.calls
+        self.gl.glClear(GL.GL_COLOR_BUFFER_BIT)
+        self.gl.glLoadIdentity()
+
+    def end_frame(self) -> int:
+        self.last_frame_calls = self.gl.calls - self.frame_start_calls
+        return self.last_frame_calls
+
+    def upload(self, buffer: int, vertices: np.ndarray, usage: int):
+        self.gl.glBindBuffer(GL.GL_ARRAY_BUFFER, buffer)
+        self.gl.glBufferData(GL.GL_ARRAY_BUFFER, vertices.nbytes, vertices, usage)
+
+    def draw_buffer(self, buffer: int, runs: List[List[int]]):
+        stride = FLOATS_PER_VERTEX * 4
+        self.gl.glBindBuffer(GL.GL_ARRAY_BUFFER, buffer)
+        self.gl.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        self.gl.glEnableClientState(GL.GL_COLOR_ARRAY)
+        self.gl.glVertexPointer(2, GL.GL_FLOAT, stride, ctypes.c_void_p(0))
+        self.gl.glColorPointer(4, GL.GL_FLOAT, stride, ctypes.c_void_p(2 * 4))
+        first = 0
+        for mode, count in runs:
+            self.gl.glDrawArrays(mode, first, count)
+            first += count
+        self.gl.glDisableClientState(GL.GL_COLOR_ARRAY)
+        self.gl.glDisableClientState(GL.GL_VERTEX_ARRAY)
+        self.gl.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+    def draw_static(self, name: str, key, build: Callable[[GeometryBatch], None]):
+        """Draw a layer kept in its own buffer; build fills a batch and runs only when key changes"""
+        cached = self.static.get(name)
+        if cached is None or cached[2] != key:
+            buffer = cached[0] if cached else self.gl.glGenBuffers(1)
+            batch = GeometryBatch()
+            build(batch)
+            vertices, runs = batch.build()
+            self.upload(buffer, vertices, GL.GL_STATIC_DRAW)
+            cached = self.static[name] = (buffer, runs, key)
+        self.draw_buffer(cached[0], cached[1])
+
+    def flush(self):
+        """Upload the geometry of the frame once and draw it, one glDrawArrays per run"""
+        vertices, runs = self.frame.build()
+        self.frame.clear()
+        self.last_frame_vertices = len(vertices)
+        if not runs:
+            return
+        if self.stream_buffer is None:
+            self.stream_buffer = self.gl.glGenBuffers(1)
+        self.upload(self.stream_buffer, vertices, GL.GL_STREAM_DRAW)
+        self.draw_buffer(self.stream_buffer, runs)
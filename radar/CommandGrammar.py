@@ -0,0 +1,158 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set, get_type_hints
+
+from radar.LazyImport import lazy_import
+from radar.MovingObject import MovingObject
+from radar.NumberParser import NUM_WORDS
+from radar.PolygonUtils import PolygonType
+
+torch = lazy_import('torch')
+transformers = lazy_import('transformers')
+
+# Word classes of the voice-command grammar, one symbol each so commands can be matched with a regex
+AIM, SHOW, HIDE, TRACK, CREATE, SECTOR, KM, DEGREE, STATUS, TYPE, NUMBER, AND = 'ASHTCRKGXYNI'
+
+KEYWORDS = {
+    'цель': AIM,
+    'показать': SHOW,
+    'убрать': HIDE,
+    'трасса': TRACK,
+    'создать': CREATE,
+    'сектор': SECTOR,
+    'километр': KM,
+    'градус': DEGREE,
+    'и': AND,
+}
+
+# Frequent forms, used when no morphological analyzer is available to generate all of them
+COMMON_FORMS = {
+    'цель': ['цели', 'целью'],
+    'показать': ['покажи', 'покажите', 'показывать'],
+    'убрать': ['убери', 'уберите', 'убирать'],
+    'трасса': ['трассу', 'трассы'],
+    'создать': ['создай', 'создайте'],
+    'сектор': ['сектора'],
+    'километр': ['километра', 'километров', 'км'],
+    'градус': ['градуса', 'градусов'],
+    'враг': ['врага', 'враги'],
+    'союзник': ['союзника', 'союзники'],
+}
+
+NUMBER_RUN = f'{NUMBER}(?:{NUMBER}|{AND})*'  # "двадцать и пять" is still one number
+
+COMMAND_PATTERNS = {
+    'set_status': f'{AIM}{NUMBER_RUN}{STATUS}',
+    'show_trajectory': f'{SHOW}{TRACK}',
+    'hide_trajectory': f'{HIDE}{TRACK}',
+    'create_sector': f'{CREATE}{SECTOR}{NUMBER_RUN}{KM}?{NUMBER_RUN}{DEGREE}?{TYPE}',
+}
+
+
+def command_words() -> List[str]:
+    """Every word the voice commands are built from (used to pre-warm the morphology cache)"""
+    statuses = [s for s in get_type_hints(MovingObject)['status'].__args__ if s != 'unknown']
+    words = list(KEYWORDS) + statuses + list(PolygonType.__args__) + list(NUM_WORDS)
+    for forms in COMMON_FORMS.values():
+        words.extend(forms)
+    return words
+
+
+class CommandGrammar:
+    """Vocabulary and word-level grammar of the radar voice commands"""
+    def __init__(self, morph=None):
+        statuses = [s for s in get_type_hints(MovingObject)['status'].__args__ if s != 'unknown']
+        lemma_classes = dict(KEYWORDS)
+        lemma_classes.update({status: STATUS for status in statuses})
+        lemma_classes.update({polygon_type: TYPE for polygon_type in PolygonType.__args__})
+        lemma_classes.update({number: NUMBER for number in NUM_WORDS})
+
+        # Every surface form the recognizer may hear, mapped to its word class
+        self.form_classes: Dict[str, str] = {}
+        for lemma, word_class in lemma_classes.items():
+            for form in self._forms(lemma, morph):
+                self.form_classes.setdefault(form, word_class)
+        self.patterns = [re.compile(pattern) for pattern in COMMAND_PATTERNS.values()]
+
+    @staticmethod
+    def _forms(lemma: str, morph) -> Set[str]:
+        forms = {lemma, *COMMON_FORMS.get(lemma, [])}
+        if morph is not None:
+            forms.update(form.word for form in morph.parse(lemma)[0].lexeme)
+        return forms
+
+    def words(self) -> List[str]:
+        return sorted(self.form_classes)
+
+    def classify(self, word: str) -> Optional[str]:
+        word = word.lower()
+        if word.isdigit():
+            return NUMBER
+        return self.form_classes.get(word)
+
+    def symbols(self, text: str) -> str:
+        """Class symbols of the grammar words in text (other words are ignored)"""
+        words = re.findall(r'[а-яА-ЯёЁa-zA-Z0-9_]+', text)
+        return ''.join(filter(None, (self.classify(word) for word in words)))
+
+    def is_complete(self, text: str) -> bool:
+        """True once text contains a whole command"""
+        symbols = self.symbols(text)
+        return any(pattern.search(symbols) for pattern in self.patterns)
+
+
+class GrammarLogitsProcessor:
+    """Restricts (or biases) Whisper generation to tokens that spell grammar words"""
+    def __init__(self, allowed_token_ids: Iterable[int], bias: Optional[float] = None):
+        self.allowed_token_ids = sorted(set(allowed_token_ids))
+        self.bias = bias  # None restricts hard, a number only penalizes other tokens
+        self.mask = None
+
+    def __call__(self, input_ids, scores):
+        if self.mask is None or self.mask.shape[-1] != scores.shape[-1]:
+            penalty = float('-inf') if self.bias is None else -self.bias
+            self.mask = torch.full((scores.shape[-1],), penalty, dtype=scores.dtype, device=scores.device)
+            allowed = [i for i in self.allowed_token_ids if i < scores.shape[-1]]
+            self.mask[allowed] = 0
+        return scores + self.mask
+
+
+class CommandCompleteCriteria:
+    """Stops decoding as soon as the generated text forms a complete command"""
+    def __init__(self, grammar: CommandGrammar, tokenizer):
+        self.grammar = grammar
+        self.tokenizer = tokenizer
+
+    def __call__(self, input_ids, scores, **kwargs):
+        done = [self.grammar.is_complete(self.tokenizer.decode(ids, skip_special_tokens=True)) for ids in input_ids]
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+
+class GrammarConstraint:
+    """Extra generate() arguments for grammar-aware decoding of voice commands"""
+    def __init__(self, grammar: CommandGrammar, tokenizer, mode: str = 'restrict', bias: float = 5.0,
+                 max_new_tokens: int = 32, stop_on_complete: bool = True):
+        if mode not in ('restrict', 'bias'):
+            raise ValueError(f'Unknown constrained decoding mode: {mode}')
+        self.grammar = grammar
+        self.tokenizer = tokenizer
+        self.max_new_tokens = max_new_tokens
+        self.stop_on_complete = stop_on_complete
+        self.processor = GrammarLogitsProcessor(self.allowed_token_ids(), None if mode == 'restrict' else bias)
+
+    def allowed_token_ids(self) -> Set[int]:
+        allowed = set(self.tokenizer.all_special_ids)
+        spellings = list(self.grammar.words()) + [str(d) for d in range(10)] + ['.', ',', '-', '?', '!']
+        for word in spellings:
+            for variant in (word, ' ' + word, word.capitalize(), ' ' + word.capitalize()):
+                allowed.update(self.tokenizer.encode(variant, add_special_tokens=False))
+        return allowed
+
+    def generate_kwargs(self) -> dict:
+        """Fresh processor/criteria lists for one pipeline call"""
+        kwargs = {
+            "logits_processor": transformers.LogitsProcessorList([self.processor]),
+            "max_new_tokens": self.max_new_tokens,
+        }
+        if self.stop_on_complete:
+            kwargs["stopping_criteria"] = transformers.StoppingCriteriaList([CommandCompleteCriteria(self.grammar, self.tokenizer)])
+        return kwargs
@@ -0,0 +1,167 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from radar.Utterance import AnalyzedUtterance
+
+
+class LemmaAutomaton:
+    """Aho–Corasick automaton over lemma sequences: every pattern is found in one pass over the tokens"""
+    def __init__(self, patterns: Sequence[Tuple[str, ...]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[int]] = [[]]
+        self.lengths = [len(pattern) for pattern in patterns]
+        for pattern_id, pattern in enumerate(patterns):
+            node = 0
+            for lemma in pattern:
+                if lemma not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                    self.goto[node][lemma] = len(self.goto) - 1
+                node = self.goto[node][lemma]
+            self.outputs[node].append(pattern_id)
+        self._link_failures()
+
+    def _link_failures(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for lemma, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and lemma not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(lemma, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def search(self, lemmas: Sequence[str]) -> List[Tuple[int, int]]:
+        """(start index, pattern id) of every occurrence, in order of their end"""
+        found = []
+        node = 0
+        for i, lemma in enumerate(lemmas):
+            while node and lemma not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(lemma, 0)
+            for pattern_id in self.outputs[node]:
+                found.append((i - self.lengths[pattern_id] + 1, pattern_id))
+        return found
+
+
+def find_in_order(lemmas: Sequence[str], pattern: Tuple[str, ...]) -> Optional[Tuple[int, int]]:
+    """Start and end (after the last lemma) of the earliest occurrence of pattern in order, other words allowed between"""
+    for start, lemma in enumerate(lemmas):
+        if lemma != pattern[0]:
+            continue
+        position = start + 1
+        for wanted in pattern[1:]:
+            while position < len(lemmas) and lemmas[position] != wanted:
+                position += 1
+            if position == len(lemmas):
+                return None  # A later start cannot complete the pattern either
+            position += 1
+        return start, position
+    return None
+
+
+# Slot value parsers: (token, normal form, accepted values) -> value or None
+SLOT_PARSERS: Dict[str, Callable[[str, str, Optional[Sequence[str]]], Any]] = {
+    'int': lambda token, normal, values: int(token) if token.isdigit() else None,
+    'word': lambda token, normal, values: normal if normal in values else (token if token in values else None),
+}
+
+
+@dataclass
+class Slot:
+    name: str
+    kind: str = 'int'  # 'int' or 'word'
+    values: Optional[Sequence[str]] = None  # Accepted normal forms of a 'word' slot
+
+
+@dataclass
+class Command:
+    name: str
+    patterns: List[Tuple[str, ...]]  # Lemma sequences that trigger the command
+    slots: List[Slot]
+    handler: Callable[..., Any]  # Called with the slot values as keyword arguments
+    gaps: bool = False  # Other words may stand between the trigger lemmas, e.g. "создать новый сектор"
+
+
+@dataclass
+class CommandMatch:
+    command: Command
+    slots: Dict[str, Any]
+    start: int  # Token index of the trigger
+    seconds: float  # Time spent matching
+    missing: List[str] = field(default_factory=list)  # Slots that were not found
+
+    @property
+    def name(self) -> str:
+        return self.command.name
+
+    @property
+    def complete(self) -> bool:
+        return not self.missing
+
+
+class CommandRegistry:
+    """Declarative voice commands matched with one automaton over the normalized tokens"""
+    def __init__(self):
+        self.commands: List[Command] = []
+        self.pattern_owners: List[Command] = []
+        self.gapped: List[Tuple[Tuple[str, ...], Command]] = []  # Patterns of commands with gaps, scanned directly
+        self.automaton: Optional[LemmaAutomaton] = None
+
+    def register(self, name: str, patterns: List[Tuple[str, ...]], slots: List[Slot], handler: Callable[..., Any],
+                 gaps: bool = False):
+        command = Command(name, patterns, slots, handler, gaps)
+        self.commands.append(command)
+        self.automaton = None  # Rebuilt on the next match
+        return command
+
+    def _build(self):
+        patterns = []
+        self.pattern_owners, self.gapped = [], []
+        for command in self.commands:
+            for pattern in command.patterns:
+                if command.gaps:
+                    self.gapped.append((pattern, command))
+                else:
+                    patterns.append(pattern)
+                    self.pattern_owners.append(command)
+        self.automaton = LemmaAutomaton(patterns)
+
+    def match(self, utterance: AnalyzedUtterance) -> Optional[CommandMatch]:
+        """First (then longest) trigger in the utterance, with its slots filled from the tokens after it"""
+        started = time.perf_counter()
+        if self.automaton is None:
+            self._build()
+        # (start, end, command) of every trigger; gapped triggers span the words between their lemmas
+        occurrences = [(start, start + self.automaton.lengths[pattern_id], self.pattern_owners[pattern_id])
+                       for start, pattern_id in self.automaton.search(utterance.normal_forms)]
+        for pattern, command in self.gapped:
+            found = find_in_order(utterance.normal_forms, pattern)
+            if found is not None:
+                occurrences.append(found + (command,))
+        if not occurrences:
+            return None
+        start, end, command = min(occurrences, key=lambda o: (o[0], o[0] - o[1]))
+        slots, missing = self._fill_slots(command, utterance, end)
+        return CommandMatch(command, slots, start, time.perf_counter() - started, missing)
+
+    @staticmethod
+    def _fill_slots(command: Command, utterance: AnalyzedUtterance, position: int):
+        slots, missing = {}, []
+        for slot in command.slots:
+            parse = SLOT_PARSERS[slot.kind]
+            for i in range(position, len(utterance)):
+                value = parse(utterance.tokens[i], utterance.normal_forms[i], slot.values)
+                if value is not None:
+                    slots[slot.name] = value
+                    position = i + 1
+                    break
+            else:
+                missing.append(slot.name)
+        return slots, missing
@@ -0,0 +1,39 @@
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for a heavy module and imports it on first attribute access"""
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self) -> types.ModuleType:
+        if self.__dict__['_module'] is None:
+            self.__dict__['_module'] = importlib.import_module(self.__name__)
+        return self.__dict__['_module']
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Return the module if it is already imported, otherwise a proxy that imports it when used"""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def ensure_loaded(module: types.ModuleType) -> types.ModuleType:
+    """Force the real import now (e.g. to time it) and return the real module"""
+    if isinstance(module, LazyModule):
+        return module._load()
+    return module
+
+
+def is_loaded(name: str) -> bool:
+    return name in sys.modules
@@ -0,0 +1,57 @@
+import threading
+import traceback
+from typing import Any, Callable, Optional, Tuple
+
+from radar.StartupProfiler import StartupProfiler
+
+
+class ModelLoader:
+    """Loads the ASR transcriber and NLP tools on a background thread while the radar is already running"""
+    def __init__(self, load_asr: Callable[[], Any], load_nlp: Callable[[], Tuple[Any, Any, Any]],
+                 profiler: Optional[StartupProfiler] = None):
+        self.load_asr = load_asr
+        self.load_nlp = load_nlp
+        self.profiler = profiler or StartupProfiler()
+        self.transcriber = None
+        self.segmenter = None
+        self.syntax_parser = None
+        self.morph = None
+        self.status = 'loading'  # 'loading' | 'ready' | 'failed'
+        self.error: Optional[str] = None
+        self.finished = threading.Event()
+        self.thread = threading.Thread(target=self._load, name="model-loader", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def is_ready(self) -> bool:
+        return self.status == 'ready'
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until loading is over; True if the models can be used"""
+        self.finished.wait(timeout)
+        return self.is_ready()
+
+    def status_text(self) -> str:
+        if self.status == 'loading':
+            return 'Models loading...'
+        if self.status == 'failed':
+            return 'Models failed to load'
+        return 'Models ready'
+
+    def _load(self):
+        try:
+            with self.profiler.step('load NLP parser'):
+                self.segmenter, self.syntax_parser, self.morph = self.load_nlp()
+            with self.profiler.step('load ASR model'):
+                self.transcriber = self.load_asr()
+            self.status = 'ready'
+            print('Model loaded successfully')
+        except Exception:
+            self.error = traceback.format_exc()
+            self.status = 'failed'
+            print(self.error)
+        finally:
+            self.profiler.report()
+            self.finished.set()
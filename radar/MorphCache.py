@@ -0,0 +1,44 @@
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+
+class MorphCache:
+    """Bounded LRU cache of pymorphy3 normal forms shared by the whole NLP pipeline"""
+    def __init__(self, morph, maxsize: int = 10000):
+        self.morph = morph
+        self.maxsize = maxsize
+        self.cache: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()  # Shared by the main loop and background workers
+
+    def normal_form(self, word: str) -> str:
+        with self.lock:
+            normal = self.cache.get(word)
+            if normal is not None:
+                self.cache.move_to_end(word)
+                self.hits += 1
+                return normal
+            self.misses += 1
+        normal = self.morph.parse(word)[0].normal_form
+        with self.lock:
+            self.cache[word] = normal
+            if len(self.cache) > self.maxsize:
+                self.cache.popitem(last=False)
+        return normal
+
+    def parse(self, word: str):
+        """Full (uncached) pymorphy3 analysis for callers that need more than the normal form"""
+        return self.morph.parse(word)
+
+    def warm(self, words: Iterable[str]):
+        for word in words:
+            self.normal_form(word)
+        # Warm-up lookups are not real traffic
+        self.hits = self.misses = 0
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0.0
+        return f'{len(self.cache)}/{self.maxsize} entries, {self.hits} hits, {self.misses} misses ({hit_rate:.0%} hit rate)'
@@ -1,115 +1,93 @@
-from dataclasses import dataclass, field
 from typing import List, Tuple, Literal
-import math
+import numpy as np
+
+
+Status = Literal['unknown', 'враг', 'союзник']
+TrajectoryType = Literal['parabolic', 'straight', 'sinusoidal']
 
 
-@dataclass
 class MovingObject:
-    pos: List[float]
-    velocity: List[float]
-    creation_time: float
-    target_id: int
-    control_point: List[float]
-    start_pos: List[float]
-    trajectory_type: Literal['parabolic', 'straight', 'sinusoidal']
-    speed_factor: float
-    active: bool = True
-    visible: bool = False
-    last_sweep_time: float = 0.0  # Time when last swept by radar
-    status: Literal['unknown', 'враг', 'союзник'] = 'unknown'  # New field for status
-    # fields for trajectory tracking
-    trajectory_points: List[Tuple[float, float]] = field(default_factory=list)
-    show_trajectory: bool = False
-    last_trajectory_update: float = 0.0
-
-
-    def get_statuses():
-        status
-        
-    def update_trajectory(self, current_time: float):
-        """Update trajectory points with current position"""
-        if current_time - self.last_trajectory_update >= 0.05:  # Update every 50ms
-            self.trajectory_points.append((self.pos[0], self.pos[1]))
-            self.last_trajectory_update = current_time
-            
+    """Lightweight view of one track of the TrackStore; the numbers live in its arrays"""
+    # get_type_hints(MovingObject)['status'] lists the valid statuses
+    status: Status
+    trajectory_type: TrajectoryType
+
+    def __init__(self, store, row: int):
+        self.store = store
+        self.row = row
+        # fields for drawing, not touched by the vectorized update
+        self.show_trajectory: bool = False
+        self.distance = 0.0
+        self.azimuth = 0.0
+
+    @property
+    def target_id(self) -> int:
+        return int(self.store.target_id[self.row])
+
+    @property
+    def pos(self) -> np.ndarray:
+        return self.store.pos[self.row]
+
+    @property
+    def previous_pos(self) -> np.ndarray:
+        return self.store.previous_pos[self.row]
+
+    @property
+    def velocity(self) -> np.ndarray:
+        return self.store.velocity[self.row]
+
+    @property
+    def start_pos(self) -> np.ndarray:
+        return self.store.start[self.row]
+
+    @property
+    def control_point(self) -> np.ndarray:
+        return self.store.control[self.row]
+
+    @property
+    def creation_time(self) -> float:
+        return float(self.store.created[self.row])
+
+    @property
+    def speed_factor(self) -> float:
+        return float(self.store.speed[self.row])
+
+    @property
+    def trajectory_type(self) -> str:
+        return TrajectoryType.__args__[self.store.kind[self.row]]
+
+    @property
+    def status(self) -> str:
+        return Status.__args__[self.store.status[self.row]]
+
+    @status.setter
+    def status(self, value: str):
+        self.store.status[self.row] = Status.__args__.index(value)
+
+    @property
+    def active(self) -> bool:
+        # The row is recycled once the track retires, the view then stays inactive
+        return self.store.views[self.row] is self and bool(self.store.active[self.row])
+
+    @property
+    def visible(self) -> bool:
+        return bool(self.store.visible[self.row])
+
+    @property
+    def last_sweep_time(self) -> float:
+        """Time when last swept by radar"""
+        return float(self.store.last_sweep[self.row])
+
+    @property
+    def trajectory_points(self) -> np.ndarray:
+        """Past positions, oldest first: a contiguous float32 view of the store's ring buffer"""
+        return self.store.trajectories.view(self.row)
+
     def calculate_position(self, t: float) -> Tuple[float, float]:
         """Calculate position based on trajectory type at time t (0 to 1)"""
-        # Adjust time based on speed factor
-        adjusted_t = t * self.speed_factor
-        if adjusted_t >= 1.0:
-            return -self.start_pos[0], -self.start_pos[1]
-            
-        if self.trajectory_type == 'parabolic':
-            return self._calculate_parabolic(adjusted_t)
-        elif self.trajectory_type == 'straight':
-            return self._calculate_straight(adjusted_t)
-        else:  # sinusoidal
-            return self._calculate_sinusoidal(adjusted_t)
-    
-    def _calculate_parabolic(self, t: float) -> Tuple[float, float]:
-        """Parabolic trajectory using quadratic Bezier curve"""
-        px = (1-t)**2 * self.start_pos[0] + \
-             2*(1-t)*t * self.control_point[0] + \
-             t**2 * (-self.start_pos[0])
-        
-        py = (1-t)**2 * self.start_pos[1] + \
-             2*(1-t)*t * self.control_point[1] + \
-             t**2 * (-self.start_pos[1])
-        
-        return px, py
-    
-    def _calculate_straight(self, t: float) -> Tuple[float, float]:
-        """Straight line trajectory through center"""
-        px = self.start_pos[0] + t * (-2 * self.start_pos[0])
-        py = self.start_pos[1] + t * (-2 * self.start_pos[1])
-        return px, py
-    
-    def _calculate_sinusoidal(self, t: float) -> Tuple[float, float]:
-        """Sinusoidal trajectory through center"""
-        base_x = self.start_pos[0] + t * (-2 * self.start_pos[0])
-        base_y = self.start_pos[1] + t * (-2 * self.start_pos[1])
-        
-        dx = -self.start_pos[0]
-        dy = -self.start_pos[1]
-        length = math.sqrt(dx*dx + dy*dy)
-        perp_x = -dy/length
-        perp_y = dx/length
-        
-        wave_amplitude = 0.3
-        wave = math.sin(t * 4 * math.pi) * wave_amplitude
-        
-        return (base_x + perp_x * wave,
-                base_y + perp_y * wave)
-    
-    
-    def calculate_future_trajectory(self, current_time: float) -> List[Tuple[float, float]]:
-        """Calculate future trajectory points from current position"""
-        future_points = []
-        
-        # Calculate remaining time in flight
-        flight_duration = 3.0
-        elapsed_time = current_time - self.creation_time
-        remaining_duration = flight_duration - elapsed_time
-        
-        if remaining_duration <= 0:
-            return future_points
-
-        # Calculate 20 points along the remaining trajectory
-        num_points = 20
-        for i in range(num_points):
-            t = elapsed_time + (remaining_duration * i / num_points)
-            t_normalized = t / flight_duration
-            if t_normalized >= 1.0:
-                break
-            x, y = self.calculate_position(t_normalized)
-            future_points.append((x, y))
-            
-        return future_points
-
-    def get_full_trajectory(self, current_time: float) -> List[Tuple[float, float]]:
-        """Get combined historical and future trajectory points"""
-        if not self.show_trajectory:
-            return []
-        
-        # Combine historical points with future trajectory
-        return self.trajectory_points + self.calculate_future_trajectory(current_time)
+        pos, _ = self.store.evaluate(np.array([self.row]), np.array([t * self.speed_factor]))
+        return float(pos[0, 0]), float(pos[0, 1])
+
+    def calculate_future_trajectory(self, current_time: float) -> np.ndarray:
+        """Remaining trajectory up to the exit point, an (n, 2) float32 slice of the cached flight path"""
+        return self.store.future_path(self.row, current_time)
@@ -1,8 +1,10 @@
 from dataclasses import dataclass, field
-from typing import List, Tuple, Literal
+from typing import List, Optional, Sequence, Tuple, Literal
 import random
 import math
 
+import numpy as np
+
 
 @dataclass
 class NoisePoint:
@@ -14,11 +16,25 @@ class NoisePoint:
     radius: float
     
     
+def points_in_polygon(vertices, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Even-odd ray casting for many points at once: one pass per polygon edge"""
+    polygon = np.asarray(vertices, dtype=float)
+    inside = np.zeros(np.shape(x), dtype=bool)
+    for (x_i, y_i), (x_j, y_j) in zip(polygon, np.roll(polygon, 1, axis=0)):
+        crosses = (y_i > y) != (y_j > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            edge_x = (x_j - x_i) * (y - y_i) / (y_j - y_i) + x_i
+        inside ^= crosses & (x < edge_x)
+    return inside
+
+
 class RadarNoise:
-    def __init__(self, polygon_vertices: List[Tuple[float, float]]):
+    """Noise points of one polygon as arrays; which of them lie inside the polygon is decided once"""
+    def __init__(self, polygon_vertices: List[Tuple[float, float]], rng: random.Random = None, num_points: int = 50):
         self.vertices = polygon_vertices
-        self.noise_points = []
-        self.time_offset = random.uniform(0, 1000)  # Random starting time
+        self.rng = rng or random.Random()
+        self.num_points = num_points
+        self.time_offset = self.rng.uniform(0, 1000)  # Random starting time
         self.generate_noise_points()
         
     def generate_noise_points(self):
@@ -32,26 +48,34 @@ class RadarNoise:
         center_x = (min_x + max_x) / 2
         center_y = (min_y + max_y) / 2
         
-        # Create dense noise points
-        num_points = 50  # Increased number of points for denser effect
-        for _ in range(num_points):
+        # Create dense noise points, drawn in the same order as ever so a seed gives the same clutter
+        rows = []
+        for _ in range(self.num_points):
             # Create points with varying distances from center
-            angle = random.uniform(0, 2 * math.pi)
-            distance = random.uniform(0, 0.8)  # Varied distance from center
-            
-            x = center_x + math.cos(angle) * distance
-            y = center_y + math.sin(angle) * distance
-            
-            # Create noise point with varying characteristics
-            point = NoisePoint(
-                x=x,
-                y=y,
-                intensity=random.uniform(0.1, 0.3),
-                speed=random.uniform(1, 3),
-                phase=random.uniform(0, 2 * math.pi),
-                radius=random.uniform(0.02, 0.08)  # Smaller radii for more subtle effect
-            )
-            self.noise_points.append(point)
+            angle = self.rng.uniform(0, 2 * math.pi)
+            distance = self.rng.uniform(0, 0.8)  # Varied distance from center
+            rows.append((
+                center_x + math.cos(angle) * distance,
+                center_y + math.sin(angle) * distance,
+                self.rng.uniform(0.1, 0.3),  # intensity
+                self.rng.uniform(1, 3),  # speed
+                self.rng.uniform(0, 2 * math.pi),  # phase
+                self.rng.uniform(0.02, 0.08)  # radius, smaller radii for more subtle effect
+            ))
+        self.x, self.y, self.intensity, self.speed, self.phase, self.radius = np.array(rows, dtype=float).reshape(-1, 6).T
+        # The points never move, so the inside test runs once here instead of every frame
+        self.inside = points_in_polygon(self.vertices, self.x, self.y)
+        # Polygon vertices lit by the scanning line, with their bearing precomputed
+        vertices = np.asarray(self.vertices, dtype=float)
+        vertex_inside = points_in_polygon(self.vertices, vertices[:, 0], vertices[:, 1])
+        self.scan_vertices = vertices[vertex_inside]
+        self.scan_angles = np.arctan2(self.scan_vertices[:, 1], self.scan_vertices[:, 0])
+
+    @property
+    def noise_points(self) -> List[NoisePoint]:
+        """All points as dataclasses, for inspection"""
+        return [NoisePoint(*values) for values in
+                zip(*(array.tolist() for array in (self.x, self.y, self.intensity, self.speed, self.phase, self.radius)))]
 
     def point_in_polygon(self, x: float, y: float) -> bool:
         n = len(self.vertices)
@@ -65,4 +89,49 @@ class RadarNoise:
                 inside = not inside
             j = i
         return inside
-        
\ No newline at end of file
+
+
+class NoiseField:
+    """Noise of every polygon in flat arrays, animated with a few NumPy calls per frame.
+
+    Arrays are concatenated once per set of polygons; each frame only evaluates
+    the intensity and jitter formulas and returns every glow for one batched draw.
+    """
+    def __init__(self):
+        self.sources: Tuple[RadarNoise, ...] = ()
+
+    def rebuild(self, sources: Sequence[RadarNoise], colors: Sequence[Tuple[float, float, float]]):
+        self.sources = tuple(sources)
+        counts = [int(noise.inside.sum()) for noise in sources]
+        scan_counts = [len(noise.scan_vertices) for noise in sources]
+        # Points outside their polygon are never drawn, only the inside ones are kept
+        self.x, self.y, self.intensity, self.speed, self.phase, self.radius = (
+            np.concatenate([getattr(noise, name)[noise.inside] for noise in sources] + [np.zeros(0)])
+            for name in ('x', 'y', 'intensity', 'speed', 'phase', 'radius'))
+        self.time_offset = np.repeat([noise.time_offset for noise in sources], counts)
+        self.color = np.repeat(np.reshape(colors, (-1, 3)), counts, axis=0)
+        self.scan_vertices = np.concatenate([noise.scan_vertices for noise in sources] + [np.zeros((0, 2))])
+        self.scan_angles = np.concatenate([noise.scan_angles for noise in sources] + [np.zeros(0)])
+        self.scan_color = np.repeat(np.reshape(colors, (-1, 3)), scan_counts, axis=0)
+
+    def update(self, sources: Sequence[RadarNoise], colors: Sequence[Tuple[float, float, float]]):
+        """Re-concatenate only when polygons were added or removed"""
+        if len(sources) != len(self.sources) or any(a is not b for a, b in zip(sources, self.sources)):
+            self.rebuild(sources, colors)
+
+    def glows(self, current_time: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Centers (k, 2), radii (k,) and RGBA center colors (k, 4) of every noise glow at current_time"""
+        time_factor = current_time * self.speed + self.time_offset
+        wave = np.sin(time_factor + self.phase)
+        intensity = self.intensity * (0.5 + 0.5 * wave)
+        centers = np.column_stack((self.x + 0.02 * np.cos(time_factor), self.y + 0.02 * np.sin(time_factor)))
+        colors = np.column_stack((self.color, intensity * 0.7))
+
+        # Add scanning line effect: vertices the scan passed a moment ago
+        scan_angle = (current_time * 2) % (2 * math.pi)
+        angle_diff = np.abs(self.scan_angles - scan_angle)
+        lit = angle_diff < 0.3
+        scan_colors = np.column_stack((self.scan_color[lit], 0.2 * (1 - angle_diff[lit] / 0.3)))
+        return (np.concatenate((centers, self.scan_vertices[lit])),
+                np.concatenate((self.radius, np.full(lit.sum(), 0.07))),
+                np.concatenate((colors, scan_colors)))
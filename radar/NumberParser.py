@@ -1,4 +1,6 @@
-from natasha import Doc
+from typing import List
+
+from radar.Utterance import AnalyzedUtterance
 
 # Dictionary to map words to numeric values
 NUM_WORDS = {
@@ -44,58 +46,119 @@ NUM_WORDS = {
     "миллиард": 1_000_000_000
 }
 
+# Slots a small number word fills inside one group below a thousand
+HUNDREDS, TENS, UNITS = 3, 2, 1
+
+
+class NumberTransducer:
+    """Token-level transducer, built once from NUM_WORDS, that rewrites number words as digits in one pass"""
+    def __init__(self, num_words=NUM_WORDS):
+        self.values = dict(num_words)
+        self.slots = {}
+        for word, value in self.values.items():
+            if value >= 1000:
+                continue  # Multipliers are handled separately
+            elif value >= 100:
+                self.slots[word] = HUNDREDS
+            elif value >= 10:
+                self.slots[word] = TENS  # Teens fill the tens slot and close the units one
+            else:
+                self.slots[word] = UNITS
+
+    def rewrite(self, tokens: List[str], normal_forms: List[str]) -> List[str]:
+        """Replace every run of number words with its digits; other tokens are copied as they are"""
+        output = []
+        state = _NumberState(self)
+        pending_and = None  # "и" inside a number is dropped only if the number goes on after it
+        for token, normal in zip(tokens, normal_forms):
+            if normal in self.values:
+                if not state.accepts(normal):
+                    output.extend(state.flush())
+                    if pending_and is not None:
+                        output.append(pending_and)
+                pending_and = None
+                state.push(normal)
+            elif normal == "и" and state.started and pending_and is None:
+                pending_and = token
+            else:
+                output.extend(state.flush())
+                if pending_and is not None:
+                    output.append(pending_and)
+                    pending_and = None
+                output.append(token)
+        output.extend(state.flush())
+        if pending_and is not None:
+            output.append(pending_and)
+        return output
+
+    def numbers(self, normal_forms: List[str]) -> List[int]:
+        """Values of all numbers in a sequence of normal forms"""
+        return [int(token) for token in self.rewrite(normal_forms, normal_forms) if token.isdigit()]
+
+
+class _NumberState:
+    """The number being read: groups closed by a multiplier plus the group below a thousand"""
+    def __init__(self, transducer: NumberTransducer):
+        self.transducer = transducer
+        self.reset()
+
+    def reset(self):
+        self.started = False
+        self.total = 0
+        self.group = 0
+        self.lowest_slot = HUNDREDS + 1  # The next small word must fill a lower slot than this
+        self.last_multiplier = None
+
+    def accepts(self, normal: str) -> bool:
+        if not self.started:
+            return True
+        value = self.transducer.values[normal]
+        if value >= 1000:
+            # "две тысячи", "миллион двести тысяч": multipliers follow a group and decrease
+            return self.group > 0 and (self.last_multiplier is None or value < self.last_multiplier)
+        return value != 0 and self.transducer.slots[normal] < self.lowest_slot
+
+    def push(self, normal: str):
+        value = self.transducer.values[normal]
+        self.started = True
+        if value >= 1000:
+            self.total += max(self.group, 1) * value
+            self.group = 0
+            self.lowest_slot = HUNDREDS + 1
+            self.last_multiplier = value
+        else:
+            self.group += value
+            self.lowest_slot = UNITS if value < 20 else self.transducer.slots[normal]
+
+    def flush(self) -> List[str]:
+        if not self.started:
+            return []
+        number = self.total + self.group
+        self.reset()
+        return [str(number)]
+
+
+# Built once, shared by every command
+TRANSDUCER = NumberTransducer()
+
+
 # Function to convert words to a numeric value
 def words_to_number(words, morph):
-    total = 0  # Final result
-    current = 0  # Current number being processed
-    for word in words:
-        word = morph.parse(word)[0].normal_form  # Normalize word to its base form
-        if word in NUM_WORDS:
-            value = NUM_WORDS[word]
-            if value >= 1000:  # Multiplier for large numbers (e.g., "тысяча")
-                current *= value
-            elif value >= 100:  # Add hundreds (e.g., "сто")
-                current += value
-            else:  # Add smaller values (e.g., "два", "три")
-                current += value
-        elif word == "и":  # Ignore conjunctions
-            continue
-        else:  # Reset and add the current value to total
-            total += current
-            current = 0
-    return total + current  # Include the last processed number
+    numbers = TRANSDUCER.numbers([morph.normal_form(word) for word in words])
+    return numbers[0] if numbers else 0
+
+
+def convert_number_tokens(tokens: List[str], normal_forms: List[str]) -> List[str]:
+    """Rewrite number words as digits using already normalized tokens"""
+    return TRANSDUCER.rewrite(tokens, normal_forms)
+
 
 # Main function to replace numbers in words with digits
 def convert_numbers_in_text(text, segmenter, syntax_parser, morph):
-    # Parse the text with Natasha
-    doc = Doc(text)
-    doc.segment(segmenter)  # Split into sentences and tokens
-    doc.parse_syntax(syntax_parser)  # Parse syntax tree to understand structure
-
-    tokens = [_.text for _ in doc.tokens]  # Extract tokens from the document
-    result_text = text  # Final text to return
-    current_chunk = []  # Current numeric chunk being processed
-    chunks = []  # All numeric chunks found
-
-    # Split text into potential numeric chunks
-    for token in tokens:
-        word_normal = morph.parse(token)[0].normal_form  # Normalize each token
-        #print(f'word_normal {word_normal}; found: {word_normal in NUM_WORDS}')
-        if word_normal in NUM_WORDS or token.lower() == "и":  # Check if it's part of a number
-            current_chunk.append(token)  # Add token to the current numeric chunk
-        else:
-            if current_chunk:  # If a numeric chunk is completed
-                chunks.append(" ".join(current_chunk))  # Save the chunk
-                current_chunk = []  # Reset the chunk
-    if current_chunk:  # Add the last chunk if not empty
-        chunks.append(" ".join(current_chunk))
-
-    # Replace numeric chunks in the original text
-    for chunk in chunks:
-        number = words_to_number(chunk.split(), morph)  # Convert chunk to a number
-        #print(f'Converted {chunk} to {number}')
-        #print(f'Replace in {result_text} {chunk} to {str(number)}')
-        result_text = result_text.replace(chunk, str(number))  # Replace words with digits
-        #print(f'Obtained result_text {result_text}')
-    return result_text  # Return the final processed text
+    # Segment once, the syntax tree is not needed to find numbers
+    return convert_numbers_in_utterance(AnalyzedUtterance.analyze(text, segmenter, morph, syntax_parser))
+
 
+def convert_numbers_in_utterance(utterance):
+    """Text of the utterance with every number spelled in words replaced by digits"""
+    return ' '.join(convert_number_tokens(utterance.tokens, utterance.normal_forms))
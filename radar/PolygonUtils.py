@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
-from typing import List, Tuple, Literal, Dict, Any
+from typing import List, Optional, Tuple, Literal, Dict, Any
 import math
-from OpenGL.GL import *  # Add this import at the top
+
+import numpy as np
 
 
 PolygonType = Literal[
@@ -17,12 +18,72 @@ PolygonType = Literal[
 ]
 
 
+EDGE_LAYERS = 15  # Soft edge: scaled copies of the polygon behind its body
+EDGE_GROWTH = 0.008  # Scale added by each layer
+EDGE_SHADE = 0.3  # The soft edge is a darker version of the polygon's color
+
+
+def triangulate(vertex_count: int) -> np.ndarray:
+    """Fill triangles as (t, 3) vertex indices: a fan around the first vertex, what GL_POLYGON drew.
+    The random outlines may cross themselves, so there is no better simple-polygon triangulation to use"""
+    fan = np.arange(1, max(vertex_count - 1, 1))
+    return np.column_stack((np.zeros_like(fan), fan, fan + 1))
+
+
+@dataclass
+class PolygonMesh:
+    """Render geometry of a polygon, built once from its vertices"""
+    centroid: np.ndarray  # (2,) mean of the vertices, the soft edge scales around it
+    triangles: np.ndarray  # (t, 3) vertex indices of the fill
+    fill: np.ndarray  # (t * 3, 2) triangle vertices of the body
+    edge_rings: np.ndarray  # (EDGE_LAYERS, n, 2) outlines of the soft edge, outermost first
+    edge_fill: np.ndarray  # (EDGE_LAYERS * t * 3, 2) triangle vertices of every edge layer
+    edge_alpha: np.ndarray  # (EDGE_LAYERS,) opacity of each layer, outermost faintest
+    _edge_colors: Optional[Tuple[Tuple[float, float, float], np.ndarray]] = field(default=None, repr=False)
+
+    @classmethod
+    def from_vertices(cls, vertices) -> 'PolygonMesh':
+        points = np.asarray(vertices, dtype=np.float32)
+        centroid = points.mean(axis=0)
+        triangles = triangulate(len(points))
+        layers = np.arange(EDGE_LAYERS - 1, -1, -1)
+        scale = (1.0 + layers * EDGE_GROWTH).astype(np.float32)[:, None, None]
+        edge_rings = centroid + (points - centroid) * scale
+        return cls(centroid, triangles, points[triangles.ravel()], edge_rings,
+                   edge_rings[:, triangles.ravel()].reshape(-1, 2), 0.1 * (1 - layers / EDGE_LAYERS))
+
+    def edge_colors(self, color: Tuple[float, float, float]) -> np.ndarray:
+        """RGBA of every vertex of edge_fill for a polygon color, rebuilt only when the color changes"""
+        if self._edge_colors is None or self._edge_colors[0] != color:
+            layer_colors = np.empty((len(self.edge_alpha), 4), dtype=np.float32)
+            layer_colors[:, :3] = np.multiply(color, EDGE_SHADE)
+            layer_colors[:, 3] = self.edge_alpha
+            self._edge_colors = (tuple(color), np.repeat(layer_colors, len(self.fill), axis=0))
+        return self._edge_colors[1]
+
+
 @dataclass
 class Polygon:
     id: int
     vertices: List[Tuple[float, float]]
     type: PolygonType
     color: Tuple[float, float, float] = (0.7, 0.7, 0.7)  # Light grey default color
+    _mesh: Optional[PolygonMesh] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        if name == 'vertices':
+            object.__setattr__(self, '_mesh', None)  # New outline, the mesh is rebuilt on next use
+        object.__setattr__(self, name, value)
+
+    @property
+    def mesh(self) -> PolygonMesh:
+        """Cached render mesh; call invalidate_mesh() after editing vertices in place"""
+        if self._mesh is None:
+            self._mesh = PolygonMesh.from_vertices(self.vertices)
+        return self._mesh
+
+    def invalidate_mesh(self):
+        self._mesh = None
 
     def __post_init__(self):
         # Define colors for different types
@@ -110,37 +171,19 @@ class Sector:
         # If distance is beyond the last circle, use the last circle's radius
         return self.distance_circles[-1]['radius']
 
-    def draw(self):
+    def draw(self, batch):
+        """Добавляет веер сектора в пакет кадра (GeometryBatch)"""
         # Получаем корректированное расстояние в км
         distance = self.get_scaled_distance()
         # Устанавливаем начальный и конечный угол
         start_angle = 90  # Начинаем с вертикальной линии сверху
         end_angle = start_angle - self.angle  # Уменьшаем угол для поворота против часовой стрелки
-        
-        # Убедимся, что контекст правильно открыт
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        
-        # Начало рисования
-        glBegin(GL_TRIANGLE_FAN)
-        glColor4f(*self.fill_color)
 
-        glVertex2f(0.0, 0.0)  # Центр
-
-        # Рисуем дугу сектора
+        # Рисуем дугу сектора: точки дуги, ограниченные радиусом, вокруг центра
         num_segments = 32
-        for i in range(num_segments + 1):
-            # Вычисляем угол для текущего сегмента
-            angle = math.radians(start_angle + (end_angle - start_angle) * i / num_segments)
-            
-            # Координаты точки сектора, ограниченные радиусом
-            x = distance * math.cos(angle)
-            y = distance * math.sin(angle)
-            
-            glVertex2f(x, y)
-
-        # Завершаем рисование
-        glEnd()
+        angles = np.radians(np.linspace(start_angle, end_angle, num_segments + 1))
+        arc = distance * np.column_stack((np.cos(angles), np.sin(angles)))
+        batch.fan((0.0, 0.0), arc, self.fill_color, self.fill_color)
 
 
      
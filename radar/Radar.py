@@ -2,37 +2,38 @@ from typing import List, Tuple, Literal
 import random, math, pygame
 from pygame.locals import *
 from OpenGL.GL import *
-import time, traceback
-from radar.Noise import RadarNoise
-from radar.PolygonUtils import PolygonManager, Polygon, PolygonType, Sector
-from radar.MovingObject import MovingObject
+import time, traceback, itertools
+import numpy as np
+from radar.Noise import RadarNoise, NoiseField
+from radar.PolygonUtils import Polygon, PolygonType, Sector
+from radar.Simulation import Simulation
 from radar.SoundRecorder import AudioRecorder
+from radar.TextRenderer import TextRenderer
+from radar.BatchRenderer import BatchRenderer, unit_circle
+from radar.RecognitionWorker import RecognitionWorker
+from radar.StreamingRecognizer import StreamingRecognizer, AudioChunk
+from radar.VoiceActivity import VoiceActivityDetector
     
 from radar.AlgorithmRecognition import AlgorithmRecognizer
 
 
 class Radar:
-    def __init__(self, dir_to_save_wav, pipe, segmenter, syntax_parser, morph, width=800, height=800):
+    def __init__(self, dir_to_save_wav, model_loader, width=800, height=800, audio_config=None, simulation=None,
+                 display_config=None):
         self.dir_to_save_wav = dir_to_save_wav
-        self.pipe = pipe
-        self.algorithm_reconizer = AlgorithmRecognizer(self, segmenter, syntax_parser, morph)
-        self.border_radius = 1.9  # максимальный радиус в радарных единицах
-        self.max_distance_km = 30  # максимальная дистанция в км
-        self.distance_circles = [
-            {"radius": 0.5, "distance": 10},
-            {"radius": 0.8, "distance": 15},
-            {"radius": 1.1, "distance": 20},
-            {"radius": 1.4, "distance": 25},
-            {"radius": 1.7, "distance": self.max_distance_km}
-        ]
-        self.polygon_manager = PolygonManager()
-        self.min_sides = 6
-        self.max_sides = 30
-        self.min_polygons_number = 1
-        self.max_polygons_number = 5
-        # Generate random polygons on initialization
-        self.generate_random_polygons()
-        self.moving_objects_dict: Dict[int, MovingObject] = {}
+        self.audio_config = audio_config or {}
+        # ASR transcriber and NLP tools arrive from the background loader, see update_model_status
+        self.model_loader = model_loader
+        self.transcriber = None
+        self.algorithm_reconizer = None
+        # World state lives in the simulation, this class only draws it and handles input
+        self.simulation = simulation or Simulation()
+        # Polygon noise is decoration: its own stream, so drawing never changes the simulation
+        self.noise_rng = random.Random(self.simulation.seed)
+        self.display_config = display_config or {}
+        self.noise_points = self.display_config.get("noise_points", 50)  # Noise points generated per polygon
+        self.noise_segments = self.display_config.get("noise_segments", 32)  # Rim segments of each noise glow
+        self.noise_field = NoiseField()
 
         pygame.init()
         pygame.font.init()
@@ -43,6 +44,12 @@ class Radar:
         
         pygame.font.init()
         self.font = pygame.font.SysFont('Arial', 24)
+        # Glyph atlas built once, labels of a frame are drawn in one call
+        self.text = TextRenderer(self.font, width, height)
+        # Every primitive goes through the batch renderer, the text batch shares its GL call counter
+        self.renderer = BatchRenderer()
+        self.text.gl = self.renderer.gl
+        self.show_frame_stats = self.display_config.get("show_frame_stats", False)  # GL calls overlay for profiling
         
         glMatrixMode(GL_PROJECTION)
         glLoadIdentity()
@@ -52,252 +59,106 @@ class Radar:
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         
-        self.sector_angle_degrees = 60.0
-        self.angle = 0
-        self.radar_speed = 5.0
-        self.center_radius = 0.3
-        self.moving_objects: List[MovingObject] = []
-        self.last_spawn_time = time.time()
-        self.spawn_delay = 1.0
-        self.next_target_id = 1
-        self.max_objects = 10
-        self.max_objects_per_rad = 3
-        self.fade_in_duration = 0.5
-        self.visibility_duration = 2.0
-        self.show_trajectory_ids: Set[int] = set()
-
-        
-    def create_sector(self, distance_km: float, angle: float, type_sector: str):
-        """Создает сектор, принимая расстояние в километрах"""
-        #radar_distance = self.km_to_radar_units(distance_km, )
-        return self.polygon_manager.create_sector(distance_km, angle, type_sector, self.max_distance_km, self.distance_circles)
-        
-        
-    def get_distance_from_center(self, x: float, y: float) -> float:
-        """Calculate the distance from center in radar units"""
-        return math.sqrt(x * x + y * y)
-    
-    def get_azimuth(self, x: float, y: float) -> float:
-        """Calculate azimuth in degrees"""
-        azimuth = math.degrees(math.atan2(y, x))
-        if azimuth < 0:
-            azimuth += 360
-        return azimuth
-
-    def distance_to_radar_units(self, distance: float) -> float:
-        """Convert real distance (km) to radar units"""
-        # Scale factor: border_radius corresponds to maximum distance (30 km)
-        return (distance * self.border_radius) / 30
-    
-    
-    def generate_random_polygons(self):
-        num_polygons = random.randint(self.min_polygons_number, self.max_polygons_number)
-        for i in range(num_polygons):
-            center = self.generate_border_point_inside_radar()
-            polygon = self.create_random_polygon(i + 1, center)  # Pass the ID (1-based)
-            self.polygon_manager.add_polygon(polygon)  # Add the VERTICES, not the Polygon object
-
-                
-    def set_sector_angle(self, angle: float):
-       """Set the angular sector width in degrees."""
-       self.sector_angle_degrees = angle
+        # Whisper runs on its own thread, results are applied between frames
+        self.recognition_worker = RecognitionWorker(self.process_audio_job)
+        self.streaming_config = self.audio_config.get("streaming", {})
+        self.vad_config = self.audio_config.get("vad", {})
+        self.vad = None
+        if self.vad_config.get("enabled", False):
+            self.vad = VoiceActivityDetector.from_config(self.vad_config, self.audio_config.get("sample_rate", 16000))
+        self.streaming_recognizer = StreamingRecognizer(
+            self.transcribe_audio,
+            min_tail_seconds=self.streaming_config.get("min_tail_seconds", 0.2),
+            sample_rate=self.audio_config.get("sample_rate", 16000),
+            has_speech=self.vad.has_speech if self.vad else None,
+            overlap_seconds=self.streaming_config.get("overlap_seconds", 1.0)
+        )
 
         
-    def generate_random_speed(self) -> float:
-        """Generate random speed factor between 0.5 and 2.0"""
-        return random.uniform(0.05, 0.1)
+    def update_model_status(self):
+        """Pick up the models once the background loader has finished"""
+        if self.algorithm_reconizer is None and self.model_loader.is_ready():
+            self.transcriber = self.model_loader.transcriber
+            self.algorithm_reconizer = AlgorithmRecognizer(
+                self.simulation, self.model_loader.segmenter, self.model_loader.syntax_parser, self.model_loader.morph)
 
+    def transcribe_audio(self, audio) -> str:
+        """Run the ASR transcriber on a recording (called from the recognition worker thread)"""
+        # Commands recorded during startup wait here until the models are loaded
+        if not self.model_loader.wait():
+            raise RuntimeError('Voice command rejected: models failed to load')
+        return self.model_loader.transcriber.transcribe(audio)
 
-    def create_random_polygon(self, polygon_id: int, center: Tuple[float, float]) -> Polygon:
-        """Create a random convex polygon with a maximum angle."""
-        num_sides = random.randint(self.min_sides, self.max_sides)  # Randomly choose the number of sides
-        angle_offset = random.uniform(0, 90)  # Offset for the polygon's rotation
-        angle_step = 90 / num_sides  # Maximum angle step
-        
-        vertices = []
-        for i in range(num_sides):
-            angle = angle_offset + i * angle_step
-            rad_angle = math.radians(angle)
-            radius = random.uniform(0.2, 0.5)  # Random distance from center
-            x = center[0] + radius * math.cos(rad_angle)
-            y = center[1] + radius * math.sin(rad_angle)
-            vertices.append((x, y))
-        
-        #polygon_type = random.choice(self.polygon_types)
-        polygon_type = random.choice(PolygonType.__args__)
-        return Polygon(id=polygon_id, vertices=vertices, type=polygon_type)
-
+    def process_audio_job(self, audio):
+        """Recognition worker entry point: streamed chunks are merged, whole recordings decoded at once"""
+        if isinstance(audio, AudioChunk):
+            return self.streaming_recognizer.accept(audio)
+        return self.transcribe_audio(audio)
 
-    def spawn_polygons(self):
-        num_polygons = random.randint(n, m)  # Define n and m
-        for i in range(num_polygons):
-            center = self.generate_border_point_inside_radar()  # Random position on the border
-            polygon = self.create_random_polygon(i, center)
-            self.polygons.append(polygon)  # Store the polygon
+    def start_voice_command(self, audio_recorder):
+        """Start recording; in streaming mode chunks are decoded while the key is still held"""
+        if self.streaming_config.get("enabled", False) and audio_recorder.in_memory:
+            utterance_id = self.streaming_recognizer.begin()
+            chunk_index = itertools.count()
+            audio_recorder.chunk_listener = lambda samples: self.recognition_worker.submit(
+                AudioChunk(utterance_id, next(chunk_index), samples))
+            audio_recorder.start_recording()
+            return utterance_id
+        audio_recorder.chunk_listener = None
+        audio_recorder.start_recording()
+        return None
 
+    def finish_voice_command(self, audio_recorder, utterance_id):
+        """Stop recording and queue whatever still needs decoding"""
+        recording = audio_recorder.stop_recording()
+        if utterance_id is None:
+            if recording is None or (isinstance(recording, np.ndarray) and len(recording) == 0):
+                print('No speech detected, command skipped')
+                return
+            if self.vad and self.vad_config.get("split_utterances", False) and isinstance(recording, np.ndarray):
+                # A long hold may carry several commands separated by pauses
+                for utterance in self.vad.split(recording):
+                    self.recognition_worker.submit(utterance)
+                return
+            self.recognition_worker.submit(recording)
+            return
+        # Only the tail after the last emitted chunk is left to decode
+        self.recognition_worker.submit(AudioChunk(utterance_id, -1, audio_recorder.tail(), final=True))
 
-    def generate_control_point(self, start_pos: List[float]) -> List[float]:
-        dx = -start_pos[0]
-        dy = -start_pos[1]
-        length = math.sqrt(dx*dx + dy*dy)
-        
-        perp_x = -dy/length
-        perp_y = dx/length
-        
-        offset = random.uniform(-1, 1)
-        control_x = (start_pos[0] + (-start_pos[0])) / 2 + perp_x * offset
-        control_y = (start_pos[1] + (-start_pos[1])) / 2 + perp_y * offset
-        
-        return [control_x, control_y]
-    
-    def get_objects_in_sector(self, angle: float, angle_width: float = 1.0) -> int:
-        """Count active objects in a given angular sector"""
-        count = 0
-        for obj in self.moving_objects:
-            if not obj.active:
+    def apply_recognition_results(self):
+        """Apply commands recognized in the background since the previous frame"""
+        for result in self.recognition_worker.poll_results():
+            print(f'Recognition job {result.job_id}: latency {result.latency:.2f}s '
+                  f'(waited {result.queue_wait:.2f}s), queue depth {result.queue_depth}')
+            if result.error:
+                print(result.error)
                 continue
-            obj_angle = math.atan2(obj.pos[1], obj.pos[0])
-            if obj_angle < 0:
-                obj_angle += 2 * math.pi
-            if abs(obj_angle - angle) <= angle_width:
-                count += 1
-            count += 1
-        return count
-
-
-    def generate_border_point_inside_radar(self) -> Tuple[float, float]:
-        """Generate a random point within the radar area."""
-        radius = random.uniform(0, self.border_radius)  # Limit to within the border radius
-        angle = random.uniform(0, 2 * math.pi)
-        x = radius * math.cos(angle)
-        y = radius * math.sin(angle)
-        return x, y
-        
-    def generate_border_point(self) -> Tuple[float, float]:
-        angle = random.uniform(0, 2 * math.pi)
-        x = self.border_radius * math.cos(angle)
-        y = self.border_radius * math.sin(angle)
-        return x, y
-
-    def spawn_new_object(self):
-        # Check total object count
-        active_objects = sum(1 for obj in self.moving_objects if obj.active)
-        if active_objects >= self.max_objects:
-            return
-        
-        x, y = self.generate_border_point()
-        angle = math.atan2(y, x)
-        if angle < 0:
-            angle += 2 * math.pi
-            
-        # Check density in current sector
-        if self.get_objects_in_sector(angle) >= self.max_objects_per_rad:
-            return
-            
-        start_pos = [x, y]
-        control_point = self.generate_control_point(start_pos)
-        
-        # Randomly choose trajectory type and speed
-        trajectory_type = random.choice(['parabolic', 'straight', 'sinusoidal'])
-        speed_factor = self.generate_random_speed()
-        
-        # Randomly assign status
-        #status = random.choice(['unknown', 'enemy', 'ally'])  # Random status
-        
-        new_obj = MovingObject(
-            pos=[x, y],
-            velocity=[0, 0],
-            creation_time=time.time(),
-            target_id=self.next_target_id,
-            control_point=control_point,
-            start_pos=start_pos,
-            trajectory_type=trajectory_type,
-            speed_factor=speed_factor,
-            status='unknown'  # Set status
-        )
-        
-        # Add object to the list and dictionary
-        self.moving_objects.append(new_obj)
-        self.moving_objects_dict[new_obj.target_id] = new_obj  # Store in dictionary
-        self.next_target_id += 1
+            if not result.text.strip():
+                print('Nothing recognized')
+                continue
+            try:
+                self.algorithm_reconizer.recognize(result.text.lower())
+            except Exception as e:
+                traceback.print_exc()
 
-    def render_text(self, text, x, y):
-        """Render multiline text with proper spacing"""
-        viewport = glGetIntegerv(GL_VIEWPORT)
-        screen_x = int((x + 2) * viewport[2]/4)
-        screen_y = int((-y + 2) * viewport[3]/4)
-        
-        # Split text into lines and render each line separately
-        lines = text.split('\n')
-        line_height = self.font.get_height()
-        
-        for i, line in enumerate(lines):
-            # Create surface for each line
-            text_surface = self.font.render(line, True, (0, 255, 0))
-            text_surface = pygame.transform.flip(text_surface, False, True)
-            text_data = pygame.image.tostring(text_surface, "RGBA", True)
-            text_width, text_height = text_surface.get_size()
-            
-            # Save current matrices
-            glMatrixMode(GL_MODELVIEW)
-            glPushMatrix()
-            glLoadIdentity()
-            
-            glMatrixMode(GL_PROJECTION)
-            glPushMatrix()
-            glLoadIdentity()
-            glOrtho(0, viewport[2], viewport[3], 0, -1, 1)
-            
-            glEnable(GL_TEXTURE_2D)
-            texture_id = glGenTextures(1)
-            glBindTexture(GL_TEXTURE_2D, texture_id)
-            
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, text_width, text_height, 0, 
-                        GL_RGBA, GL_UNSIGNED_BYTE, text_data)
-            
-            # Adjust y position for each line
-            line_y = screen_y + (i * line_height)
-            
-            glEnable(GL_BLEND)
-            glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-            
-            glBegin(GL_QUADS)
-            glTexCoord2f(0, 0); glVertex2f(screen_x, line_y)
-            glTexCoord2f(1, 0); glVertex2f(screen_x + text_width, line_y)
-            glTexCoord2f(1, 1); glVertex2f(screen_x + text_width, line_y + text_height)
-            glTexCoord2f(0, 1); glVertex2f(screen_x, line_y + text_height)
-            glEnd()
-            
-            # Cleanup
-            glDeleteTextures([texture_id])
-            glDisable(GL_TEXTURE_2D)
-            
-            # Restore matrices in reverse order
-            glMatrixMode(GL_PROJECTION)
-            glPopMatrix()
-            glMatrixMode(GL_MODELVIEW)
-            glPopMatrix()
-            
+    def render_text(self, text, x, y, color=(0.0, 1.0, 0.0, 1.0)):
+        """Queue multiline text for this frame, drawn in one batch by self.text.flush()"""
+        self.text.label(text, x, y, color)
 
     def draw_checkmark(self, x: float, y: float, size: float, status: Literal):
-        """Draw a larger blue checkmark at position (x, y) with a specified size."""
-        glBegin(GL_LINES)
-        
+        """Draw a larger checkmark at position (x, y) with a specified size, colored by status."""
         # Set color based on status
         if status == 'unknown':
-            glColor3f(0.0, 0.0, 1.0)  # Blue for unknown
+            color = (0.0, 0.0, 1.0, 1.0)  # Blue for unknown
         elif status == 'враг':
-            glColor3f(1.0, 0.0, 0.0)  # Red for enemy
-        elif status == 'союзник':
-            glColor3f(0.0, 1.0, 0.0)  # Green for ally
-        #glColor3f(0.0, 0.0, 1.0)  # Set color to blue
-        glVertex2f(x - size * 0.2, y - size * 0.2)  # Starting point of checkmark
-        glVertex2f(x, y + size * 0.2)                # Top point of checkmark
-        glVertex2f(x, y + size * 0.2)                # Top point of checkmark
-        glVertex2f(x + size * 0.2, y - size * 0.2)  # Ending point of checkmark
-        glEnd()
+            color = (1.0, 0.0, 0.0, 1.0)  # Red for enemy
+        else:
+            color = (0.0, 1.0, 0.0, 1.0)  # Green for ally
+        self.renderer.frame.line_strip([
+            (x - size * 0.2, y - size * 0.2),  # Starting point of checkmark
+            (x, y + size * 0.2),                # Top point of checkmark
+            (x + size * 0.2, y - size * 0.2),  # Ending point of checkmark
+        ], color)
     
     def calculate_object_alpha(self, obj, current_time):
         """Calculate object's alpha (transparency) based on its state"""
@@ -306,7 +167,7 @@ class Radar:
             
         # Fade in after sweep
         time_since_sweep = current_time - obj.last_sweep_time
-        if time_since_sweep < self.fade_in_duration:
+        if time_since_sweep < self.simulation.fade_in_duration:
             return 0.0
             
         # Start fade out if needed
@@ -316,190 +177,112 @@ class Radar:
             
         return 1.0
 
-    def update_object_status(self, obj_id: int, new_status: str):
-        """Update the status of an object by ID."""
-        if obj_id in self.moving_objects_dict:
-            obj = self.moving_objects_dict[obj_id]
-            obj.status = new_status  # Change status
-    
-    def is_in_sweep_area(self, obj_x: float, obj_y: float) -> bool:
-        """Check if an object is in the current sweep area"""
-        obj_angle = math.degrees(math.atan2(obj_y, obj_x))
-        if obj_angle < 0:
-            obj_angle += 360
-            
-        # Consider the sweep area (20 degrees behind the sweep line)
-        sweep_start = (self.angle - 20) % 360
-
-        # Handle wrap-around case
-        if sweep_start > self.angle:
-            return obj_angle >= sweep_start or obj_angle <= self.angle
-        else:
-            return sweep_start <= obj_angle <= self.angle
-            
-    def update_objects(self):
-        current_time = time.time()
-        
-        if (current_time - self.last_spawn_time >= self.spawn_delay and 
-            sum(1 for obj in self.moving_objects if obj.active) < self.max_objects):
-            self.spawn_new_object()
-            self.last_spawn_time = current_time
-        
-        for obj in self.moving_objects:
-            if not obj.active:
-                continue
-            
-            flight_duration = 3.0
-            t = (current_time - obj.creation_time) / flight_duration
-            
-            if t * obj.speed_factor >= 1.0:
-                obj.active = False
-                continue
-                
-            obj.pos[0], obj.pos[1] = obj.calculate_position(t)
-            
-            next_t = min(1.0, t + 0.01)
-            next_x, next_y = obj.calculate_position(next_t)
-            obj.velocity = [
-                (next_x - obj.pos[0]) * 100,
-                (next_y - obj.pos[1]) * 100
-            ]
-            
-            # Update trajectory points
-            obj.update_trajectory(current_time)
-            
-            # Check if object is in sweep area
-            if self.is_in_sweep_area(obj.pos[0], obj.pos[1]):
-                if not obj.visible:
-                    obj.last_sweep_time = current_time
-                    obj.visible = True
-
-    
-    def update_moving_object(self, obj):
-        # Update existing methods to track distance and azimuth
-        if obj.active and obj.visible:
-            # Calculate and store distance and azimuth
-            obj.distance = self.radar_units_to_distance(
-                self.get_distance_from_center(obj.pos[0], obj.pos[1])
-            )
-            obj.azimuth = self.get_azimuth(obj.pos[0], obj.pos[1])
-            
-            
     def draw_sweep_line(self):
-        glBegin(GL_LINES)
-        glColor4f(0.0, 1.0, 0.0, 1.0)
-        glVertex2f(0, 0)
+        batch = self.renderer.frame
+        radius = self.simulation.border_radius
+        angle = self.simulation.angle
         
         # Calculate the endpoint of the sweep line
-        x = self.border_radius * math.cos(math.radians(self.angle))
-        y = self.border_radius * math.sin(math.radians(self.angle))
-        glVertex2f(x, y)
-        glEnd()
-        
-        glBegin(GL_TRIANGLE_FAN)
-        glColor4f(0.0, 0.5, 0.0, 0.15)
-        glVertex2f(0, 0)
+        x = radius * math.cos(math.radians(angle))
+        y = radius * math.sin(math.radians(angle))
+        batch.lines([(0, 0), (x, y)], (0.0, 1.0, 0.0, 1.0))
         
-        # Iterate from self.angle + 75 degrees down to self.angle - 75 degrees
-        for deg in range(int(self.angle + 75), int(self.angle - 1), -1):  # Notice the -1 step for clockwise
-            rad = math.radians(deg)
-            x = self.border_radius * math.cos(rad)
-            y = self.border_radius * math.sin(rad)
-            glVertex2f(x, y)
+        # Iterate from self.angle + 75 degrees down to self.angle - 75 degrees (clockwise)
+        rim = np.radians(np.arange(int(angle + 75), int(angle - 1), -1))
+        batch.fan((0, 0), radius * np.column_stack((np.cos(rim), np.sin(rim))),
+                  (0.0, 0.5, 0.0, 0.15), (0.0, 0.5, 0.0, 0.15))
         
-        glEnd()
         
     def draw_sweep_line_anti_clock_wise(self):
-        glBegin(GL_LINES)
-        glColor4f(0.0, 1.0, 0.0, 1.0)
-        glVertex2f(0, 0)
+        batch = self.renderer.frame
+        radius = self.simulation.border_radius
+        angle = self.simulation.angle
         
         # Calculate the endpoint of the sweep line
-        x = self.border_radius * math.cos(math.radians(self.angle))
-        y = self.border_radius * math.sin(math.radians(self.angle))
-        glVertex2f(x, y)
-        glEnd()
-        
-        glBegin(GL_TRIANGLE_FAN)
-        glColor4f(0.0, 0.5, 0.0, 0.15)
-        glVertex2f(0, 0)
-        
-        # Iterate from self.angle - 75 degrees up to self.angle + 1 degrees
-        for deg in range(int(self.angle - 75), int(self.angle + 1)):  # Changed to +1 step for counter-clockwise
-            rad = math.radians(deg)
-            x = self.border_radius * math.cos(rad)
-            y = self.border_radius * math.sin(rad)
-            glVertex2f(x, y)
-        
-        glEnd()
-    def radar_units_to_distance(self, units: float) -> float:
-        """Convert radar units to real distance (km)"""
-        return (units * 30) / self.border_radius
-        
-    def draw_central_area(self):
-        glColor4f(1.0, 0.0, 0.0, 0.2)
-        glBegin(GL_TRIANGLE_FAN)
-        glVertex2f(0, 0)
-        segments = 50
-        for i in range(segments + 1):
-            theta = 2.0 * math.pi * i / segments
-            x = self.center_radius * math.cos(theta)
-            y = self.center_radius * math.sin(theta)
-            glVertex2f(x, y)
-        glEnd()
-        
-        glColor4f(1.0, 0.0, 0.0, 1.0)
-        self.draw_circle(self.center_radius)
+        x = radius * math.cos(math.radians(angle))
+        y = radius * math.sin(math.radians(angle))
+        batch.lines([(0, 0), (x, y)], (0.0, 1.0, 0.0, 1.0))
+        
+        # Iterate from self.angle - 75 degrees up to self.angle + 1 degrees (counter-clockwise)
+        rim = np.radians(np.arange(int(angle - 75), int(angle + 1)))
+        batch.fan((0, 0), radius * np.column_stack((np.cos(rim), np.sin(rim))),
+                  (0.0, 0.5, 0.0, 0.15), (0.0, 0.5, 0.0, 0.15))
+    def draw_central_area(self, batch):
+        radius = self.simulation.center_radius
+        batch.fan((0, 0), radius * unit_circle(50), (1.0, 0.0, 0.0, 0.2), (1.0, 0.0, 0.0, 0.2))
+        self.draw_circle(batch, radius, (1.0, 0.0, 0.0, 1.0))
     
-    def draw_circle(self, radius, segments=50):
-        glBegin(GL_LINE_LOOP)
-        for i in range(segments):
-            theta = 2.0 * math.pi * i / segments
-            x = radius * math.cos(theta)
-            y = radius * math.sin(theta)
-            glVertex2f(x, y)
-        glEnd()
+    def draw_circle(self, batch, radius, color, segments=50):
+        batch.line_loop(radius * unit_circle(segments)[:-1], color)
     
     
     def draw(self):
-        glClear(GL_COLOR_BUFFER_BIT)
-        glLoadIdentity()
+        self.renderer.begin_frame()
         
-        # Draw distance circles with labels
-        for circle_info in self.distance_circles:
-            self.draw_circle_with_label(circle_info)
+        # Static scope first, the dynamic layers are drawn over it
+        self.draw_background()
+        self.draw_sweep_line_anti_clock_wise()
+        self.draw_moving_objects()
+        self.draw_polygons()
+        self.draw_recognition_status()
+        self.draw_frame_stats()
+
+    def draw_frame_stats(self):
+        """GL calls and batched vertices of the previous frame, to keep the renderer honest"""
+        if self.show_frame_stats:
+            self.render_text(f"GL calls/frame: {self.renderer.last_frame_calls}  vertices: {self.renderer.last_frame_vertices}",
+                             -1.95, -1.85)
+
+    def background_key(self):
+        """Everything the static scope depends on"""
+        return (tuple((circle["radius"], circle["distance"]) for circle in self.simulation.distance_circles),
+                self.simulation.border_radius, self.simulation.center_radius)
+
+    def build_background(self, batch):
+        """Range rings, border, crosshairs and the central area, uploaded once as a static buffer"""
+        # Draw distance circles
+        for circle_info in self.simulation.distance_circles:
+            self.draw_range_ring(batch, circle_info)
             
         # Draw outer border
-        glColor4f(0.0, 1.0, 0.0, 1.0)
-        self.draw_circle(self.border_radius)
+        border_radius = self.simulation.border_radius
+        self.draw_circle(batch, border_radius, (0.0, 1.0, 0.0, 1.0))
         
         # Draw crosshairs
-        glBegin(GL_LINES)
-        glVertex2f(-self.border_radius, 0)
-        glVertex2f(self.border_radius, 0)
-        glVertex2f(0, -self.border_radius)
-        glVertex2f(0, self.border_radius)
-        glEnd()
+        batch.lines([(-border_radius, 0), (border_radius, 0), (0, -border_radius), (0, border_radius)],
+                    (0.0, 1.0, 0.0, 1.0))
         
-        self.draw_central_area()
-        self.draw_sweep_line_anti_clock_wise()
-        self.draw_moving_objects()
-        self.draw_polygons()
+        self.draw_central_area(batch)
+
+    def draw_background(self):
+        """Draw the static scope buffer, rebuilt only when rings, border or window size changed"""
+        self.renderer.draw_static('background', self.background_key(), self.build_background)
+        # Ring labels are static labels: their geometry is already cached by the text renderer
+        for circle_info in self.simulation.distance_circles:
+            self.draw_range_label(circle_info)
+
+    def draw_recognition_status(self):
+        """Show ASR backlog in the corner so slow decoding is visible to the operator"""
+        if not self.model_loader.is_ready():
+            self.render_text(self.model_loader.status_text(), -1.95, 1.85)
+        depth = self.recognition_worker.queue_depth()
+        if depth == 0 and not self.recognition_worker.latencies:
+            return
+        self.render_text(f"ASR queue: {depth}  avg {self.recognition_worker.average_latency():.1f}s", -1.95, 1.95)
         
     def draw_polygons(self):
-        for polygon in self.polygon_manager.get_polygons():
+        polygons = self.simulation.polygon_manager.get_polygons()
+        for polygon in polygons:
             self.draw_polygon(polygon)
         
-            # Calculate the centroid of the polygon for positioning the text
-            centroid_x = sum(vertex[0] for vertex in polygon.vertices) / len(polygon.vertices)
-            centroid_y = sum(vertex[1] for vertex in polygon.vertices) / len(polygon.vertices)
-
-            # Render the polygon ID near the centroid
-            glColor3f(0.5, 0.5, 0.5)  # Set color to grey for the ID text
-            self.render_text(str(polygon.id), centroid_x, centroid_y)
+            # Render the polygon ID near the cached centroid, dimmed green like the grey-tinted text before
+            centroid_x, centroid_y = polygon.mesh.centroid.tolist()
+            self.text.static_label(str(polygon.id), centroid_x, centroid_y, (0.0, 0.5, 0.0, 1.0))
+        
+        self.draw_noise(polygons)
         
         # Then draw all sectors
-        for sector in self.polygon_manager.get_sectors():
+        for sector in self.simulation.polygon_manager.get_sectors():
             # Calculate position for text (top right corner of sector)
             #text_angle = math.radians(sector.angle + sector.width/4)  # Position text slightly right of center
             #text_distance = sector.distance * 0.9  # Position text at 90% of the sector's radius
@@ -508,14 +291,11 @@ class Radar:
             
             # Render sector ID text
             #self.render_text(str(sector.id), text_x, text_y)
-            sector.draw()
+            sector.draw(self.renderer.frame)
             
 
-    def remove_polygon_by_id(self, polygon_id: int):
-        self.polygon_manager.remove_polygon(polygon_id)
-
     def run(self):
-        self.set_sector_angle(35.0)
+        self.simulation.set_sector_angle(35.0)
 
 
         #self.polygon_manager.create_sector(random.uniform(5, 25), random.uniform(0, 360), random.choice(PolygonType.__args__))
@@ -523,206 +303,155 @@ class Radar:
         # Create some test sectors
         #self.create_sector(10, 45, "signal_rejection")  # At 45 degrees
         #self.create_sector(28, 87, "wind")  # At 135 degrees
-        audio_recorder = AudioRecorder(self.dir_to_save_wav)
+        audio_recorder = AudioRecorder(
+            self.dir_to_save_wav,
+            sample_rate=self.audio_config.get("sample_rate", 16000),
+            in_memory=self.audio_config.get("in_memory", True),
+            archive_wav=self.audio_config.get("archive_wav", True),
+            chunk_seconds=self.streaming_config.get("chunk_seconds", 5.0),
+            chunk_overlap_seconds=self.streaming_config.get("overlap_seconds", 1.0),
+            vad=self.vad
+        )
+        utterance_id = None
+        last_frame = time.perf_counter()
         
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    self.recognition_worker.stop()
                     pygame.quit()
                     return
                 elif event.type == KEYDOWN:
                     if event.key == K_ESCAPE:
+                        self.recognition_worker.stop()
                         pygame.quit()
                         return
                     elif event.key == K_UP:
-                        self.radar_speed *= 1.2
+                        self.simulation.radar_speed *= 1.2
                     elif event.key == K_DOWN:
-                        self.radar_speed *= 0.8
+                        self.simulation.radar_speed *= 0.8
                     elif event.key == K_k:
-                        audio_recorder.start_recording()
+                        if self.model_loader.status == 'failed':
+                            print('Voice command rejected: models failed to load')
+                            continue
+                        if not self.model_loader.is_ready():
+                            print('Models loading: the command will be decoded once they are ready')
+                        utterance_id = self.start_voice_command(audio_recorder)
                     # Handle trajectory toggling for specific objects
                     elif pygame.key.get_mods() & pygame.KMOD_CTRL:
                         if K_1 <= event.key <= K_9:
                             object_id = event.key - K_1 + 1
                             # Toggle trajectory for specific object ID
-                            if object_id in self.show_trajectory_ids:
-                                self.show_trajectory_ids.remove(object_id)
-                            else:
-                                self.show_trajectory_ids.add(object_id)
+                            self.simulation.toggle_trajectory(object_id)
                     # Handle polygon removal (when Ctrl is not pressed)
                     elif K_1 <= event.key <= K_9:
                         number = event.key - K_1 + 1
-                        if not self.polygon_manager.remove_polygon(number):
+                        if not self.simulation.remove_polygon_by_id(number):
                             print(f"Polygon {number} does not exist.")
                 elif event.type == KEYUP:
                     # Stop recording when K key is released
-                    if event.key == K_k:
+                    if event.key == K_k and audio_recorder.recording:
                         
                         try:
-                            filename = audio_recorder.stop_recording()
-                            text = self.pipe(str(filename), generate_kwargs={"language": "russian"})
-                            print(f'Recognized string: {text}')
-                            self.algorithm_reconizer.recognize(text['text'].lower())
+                            self.finish_voice_command(audio_recorder, utterance_id)
                         except Exception as e:
                             traceback.print_exc()
                             continue
                         #tokens = tokenize_russian_text(text)
                         #print('Split to tokens')
                         
-            self.update_objects()
-            self.draw()
-            #self.angle = (self.angle + self.radar_speed) % 360
-            self.angle = (self.angle - self.radar_speed) % 360
-            self.draw_polygons()
+            self.update_model_status()
+            self.apply_recognition_results()
+            # Fixed ticks for the real time that passed, a slow frame no longer changes the physics
+            now = time.perf_counter()
+            for _ in range(self.simulation.clock.advance(now - last_frame)):
+                self.simulation.step()
+            last_frame = now
+            self.draw()  # Polygons included
+            self.renderer.flush()
+            self.text.flush()
+            self.renderer.end_frame()
 
             pygame.display.flip()
             pygame.time.wait(20)
 
     
     def draw_moving_objects(self):
-        current_time = time.time()
+        current_time = self.simulation.current_time
+        render_time = self.simulation.clock.render_time()
+        frame_alpha = self.simulation.clock.alpha
         
         # Draw trajectories first
-        for obj in self.moving_objects:
+        for obj in self.simulation.moving_objects:
             if obj.active and obj.visible:
-                self.update_moving_object(obj)
+                self.simulation.update_moving_object(obj)
                 
-                if obj.target_id in self.show_trajectory_ids:
+                if obj.target_id in self.simulation.show_trajectory_ids:
                     obj.show_trajectory = True
-                    trajectory_points = obj.get_full_trajectory(current_time)
-                    if trajectory_points:
-                        glBegin(GL_LINE_STRIP)
-                        if obj.status == 'unknown':
-                            glColor4f(0.0, 0.0, 1.0, 0.5)
-                        elif obj.status == 'enemy':
-                            glColor4f(1.0, 0.0, 0.0, 0.5)
-                        else:  # ally
-                            glColor4f(0.0, 1.0, 0.0, 0.5)
-                        
-                        for point in trajectory_points:
-                            glVertex2f(point[0], point[1])
-                        glEnd()
+                    history = obj.trajectory_points
+                    future = obj.calculate_future_trajectory(current_time)
+                    if obj.status == 'unknown':
+                        color = (0.0, 0.0, 1.0, 0.5)
+                    elif obj.status == 'enemy':
+                        color = (1.0, 0.0, 0.0, 0.5)
+                    else:  # ally
+                        color = (0.0, 1.0, 0.0, 0.5)
+                    
+                    # Both parts become segments of the frame batch, drawn in the same call as the checkmarks
+                    for points in (history, future):
+                        self.renderer.frame.line_strip(points, color)
                 else:
                     obj.show_trajectory = False
 
         # Draw objects
-        for obj in self.moving_objects:
+        for obj in self.simulation.moving_objects:
             if obj.active and obj.visible:
-                alpha = self.calculate_object_alpha(obj, current_time)
+                alpha = self.calculate_object_alpha(obj, render_time)
                 if alpha > 0:
-                    self.draw_checkmark(obj.pos[0], obj.pos[1], status=obj.status, size=0.2)
-                    glColor3f(0.0, 1.0, 0.0)  # Bright green for better visibility
+                    x, y = self.simulation.interpolated_position(obj, frame_alpha)
+                    self.draw_checkmark(x, y, status=obj.status, size=0.2)
                     # Format text with proper spacing
                     info_text = f"ID: {obj.target_id}\n{obj.distance:.1f} km\nAZ: {obj.azimuth:.1f}°"
-                    self.render_text(info_text, obj.pos[0], obj.pos[1])
+                    self.render_text(info_text, x, y)
 
-    def draw_circle_with_label(self, circle_info):
+    def draw_range_ring(self, batch, circle_info):
+        self.draw_circle(batch, circle_info["radius"], (0.0, 0.3, 0.0, 1.0))
+
+    def draw_range_label(self, circle_info):
         radius = circle_info["radius"]
         distance = circle_info["distance"]
         
-        # Draw circle
-        glColor4f(0.0, 0.3, 0.0, 1.0)
-        self.draw_circle(radius)
-        
         # Draw distance label with proper spacing
         label_x = radius * math.cos(math.radians(45))
         label_y = radius * math.sin(math.radians(45))
-        glColor3f(0.0, 1.0, 0.0)
-        self.render_text(f"{distance} km", label_x, label_y)
+        self.text.static_label(f"{distance} km", label_x, label_y)
  
     # Update the draw_polygon function to use the polygon's color
     def draw_polygon(self, polygon: Polygon):
-        """Draw a filled polygon with soft edges and enhanced radar noise effect."""
-        current_time = time.time()
+        """Draw a filled polygon with soft edges, its radar noise is drawn by draw_noise."""
+        batch = self.renderer.frame
         
         # Use polygon's color instead of fixed color
         r, g, b = polygon.color
+        mesh = polygon.mesh  # Centroid, edge layers and fill triangles, built once per outline
         
-        # Draw base polygon with gradient edges
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        
-        # Draw multiple layers with decreasing opacity for soft edge effect
-        edge_layers = 15
-        base_size = 1.0
-        edge_growth = 0.008
-        
-        for layer in range(edge_layers - 1, -1, -1):
-            scale_factor = base_size + (layer * edge_growth)
-            alpha = 0.1 * (1 - (layer / edge_layers))
-            
-            glBegin(GL_POLYGON)
-            glColor4f(r * 0.3, g * 0.3, b * 0.3, alpha)  # Darker version of polygon's color
-            
-            center_x = sum(v[0] for v in polygon.vertices) / len(polygon.vertices)
-            center_y = sum(v[1] for v in polygon.vertices) / len(polygon.vertices)
-            
-            for vertex in polygon.vertices:
-                scaled_x = center_x + (vertex[0] - center_x) * scale_factor
-                scaled_y = center_y + (vertex[1] - center_y) * scale_factor
-                glVertex2f(scaled_x, scaled_y)
-            
-            glEnd()
+        # Draw multiple layers with decreasing opacity for soft edge effect, darker version of polygon's color
+        batch.triangles(mesh.edge_fill, mesh.edge_colors(polygon.color))
         
         # Draw main polygon body with polygon's color
-        glBegin(GL_POLYGON)
-        glColor4f(r, g, b, 0.7)
-        for vertex in polygon.vertices:
-            glVertex2f(*vertex)
-        glEnd()
-        
-        # Initialize noise if not exists
-        if not hasattr(polygon, 'noise'):
-            polygon.noise = RadarNoise(polygon.vertices)
-        
-        # Draw noise effects with adjusted color
-        for point in polygon.noise.noise_points:
-            if polygon.noise.point_in_polygon(point.x, point.y):
-                time_factor = current_time * point.speed + polygon.noise.time_offset
-                wave = math.sin(time_factor + point.phase)
-                intensity = point.intensity * (0.5 + 0.5 * wave)
-                
-                # Use polygon's color for noise effects
-                draw_gradient_circle(
-                    point.x + 0.02 * math.cos(time_factor), 
-                    point.y + 0.02 * math.sin(time_factor),
-                    point.radius,
-                    intensity * 0.7,
-                    (r, g, b)  # Pass polygon's color to gradient circle
-                )
-        
-        # Add scanning line effect with polygon's color
-        scan_angle = (current_time * 2) % (2 * math.pi)
-        for vertex in polygon.vertices:
-            if polygon.noise.point_in_polygon(vertex[0], vertex[1]):
-                angle_to_vertex = math.atan2(vertex[1], vertex[0])
-                angle_diff = abs(angle_to_vertex - scan_angle)
-                if angle_diff < 0.3:
-                    intensity = 0.2 * (1 - angle_diff / 0.3)
-                    draw_gradient_circle(
-                        vertex[0],
-                        vertex[1],
-                        0.07,
-                        intensity,
-                        (r, g, b)  # Pass polygon's color
-                    )
-    
-    
-# Update the gradient circle function to accept color
-def draw_gradient_circle(x: float, y: float, radius: float, alpha: float, color: Tuple[float, float, float]):
-    """Draw a circle with radial gradient using the polygon's color."""
-    segments = 32
-    r, g, b = color
-    
-    glBegin(GL_TRIANGLE_FAN)
-    glColor4f(r, g, b, alpha)  # Center color using polygon's color
-    glVertex2f(x, y)
-    
-    glColor4f(r, g, b, 0)  # Fade to transparent while keeping the color
-    for i in range(segments + 1):
-        angle = 2.0 * math.pi * i / segments
-        px = x + radius * math.cos(angle)
-        py = y + radius * math.sin(angle)
-        glVertex2f(px, py)
-    glEnd()
+        batch.triangles(mesh.fill, (r, g, b, 0.7))
 
+    def draw_noise(self, polygons):
+        """Animate the radar noise of every polygon in one NumPy pass and batch all glows together."""
+        for polygon in polygons:
+            # Initialize noise if not exists
+            if not hasattr(polygon, 'noise'):
+                polygon.noise = RadarNoise(polygon.vertices, self.noise_rng, self.noise_points)
+        self.noise_field.update([polygon.noise for polygon in polygons], [polygon.color for polygon in polygons])
+        
+        # Glows in the polygon's color fading to transparent, plus the vertices lit by the scanning line
+        centers, radii, colors = self.noise_field.glows(self.simulation.clock.render_time())
+        rim_colors = colors.copy()
+        rim_colors[:, 3] = 0
+        rims = centers[:, None] + radii[:, None, None] * unit_circle(self.noise_segments)
+        self.renderer.frame.fans(centers, rims, colors, rim_colors)
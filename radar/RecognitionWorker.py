@@ -0,0 +1,98 @@
+import queue
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+
+@dataclass
+class RecognitionJob:
+    job_id: int
+    audio: Any  # Whatever the transcribe callable accepts (path to WAV, raw samples, ...)
+    submitted_at: float
+
+
+@dataclass
+class RecognitionResult:
+    job_id: int
+    text: Optional[str]
+    queue_wait: float  # Seconds the job spent waiting in the queue
+    latency: float  # Seconds from submit to finished transcription
+    queue_depth: int  # Jobs still waiting when this one finished
+    error: Optional[str] = None
+
+
+class RecognitionWorker:
+    """Background speech recognition: jobs go in from the main loop, results come back between frames"""
+
+    def __init__(self, transcribe: Callable[[Any], Optional[str]], backlog_warning: int = 2, history_size: int = 50):
+        self.transcribe = transcribe
+        self.backlog_warning = backlog_warning  # Warn when more jobs than this are waiting
+        self.jobs: "queue.Queue[Optional[RecognitionJob]]" = queue.Queue()
+        self.results: "queue.Queue[RecognitionResult]" = queue.Queue()
+        self.latencies = deque(maxlen=history_size)
+        self.next_job_id = 1
+        self.busy = False
+        self.thread = threading.Thread(target=self._run, name="recognition-worker", daemon=True)
+        self.thread.start()
+
+    def submit(self, audio) -> int:
+        """Queue a finished recording for transcription and return its job id"""
+        job = RecognitionJob(job_id=self.next_job_id, audio=audio, submitted_at=time.perf_counter())
+        self.next_job_id += 1
+        self.jobs.put(job)
+        depth = self.queue_depth()
+        if depth > self.backlog_warning:
+            print(f'Recognition is falling behind: {depth} commands waiting')
+        return job.job_id
+
+    def poll_results(self) -> List[RecognitionResult]:
+        """Return every finished result without blocking the caller"""
+        finished = []
+        while True:
+            try:
+                finished.append(self.results.get_nowait())
+            except queue.Empty:
+                return finished
+
+    def queue_depth(self) -> int:
+        """Number of jobs waiting, including the one being decoded"""
+        return self.jobs.qsize() + (1 if self.busy else 0)
+
+    def average_latency(self) -> float:
+        if not self.latencies:
+            return 0.0
+        return sum(self.latencies) / len(self.latencies)
+
+    def stop(self, timeout: float = 1.0):
+        self.jobs.put(None)
+        self.thread.join(timeout)
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            self.busy = True
+            started = time.perf_counter()
+            text, error = None, None
+            try:
+                text = self.transcribe(job.audio)
+            except Exception:
+                error = traceback.format_exc()
+            finished = time.perf_counter()
+            self.busy = False
+            if text is None and error is None:
+                continue  # Partial work (e.g. a streamed chunk), nothing to apply yet
+            latency = finished - job.submitted_at
+            self.latencies.append(latency)
+            self.results.put(RecognitionResult(
+                job_id=job.job_id,
+                text=text,
+                queue_wait=started - job.submitted_at,
+                latency=latency,
+                queue_depth=self.jobs.qsize(),
+                error=error
+            ))
@@ -0,0 +1,106 @@
+import json
+import time
+from collections import deque
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, List
+
+from radar.AsrBenchmark import load_wav
+from radar.Transcriber import Transcriber
+
+# Per-process NLP state of the replay workers
+_recognizer = None
+
+
+def _init_nlp_worker():
+    global _recognizer
+    from radar.__main__ import prepare_NER_parser
+    from radar.AlgorithmRecognition import AlgorithmRecognizer
+    segmenter, syntax_parser, morph = prepare_NER_parser()
+    # Commands are only parsed, nothing is executed, so no radar is needed
+    _recognizer = AlgorithmRecognizer(None, segmenter, syntax_parser, morph)
+
+
+def parse_transcript(transcript: str) -> Dict:
+    """NLP stage of one file, run in a worker process"""
+    import contextlib
+    import io
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        match = _recognizer.parse(transcript.lower())
+    result = {'command': None, 'slots': {}, 'missing': [], 'match_s': None}
+    if match is not None:
+        result.update(command=match.name, slots=match.slots, missing=match.missing, match_s=match.seconds)
+    result['nlp_s'] = time.perf_counter() - started
+    return result
+
+
+def _report_line(path: Path, speech_seconds: float, transcript: str, asr_seconds: float, result: Dict) -> str:
+    return json.dumps({
+        'file': path.name,
+        'speech_s': speech_seconds,
+        'transcript': transcript,
+        'command': result['command'],
+        'slots': result['slots'],
+        'missing': result['missing'],
+        'timings': {'asr_s': asr_seconds, 'nlp_s': result['nlp_s'], 'match_s': result['match_s']},
+    }, ensure_ascii=False) + '\n'
+
+
+def replay(transcriber: Transcriber, recordings: List[Path], output: Path, batch_size: int = 8,
+           workers: int = 2, vad=None) -> Dict:
+    """Run saved recordings through ASR and the command parser, one JSONL line per file"""
+    started = time.perf_counter()
+    audio_seconds = 0.0
+    parsed = 0
+    # (path, speech samples, transcript, ASR seconds, NLP result) in file order; only sizes are kept, not audio
+    pending = deque()
+    no_speech = {'command': None, 'slots': {}, 'missing': [], 'nlp_s': 0.0, 'match_s': None}
+
+    def write_ready(report, wait: bool = False):
+        """Write the lines of finished files in order, so an interrupted run keeps its report"""
+        nonlocal parsed
+        while pending and (wait or pending[0][4] is None or pending[0][4].ready()):
+            path, samples, transcript, asr_seconds, nlp = pending.popleft()
+            result = nlp.get() if nlp is not None else no_speech
+            parsed += result['command'] is not None and not result['missing']
+            report.write(_report_line(path, samples / transcriber.sample_rate, transcript, asr_seconds, result))
+        report.flush()
+
+    with Pool(workers, initializer=_init_nlp_worker) as pool, open(output, 'w', encoding='utf-8') as report:
+        for first in range(0, len(recordings), batch_size):
+            batch = recordings[first:first + batch_size]
+            trimmed = []  # (path, audio left after VAD) of every file of the batch
+            for path in batch:
+                audio = load_wav(path, transcriber.sample_rate)
+                audio_seconds += len(audio) / transcriber.sample_rate
+                if vad is not None:
+                    audio, _ = vad.trim(audio)
+                trimmed.append((path, audio))
+            audios = [audio for path, audio in trimmed if len(audio)]
+            batch_started = time.perf_counter()
+            transcripts = iter(transcriber.transcribe_batch(audios, batch_size) if audios else [])
+            asr_seconds = (time.perf_counter() - batch_started) / len(audios) if audios else 0.0
+            # NLP of this batch overlaps with ASR of the next one
+            for path, audio in trimmed:
+                if not len(audio):
+                    pending.append((path, 0, '', 0.0, None))  # VAD found no speech, nothing to decode
+                    continue
+                transcript = next(transcripts)
+                pending.append((path, len(audio), transcript, asr_seconds, pool.apply_async(parse_transcript, (transcript,))))
+            write_ready(report)
+            print(f'Transcribed {min(first + batch_size, len(recordings))}/{len(recordings)}')
+        write_ready(report, wait=True)
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        'files': len(recordings),
+        'parsed': parsed,
+        'audio_s': audio_seconds,
+        'elapsed_s': elapsed,
+        'files_per_s': len(recordings) / elapsed if elapsed else 0.0,
+        'rtf': elapsed / audio_seconds if audio_seconds else 0.0,
+    }
+    print(f"{summary['files']} files, {summary['parsed']} parsed commands, "
+          f"{summary['files_per_s']:.2f} files/s, RTF {summary['rtf']:.3f}; report: {output}")
+    return summary
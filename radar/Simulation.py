@@ -0,0 +1,293 @@
+import hashlib
+import math
+import random
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from radar.AzimuthIndex import AzimuthIndex, in_arc
+from radar.MovingObject import MovingObject
+from radar.PolygonUtils import PolygonManager, Polygon, PolygonType
+from radar.SimulationClock import SimulationClock
+from radar.TrackStore import TrackStore
+
+
+class Simulation:
+    """Radar world state: targets, polygons, sectors and the sweep, without pygame or OpenGL"""
+    def __init__(self, seed: Optional[int] = None, clock: Optional[SimulationClock] = None, max_objects: int = 10,
+                 retired_history: int = 100, trajectory_length: int = 512, trajectory_epsilon: Optional[float] = None):
+        # Same seed and timestep -> the same targets, polygons and trajectories on every run
+        self.seed = random.SystemRandom().randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.clock = clock or SimulationClock()
+        self.border_radius = 1.9  # максимальный радиус в радарных единицах
+        self.max_distance_km = 30  # максимальная дистанция в км
+        self.distance_circles = [
+            {"radius": 0.5, "distance": 10},
+            {"radius": 0.8, "distance": 15},
+            {"radius": 1.1, "distance": 20},
+            {"radius": 1.4, "distance": 25},
+            {"radius": 1.7, "distance": self.max_distance_km}
+        ]
+        self.polygon_manager = PolygonManager()
+        self.min_sides = 6
+        self.max_sides = 30
+        self.min_polygons_number = 1
+        self.max_polygons_number = 5
+        # Generate random polygons on initialization
+        self.generate_random_polygons()
+
+        self.sector_angle_degrees = 60.0
+        self.angle = 0
+        self.radar_speed = 5.0
+        self.sweep_step = 0.0  # Degrees the sweep turned on its last advance
+        self.center_radius = 0.3
+        # Bounded table of per-target arrays, rows of finished targets are reused
+        self.tracks = TrackStore(max_objects, retired_history, trajectory_length, trajectory_epsilon)
+        self.moving_objects_dict: Dict[int, MovingObject] = self.tracks.by_id  # O(1) lookup of active targets
+        self.azimuth_index = AzimuthIndex()  # Active tracks by azimuth bucket, rebuilt every update
+        self.current_time = self.clock.time  # Simulation time of the last update
+        self.last_spawn_time = self.current_time
+        self.spawn_delay = 1.0
+        self.next_target_id = 1
+        self.max_objects = max_objects
+        self.max_objects_per_rad = 3
+        self.fade_in_duration = 0.5
+        self.visibility_duration = 2.0
+        self.show_trajectory_ids: Set[int] = set()
+
+    def create_sector(self, distance_km: float, angle: float, type_sector: str):
+        """Создает сектор, принимая расстояние в километрах"""
+        #radar_distance = self.km_to_radar_units(distance_km, )
+        return self.polygon_manager.create_sector(distance_km, angle, type_sector, self.max_distance_km, self.distance_circles)
+        
+        
+    def get_distance_from_center(self, x: float, y: float) -> float:
+        """Calculate the distance from center in radar units"""
+        return math.sqrt(x * x + y * y)
+    
+    def get_azimuth(self, x: float, y: float) -> float:
+        """Calculate azimuth in degrees"""
+        azimuth = math.degrees(math.atan2(y, x))
+        if azimuth < 0:
+            azimuth += 360
+        return azimuth
+
+    def distance_to_radar_units(self, distance: float) -> float:
+        """Convert real distance (km) to radar units"""
+        # Scale factor: border_radius corresponds to maximum distance (30 km)
+        return (distance * self.border_radius) / 30
+    
+    
+    def generate_random_polygons(self):
+        num_polygons = self.rng.randint(self.min_polygons_number, self.max_polygons_number)
+        for i in range(num_polygons):
+            center = self.generate_border_point_inside_radar()
+            polygon = self.create_random_polygon(i + 1, center)  # Pass the ID (1-based)
+            self.polygon_manager.add_polygon(polygon)  # Add the VERTICES, not the Polygon object
+
+                
+    def set_sector_angle(self, angle: float):
+       """Set the angular sector width in degrees."""
+       self.sector_angle_degrees = angle
+
+        
+    def generate_random_speed(self) -> float:
+        """Generate random speed factor between 0.5 and 2.0"""
+        return self.rng.uniform(0.05, 0.1)
+
+
+    def create_random_polygon(self, polygon_id: int, center: Tuple[float, float]) -> Polygon:
+        """Create a random convex polygon with a maximum angle."""
+        num_sides = self.rng.randint(self.min_sides, self.max_sides)  # Randomly choose the number of sides
+        angle_offset = self.rng.uniform(0, 90)  # Offset for the polygon's rotation
+        angle_step = 90 / num_sides  # Maximum angle step
+        
+        vertices = []
+        for i in range(num_sides):
+            angle = angle_offset + i * angle_step
+            rad_angle = math.radians(angle)
+            radius = self.rng.uniform(0.2, 0.5)  # Random distance from center
+            x = center[0] + radius * math.cos(rad_angle)
+            y = center[1] + radius * math.sin(rad_angle)
+            vertices.append((x, y))
+        
+        #polygon_type = self.rng.choice(self.polygon_types)
+        polygon_type = self.rng.choice(PolygonType.__args__)
+        return Polygon(id=polygon_id, vertices=vertices, type=polygon_type)
+
+
+    def spawn_polygons(self):
+        num_polygons = self.rng.randint(n, m)  # Define n and m
+        for i in range(num_polygons):
+            center = self.generate_border_point_inside_radar()  # Random position on the border
+            polygon = self.create_random_polygon(i, center)
+            self.polygons.append(polygon)  # Store the polygon
+
+
+    def generate_control_point(self, start_pos: List[float]) -> List[float]:
+        dx = -start_pos[0]
+        dy = -start_pos[1]
+        length = math.sqrt(dx*dx + dy*dy)
+        
+        perp_x = -dy/length
+        perp_y = dx/length
+        
+        offset = self.rng.uniform(-1, 1)
+        control_x = (start_pos[0] + (-start_pos[0])) / 2 + perp_x * offset
+        control_y = (start_pos[1] + (-start_pos[1])) / 2 + perp_y * offset
+        
+        return [control_x, control_y]
+    
+    def get_objects_in_sector(self, angle: float, angle_width: float = 1.0) -> int:
+        """Count active objects within angle_width radians of angle, from the buckets covering the sector"""
+        return self.azimuth_index.count(math.degrees(angle - angle_width), math.degrees(angle + angle_width))
+
+
+    def generate_border_point_inside_radar(self) -> Tuple[float, float]:
+        """Generate a random point within the radar area."""
+        radius = self.rng.uniform(0, self.border_radius)  # Limit to within the border radius
+        angle = self.rng.uniform(0, 2 * math.pi)
+        x = radius * math.cos(angle)
+        y = radius * math.sin(angle)
+        return x, y
+        
+    def generate_border_point(self) -> Tuple[float, float]:
+        angle = self.rng.uniform(0, 2 * math.pi)
+        x = self.border_radius * math.cos(angle)
+        y = self.border_radius * math.sin(angle)
+        return x, y
+
+    @property
+    def moving_objects(self) -> List[MovingObject]:
+        """Views of the active targets; finished ones are retired from the track table"""
+        return self.tracks.active_views()
+
+    def spawn_new_object(self):
+        # Check total object count
+        active_objects = self.tracks.active_count
+        if active_objects >= self.max_objects:
+            return
+        
+        x, y = self.generate_border_point()
+        angle = math.atan2(y, x)
+        if angle < 0:
+            angle += 2 * math.pi
+            
+        # Check density in current sector
+        if self.get_objects_in_sector(angle) >= self.max_objects_per_rad:
+            return
+            
+        start_pos = [x, y]
+        control_point = self.generate_control_point(start_pos)
+        
+        # Randomly choose trajectory type and speed
+        trajectory_type = self.rng.choice(['parabolic', 'straight', 'sinusoidal'])
+        speed_factor = self.generate_random_speed()
+        
+        # Randomly assign status
+        #status = self.rng.choice(['unknown', 'enemy', 'ally'])  # Random status
+        
+        self.tracks.add(
+            target_id=self.next_target_id,
+            start_pos=start_pos,
+            control_point=control_point,
+            trajectory_type=trajectory_type,
+            speed_factor=speed_factor,
+            creation_time=self.current_time
+        )
+        self.next_target_id += 1
+
+    def update_object_status(self, obj_id: int, new_status: str):
+        """Update the status of an object by ID."""
+        if obj_id in self.moving_objects_dict:
+            obj = self.moving_objects_dict[obj_id]
+            obj.status = new_status  # Change status
+    
+    def is_in_sweep_area(self, obj_x, obj_y):
+        """Check if objects are in the current sweep area (scalars or arrays of coordinates)"""
+        obj_angle = np.degrees(np.arctan2(obj_y, obj_x)) % 360
+        # Consider the sweep area (20 degrees behind the sweep line), wrapping around 0
+        return in_arc(obj_angle, (self.angle - 20) % 360, self.angle)
+            
+    def update_objects(self, current_time: float):
+        """Move the targets to current_time (simulation seconds) and spawn new ones"""
+        self.current_time = current_time
+        
+        tracks = self.tracks
+        if (current_time - self.last_spawn_time >= self.spawn_delay and 
+            tracks.active_count < self.max_objects):
+            self.spawn_new_object()
+            self.last_spawn_time = current_time
+        
+        # Positions and analytic velocities of every active track in one call
+        rows, retired_ids = tracks.update(current_time)
+        self.show_trajectory_ids.difference_update(retired_ids)
+            
+        # Update trajectory points every 50ms
+        due = rows[current_time - tracks.last_trajectory_update[rows] >= 0.05]
+        tracks.trajectories.append(due, tracks.pos[due])
+        tracks.last_trajectory_update[due] = current_time
+            
+        # Objects entering the sweep area become visible: only the buckets under the sweep are tested.
+        # The sweep turns clockwise, so the arc it crossed since the last update runs from the
+        # current angle up to the previous one, plus the lit trail behind it
+        self.azimuth_index.rebuild(rows, tracks.pos[rows])
+        swept = self.azimuth_index.query(self.angle - 20, self.angle + self.sweep_step)
+        swept = swept[~tracks.visible[swept]]
+        tracks.last_sweep[swept] = current_time
+        tracks.visible[swept] = True
+
+    
+    def update_moving_object(self, obj):
+        # Update existing methods to track distance and azimuth
+        if obj.active and obj.visible:
+            # Calculate and store distance and azimuth
+            obj.distance = self.radar_units_to_distance(
+                self.get_distance_from_center(obj.pos[0], obj.pos[1])
+            )
+            obj.azimuth = self.get_azimuth(obj.pos[0], obj.pos[1])
+            
+            
+    def radar_units_to_distance(self, units: float) -> float:
+        """Convert radar units to real distance (km)"""
+        return (units * 30) / self.border_radius
+        
+    def remove_polygon_by_id(self, polygon_id: int):
+        return self.polygon_manager.remove_polygon(polygon_id)
+
+    def toggle_trajectory(self, object_id: int):
+        if object_id in self.show_trajectory_ids:
+            self.show_trajectory_ids.remove(object_id)
+        else:
+            self.show_trajectory_ids.add(object_id)
+
+    def advance_sweep(self):
+        self.sweep_step = self.radar_speed
+        self.angle = (self.angle - self.radar_speed) % 360
+
+    def step(self):
+        """One fixed tick of the world: targets move, then the sweep turns"""
+        self.update_objects(self.clock.tick())
+        self.advance_sweep()
+
+    def run_headless(self, duration: float, on_step: Optional[Callable[['Simulation'], None]] = None) -> int:
+        """Run duration simulated seconds as fast as the CPU allows; returns the number of ticks"""
+        steps = int(round(duration / self.clock.dt))
+        for _ in range(steps):
+            self.step()
+            if on_step is not None:
+                on_step(self)
+        return steps
+
+    def interpolated_position(self, obj: MovingObject, alpha: float) -> Tuple[float, float]:
+        """Position between the last two ticks, so motion looks smooth at any frame rate"""
+        previous, current = obj.previous_pos, obj.pos
+        return (float(previous[0] + (current[0] - previous[0]) * alpha),
+                float(previous[1] + (current[1] - previous[1]) * alpha))
+
+    def state_digest(self) -> str:
+        """Short hash of the target state, to check that two runs with one seed are identical"""
+        state = [(obj.target_id, obj.active, obj.visible, round(float(obj.pos[0]), 9), round(float(obj.pos[1]), 9))
+                 for obj in self.moving_objects]
+        return hashlib.sha1(repr((self.clock.ticks, round(self.angle, 9), state)).encode()).hexdigest()[:12]
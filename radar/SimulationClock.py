@@ -0,0 +1,36 @@
+class SimulationClock:
+    """Fixed-timestep simulation time, decoupled from how long a rendered frame took"""
+    def __init__(self, dt: float = 0.02, max_frame_steps: int = 5, start: float = 0.0):
+        self.dt = dt  # Simulated seconds per tick
+        self.max_frame_steps = max_frame_steps  # A stalled frame catches up at most this many ticks
+        self.start = start  # Simulated seconds before the first tick
+        self.time = start  # Simulated seconds at the last tick
+        self.ticks = 0
+        self.accumulator = 0.0  # Real time not yet turned into ticks
+
+    def tick(self) -> float:
+        """Advance one fixed step and return the new simulation time"""
+        self.ticks += 1
+        self.time = self.start + self.ticks * self.dt  # No drift from summing dt
+        return self.time
+
+    def advance(self, real_elapsed: float) -> int:
+        """Account for real time that passed since the last frame; returns how many ticks to run"""
+        self.accumulator += real_elapsed
+        steps = int(self.accumulator // self.dt)
+        if steps > self.max_frame_steps:
+            # Drop the backlog instead of spiralling: the world slows down for a frame
+            steps = self.max_frame_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """How far the frame is between the previous tick and the current one (0..1)"""
+        return min(1.0, self.accumulator / self.dt)
+
+    def render_time(self) -> float:
+        """Simulation time of the interpolated frame"""
+        return self.time - (1.0 - self.alpha) * self.dt
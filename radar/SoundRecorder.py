@@ -7,13 +7,51 @@ import time
 from pathlib import Path
 import uuid
 
+
+class AudioBuffer:
+    """Preallocated float32 sample buffer that grows by doubling, so recording never concatenates"""
+    def __init__(self, initial_seconds=10.0, sample_rate=16000):
+        self.sample_rate = sample_rate
+        self.data = np.zeros(max(1, int(initial_seconds * sample_rate)), dtype=np.float32)
+        self.length = 0
+
+    def append(self, block: np.ndarray):
+        end = self.length + len(block)
+        if end > len(self.data):
+            grown = np.zeros(max(end, 2 * len(self.data)), dtype=np.float32)
+            grown[:self.length] = self.data[:self.length]
+            self.data = grown
+        self.data[self.length:end] = block
+        self.length = end
+
+    def view(self) -> np.ndarray:
+        """Samples recorded so far, without copying"""
+        return self.data[:self.length]
+
+    def duration(self) -> float:
+        return self.length / self.sample_rate
+
+
 class AudioRecorder:
-    def __init__(self, dir_to_save_wav, sample_rate=16000, channels=1):
+    def __init__(self, dir_to_save_wav, sample_rate=16000, channels=1, in_memory=True, archive_wav=True,
+                 chunk_seconds=5.0, chunk_overlap_seconds=1.0, vad=None):
         self.dir_to_save_wav = dir_to_save_wav
         self.sample_rate = sample_rate
         self.channels = channels
+        # In-memory mode hands float32 samples straight to the pipeline, WAV files are only an archive
+        self.in_memory = in_memory
+        self.archive_wav = archive_wav
         self.recording = False
         self.recorded_frames = []
+        self.buffer = AudioBuffer(sample_rate=sample_rate)
+        # Optional callable receiving overlapping fixed-length chunks while the key is held
+        self.chunk_listener = None
+        self.chunk_samples = int(chunk_seconds * sample_rate)
+        self.chunk_step = self.chunk_samples - int(chunk_overlap_seconds * sample_rate)
+        self.next_chunk_start = 0
+        # Optional VoiceActivityDetector trimming silence before ASR
+        self.vad = vad
+        self.last_dropped_seconds = 0.0
         self.temp_file = None
         self.save_full_filename = None
 
@@ -21,7 +59,12 @@ class AudioRecorder:
         self.recording = True
         self.recorded_frames = []
         self.save_full_filename = Path(self.dir_to_save_wav) / f"{uuid.uuid4()}.wav"
-        self.temp_file = self.save_full_filename.open('wb')
+        if self.in_memory:
+            # The previous buffer now belongs to the recognizer, start a new one of the same size
+            self.buffer = AudioBuffer(len(self.buffer.data) / self.sample_rate, self.sample_rate)
+            self.next_chunk_start = 0
+        else:
+            self.temp_file = self.save_full_filename.open('wb')
 
         self.recording_thread = threading.Thread(target=self._record)
         self.recording_thread.start()
@@ -29,17 +72,47 @@ class AudioRecorder:
     def stop_recording(self):
         self.recording = False
         self.recording_thread.join()
-        
-        audio_data = np.concatenate(self.recorded_frames, axis=0)
+
+        if self.in_memory:
+            audio_data = self.buffer.view()
+            print(f"Recorded {self.buffer.duration():.1f}s of audio")
+            if self.archive_wav:
+                threading.Thread(target=self._archive, args=(audio_data, self.save_full_filename), daemon=True).start()
+            return self._trim_silence(audio_data)
+
+        audio_data = self._trim_silence(self.recorded_frames)
+        if len(audio_data) == 0:
+            self.temp_file.close()
+            return None
 
         sf.write(self.temp_file, audio_data, self.sample_rate, subtype='PCM_16')
         self.temp_file.close()
         print(f"Recording saved to {self.temp_file.name}")
         return self.save_full_filename
 
+    def _trim_silence(self, audio_data):
+        """Cut leading/trailing silence with the VAD and report how much was dropped"""
+        if self.vad is None:
+            return audio_data if isinstance(audio_data, np.ndarray) else np.concatenate(audio_data, axis=0)
+        audio_data, self.last_dropped_seconds = self.vad.trim(audio_data)
+        print(f"VAD dropped {self.last_dropped_seconds:.2f}s of silence, {len(audio_data) / self.sample_rate:.2f}s left")
+        return audio_data
+
+    def tail(self) -> np.ndarray:
+        """Samples not covered by an emitted chunk yet (starting with the overlap)"""
+        return self.buffer.view()[self.next_chunk_start:]
+
+    def _archive(self, audio_data, filename):
+        """Save a recording to dir_to_save_wav off the main thread"""
+        try:
+            sf.write(str(filename), audio_data, self.sample_rate, subtype='PCM_16')
+            print(f"Recording archived to {filename}")
+        except Exception as e:
+            print(f"Cannot archive recording {filename}: {e}")
+
     def _record(self):
-        with sd.InputStream(samplerate=self.sample_rate, 
-                            channels=self.channels, 
+        with sd.InputStream(samplerate=self.sample_rate,
+                            channels=self.channels,
                             callback=self._audio_callback):
             while self.recording:
                 time.sleep(0.1)
@@ -48,5 +121,19 @@ class AudioRecorder:
         if status:
             print(status)
         if self.recording:
+            if self.in_memory:
+                # Mono float32 in [-1, 1] is exactly what the feature extractor expects
+                self.buffer.append(indata[:, 0] if self.channels == 1 else indata.mean(axis=1))
+                self._emit_chunks()
+                return
             indata = (indata * 32767).astype(np.int16)
             self.recorded_frames.append(indata.copy())
+
+    def _emit_chunks(self):
+        if self.chunk_listener is None:
+            return
+        while self.buffer.length - self.next_chunk_start >= self.chunk_samples:
+            start = self.next_chunk_start
+            # Views stay valid after the buffer grows: old samples are never overwritten
+            self.chunk_listener(self.buffer.data[start:start + self.chunk_samples])
+            self.next_chunk_start += self.chunk_step
@@ -0,0 +1,29 @@
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+
+class StartupProfiler:
+    """Records how long each import/load step of the startup took (printed with --profile-startup)"""
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.steps: List[Tuple[str, float, float]] = []  # (name, duration, offset from start)
+
+    @contextmanager
+    def step(self, name: str):
+        step_started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - step_started
+            self.steps.append((name, duration, step_started - self.started))
+            if self.enabled:
+                print(f'[startup] {name}: {duration:.2f}s (started at +{step_started - self.started:.2f}s)')
+
+    def report(self):
+        if not self.enabled:
+            return
+        print('[startup] summary:')
+        for name, duration, offset in sorted(self.steps, key=lambda s: s[2]):
+            print(f'[startup]   +{offset:6.2f}s  {duration:6.2f}s  {name}')
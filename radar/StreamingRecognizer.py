@@ -0,0 +1,67 @@
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class AudioChunk:
+    utterance_id: int
+    index: int
+    samples: np.ndarray  # float32 mono samples, overlapping the previous chunk
+    final: bool = False  # The tail recorded after the key was released
+
+
+def normalize_word(word: str) -> str:
+    """Compare words without case and punctuation when stitching chunks"""
+    return re.sub(r'[^\w]', '', word.lower())
+
+
+def merge_hypotheses(previous: List[str], new: List[str], max_overlap: int = 6) -> List[str]:
+    """Append a chunk transcript, dropping the words repeated from the overlapping audio"""
+    if not previous:
+        return list(new)
+    previous_norm = [normalize_word(w) for w in previous[-max_overlap:]]
+    new_norm = [normalize_word(w) for w in new[:max_overlap]]
+    for k in range(min(len(previous_norm), len(new_norm)), 0, -1):
+        if previous_norm[-k:] == new_norm[:k]:
+            return previous + new[k:]
+    # No exact overlap: the boundary word is often cut in half, let the longer chunk win
+    if new_norm and previous_norm and (new_norm[0].startswith(previous_norm[-1]) or previous_norm[-1].startswith(new_norm[0])):
+        return previous[:-1] + new
+    return previous + new
+
+
+class StreamingRecognizer:
+    """Transcribes overlapping chunks while the key is held and merges them into one command"""
+    def __init__(self, transcribe: Callable[[np.ndarray], str], min_tail_seconds: float = 0.2, sample_rate: int = 16000,
+                 has_speech: Optional[Callable[[np.ndarray], bool]] = None, overlap_seconds: float = 1.0):
+        self.transcribe = transcribe
+        self.has_speech = has_speech  # Silent chunks are skipped instead of being decoded
+        self.min_tail_samples = int(min_tail_seconds * sample_rate)
+        self.overlap_samples = int(overlap_seconds * sample_rate)  # The tail starts with audio already decoded
+        self.hypotheses: Dict[int, List[str]] = {}
+        self.next_utterance_id = 1
+
+    def begin(self) -> int:
+        """Start a new utterance and return its id"""
+        utterance_id = self.next_utterance_id
+        self.next_utterance_id += 1
+        return utterance_id
+
+    def accept(self, chunk: AudioChunk) -> Optional[str]:
+        """Decode one chunk (on the recognition thread); returns the merged text for the final chunk"""
+        words = self.hypotheses.get(chunk.utterance_id, [])
+        # A tail with little new audio past the overlap has already been decoded
+        tail_decoded = chunk.final and words and len(chunk.samples) - self.overlap_samples < self.min_tail_samples
+        silent = self.has_speech is not None and not self.has_speech(chunk.samples)
+        if not (tail_decoded or silent):
+            text = self.transcribe(chunk.samples)
+            words = merge_hypotheses(words, text.split())
+            print(f'Partial hypothesis {chunk.utterance_id}.{chunk.index}: {" ".join(words)}')
+        if not chunk.final:
+            self.hypotheses[chunk.utterance_id] = words
+            return None
+        self.hypotheses.pop(chunk.utterance_id, None)
+        return ' '.join(words)
@@ -0,0 +1,168 @@
+import string
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from radar.LazyImport import lazy_import
+
+GL = lazy_import('OpenGL.GL')
+
+Color = Tuple[float, float, float, float]
+
+# Everything the console prints: ASCII, the degree sign and Russian for model and command messages
+CHARSET = (string.digits + string.ascii_letters + string.punctuation + ' °№'
+           + ''.join(map(chr, range(ord('А'), ord('я') + 1))) + 'Ёё')
+ATLAS_WIDTH = 512
+
+
+class TextRenderer:
+    """Text drawn from a glyph atlas rendered once from a pygame font.
+
+    Labels are queued during the frame and flush() draws all of them from one
+    vertex array in a single call. Label layouts are cached by text, and static
+    labels (distance rings, polygon ids) keep their finished screen geometry.
+    """
+    def __init__(self, font, width: int, height: int, charset: str = CHARSET, layout_cache_size: int = 512, gl=None):
+        self.font = font
+        self.gl = gl or GL  # e.g. the CountedGL of the batch renderer
+        self.line_height = font.get_height()
+        self.glyphs: Dict[str, Tuple[int, np.ndarray]] = {}  # char -> (advance in pixels, (4, 2) texcoords)
+        self.atlas_pixels, self.atlas_size = self.build_atlas(charset)
+        self.texture = None  # Uploaded on the first flush, when a GL context surely exists
+        self.layouts: 'OrderedDict[str, Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+        self.layout_cache_size = layout_cache_size
+        self.static: Dict[tuple, Tuple[np.ndarray, np.ndarray, Color]] = {}  # key -> geometry in screen pixels
+        self.static_frame: Dict[tuple, Tuple[np.ndarray, np.ndarray, Color]] = {}  # Static labels used this frame
+        self.frame: List[Tuple[np.ndarray, np.ndarray, Color]] = []  # Dynamic labels of this frame
+        self.resize(width, height)
+
+    def build_atlas(self, charset: str) -> Tuple[bytes, Tuple[int, int]]:
+        """Render every glyph white into one RGBA atlas; the label color comes from the vertex colors"""
+        import pygame
+        surfaces = {char: self.font.render(char, True, (255, 255, 255)) for char in dict.fromkeys(charset + '?')}
+        # Pack the glyphs row by row
+        places, x, y = {}, 0, 0
+        for char, surface in surfaces.items():
+            if x + surface.get_width() > ATLAS_WIDTH:
+                x, y = 0, y + self.line_height
+            places[char] = (x, y)
+            x += surface.get_width()
+        height = 1 << (y + self.line_height - 1).bit_length()
+        atlas = pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA)
+        atlas.fill((255, 255, 255, 0))
+        for char, surface in surfaces.items():
+            x, y = places[char]
+            width, glyph_height = surface.get_size()
+            atlas.blit(surface, (x, y))
+            u0, v0 = x / ATLAS_WIDTH, y / height
+            u1, v1 = (x + width) / ATLAS_WIDTH, (y + glyph_height) / height
+            self.glyphs[char] = (width, np.array([[u0, v0], [u1, v0], [u1, v1], [u0, v1]], dtype=np.float32))
+        return pygame.image.tostring(atlas, "RGBA", False), (ATLAS_WIDTH, height)
+
+    def resize(self, width: int, height: int):
+        """Cache the viewport size instead of querying GL for every label"""
+        self.width, self.height = width, height
+        self.static.clear()
+
+    def to_screen(self, x: float, y: float) -> Tuple[int, int]:
+        """Radar coordinates in [-2, 2] to window pixels, y pointing down"""
+        return int((x + 2) * self.width / 4), int((-y + 2) * self.height / 4)
+
+    def layout(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Quad corners relative to the top-left of the label and their texcoords, cached by text"""
+        cached = self.layouts.get(text)
+        if cached is not None:
+            self.layouts.move_to_end(text)
+            return cached
+        vertices, texcoords = [], []
+        for line_number, line in enumerate(text.split('\n')):
+            x, top = 0, line_number * self.line_height
+            bottom = top + self.line_height
+            for char in line:
+                advance, uv = self.glyphs.get(char) or self.glyphs['?']
+                vertices.append(((x, top), (x + advance, top), (x + advance, bottom), (x, bottom)))
+                texcoords.append(uv)
+                x += advance
+        cached = (np.array(vertices, dtype=np.float32).reshape(-1, 2),
+                  np.array(texcoords, dtype=np.float32).reshape(-1, 2))
+        self.layouts[text] = cached
+        if len(self.layouts) > self.layout_cache_size:
+            self.layouts.popitem(last=False)
+        return cached
+
+    def place(self, text: str, x: float, y: float) -> Tuple[np.ndarray, np.ndarray]:
+        vertices, texcoords = self.layout(text)
+        return vertices + np.array(self.to_screen(x, y), dtype=np.float32), texcoords
+
+    def label(self, text: str, x: float, y: float, color: Color = (0.0, 1.0, 0.0, 1.0)):
+        """Queue a label whose top-left corner is at (x, y) in radar coordinates"""
+        vertices, texcoords = self.place(text, x, y)
+        self.frame.append((vertices, texcoords, color))
+
+    def static_label(self, text: str, x: float, y: float, color: Color = (0.0, 1.0, 0.0, 1.0)):
+        """Queue a label that keeps its text and place between frames: geometry is built once"""
+        key = (text, x, y, color)
+        geometry = self.static.get(key)
+        if geometry is None:
+            geometry = self.static[key] = self.place(text, x, y) + (color,)
+        self.static_frame[key] = geometry
+
+    def build_batch(self) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Vertices, texcoords and RGBA colors of every queued label, then start a new frame"""
+        labels = list(self.static_frame.values()) + self.frame
+        # Static labels not drawn this frame are gone (e.g. a removed polygon)
+        self.static = self.static_frame
+        self.static_frame, self.frame = {}, []
+        if not labels:
+            return None
+        vertices = np.concatenate([label[0] for label in labels])
+        texcoords = np.concatenate([label[1] for label in labels])
+        colors = np.repeat(np.array([label[2] for label in labels], dtype=np.float32),
+                           [len(label[0]) for label in labels], axis=0)
+        return vertices, texcoords, colors
+
+    def upload_atlas(self):
+        self.texture = self.gl.glGenTextures(1)
+        self.gl.glBindTexture(GL.GL_TEXTURE_2D, self.texture)
+        self.gl.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
+        self.gl.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR)
+        self.gl.glTexImage2D(GL.GL_TEXTURE_2D, 0, GL.GL_RGBA, self.atlas_size[0], self.atlas_size[1], 0,
+                             GL.GL_RGBA, GL.GL_UNSIGNED_BYTE, self.atlas_pixels)
+
+    def flush(self):
+        """Draw every label queued this frame with one glDrawArrays"""
+        batch = self.build_batch()
+        if batch is None:
+            return
+        vertices, texcoords, colors = batch
+        if self.texture is None:
+            self.upload_atlas()
+
+        # Pixel coordinates with y pointing down, like the pygame surfaces the glyphs come from
+        self.gl.glMatrixMode(GL.GL_PROJECTION)
+        self.gl.glPushMatrix()
+        self.gl.glLoadIdentity()
+        self.gl.glOrtho(0, self.width, self.height, 0, -1, 1)
+        self.gl.glMatrixMode(GL.GL_MODELVIEW)
+        self.gl.glPushMatrix()
+        self.gl.glLoadIdentity()
+
+        self.gl.glEnable(GL.GL_TEXTURE_2D)
+        self.gl.glBindTexture(GL.GL_TEXTURE_2D, self.texture)
+        self.gl.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        self.gl.glEnableClientState(GL.GL_TEXTURE_COORD_ARRAY)
+        self.gl.glEnableClientState(GL.GL_COLOR_ARRAY)
+        self.gl.glVertexPointer(2, GL.GL_FLOAT, 0, vertices)
+        self.gl.glTexCoordPointer(2, GL.GL_FLOAT, 0, texcoords)
+        self.gl.glColorPointer(4, GL.GL_FLOAT, 0, colors)
+        self.gl.glDrawArrays(GL.GL_QUADS, 0, len(vertices))
+        self.gl.glDisableClientState(GL.GL_COLOR_ARRAY)
+        self.gl.glDisableClientState(GL.GL_TEXTURE_COORD_ARRAY)
+        self.gl.glDisableClientState(GL.GL_VERTEX_ARRAY)
+        self.gl.glDisable(GL.GL_TEXTURE_2D)
+
+        self.gl.glMatrixMode(GL.GL_PROJECTION)
+        self.gl.glPopMatrix()
+        self.gl.glMatrixMode(GL.GL_MODELVIEW)
+        self.gl.glPopMatrix()
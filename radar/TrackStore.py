@@ -0,0 +1,215 @@
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Sequence, Tuple, get_args
+
+import numpy as np
+
+from radar.MovingObject import MovingObject, Status, TrajectoryType
+from radar.TrajectoryHistory import TrajectoryHistory
+
+STATUSES: Tuple[str, ...] = get_args(Status)
+TRAJECTORY_TYPES: Tuple[str, ...] = get_args(TrajectoryType)
+PARABOLIC, STRAIGHT, SINUSOIDAL = (TRAJECTORY_TYPES.index(kind) for kind in ('parabolic', 'straight', 'sinusoidal'))
+
+FLIGHT_DURATION = 3.0  # Seconds of normalized flight time t in [0, 1], stretched by 1 / speed_factor
+WAVE_AMPLITUDE = 0.3  # Sideways swing of the sinusoidal trajectory
+WAVE_PERIODS = 2  # Full swings on the way through the center
+PATH_SAMPLES = 128  # Segments of the cached whole-flight path
+SCALAR_ROWS = 16  # Up to this many rows the formulas run per row: NumPy's per-call overhead dominates there
+
+
+# Trajectory formulas: position and d(pos)/d(progress). They take NumPy arrays for many rows at once
+# or plain floats for one coordinate of one row, so both evaluation paths share them
+def straight(u, s):
+    """Straight line from start through the center to -start"""
+    return s * (1.0 - 2.0 * u), -2.0 * s
+
+
+def bezier(u, s, c):
+    """Quadratic Bezier from start to -start around the control point"""
+    return (1 - u) ** 2 * s + 2 * (1 - u) * u * c - u ** 2 * s, 2 * (1 - u) * (c - s) - 2 * u * (s + c)
+
+
+def wave(u, s, perpendicular, sin, cos):
+    """The straight line swinging sideways along its unit normal"""
+    phase = 2 * math.pi * WAVE_PERIODS * u
+    swing = perpendicular * WAVE_AMPLITUDE
+    base, base_derivative = straight(u, s)
+    return base + swing * sin(phase), base_derivative + swing * (2 * math.pi * WAVE_PERIODS) * cos(phase)
+
+
+@dataclass
+class RetiredTrack:
+    """What the operator may still want to know about a track that has left the screen"""
+    target_id: int
+    status: str
+    trajectory_type: str
+    creation_time: float
+    retired_time: float
+    last_pos: Tuple[float, float]
+
+
+class TrackStore:
+    """Bounded structure-of-arrays table of the targets: one NumPy call moves every track,
+    rows of finished tracks are recycled through a free list"""
+    # name -> (dtype, trailing shape) of every per-track array
+    FIELDS = {
+        'target_id': (np.int64, ()),
+        'start': (np.float64, (2,)),
+        'control': (np.float64, (2,)),
+        'perpendicular': (np.float64, (2,)),  # Unit normal of the start -> -start line, for the sinusoid
+        'kind': (np.int8, ()),
+        'speed': (np.float64, ()),
+        'created': (np.float64, ()),
+        'status': (np.int8, ()),
+        'active': (np.bool_, ()),
+        'visible': (np.bool_, ()),
+        'last_sweep': (np.float64, ()),
+        'pos': (np.float64, (2,)),
+        'previous_pos': (np.float64, (2,)),
+        'velocity': (np.float64, (2,)),  # Radar units per second
+        'last_trajectory_update': (np.float64, ()),
+        'path_ready': (np.bool_, ()),  # The row of paths holds this track's sampled flight
+    }
+
+    def __init__(self, capacity: int = 64, history_size: int = 100, trajectory_length: int = 512,
+                 trajectory_epsilon: Optional[float] = None):
+        self.capacity = capacity
+        for name, (dtype, shape) in self.FIELDS.items():
+            setattr(self, name, np.zeros((capacity,) + shape, dtype=dtype))
+        self.trajectories = TrajectoryHistory(capacity, trajectory_length, trajectory_epsilon)
+        # Trajectory parameters never change after spawn, so the whole flight is sampled once
+        self.path_progress = np.linspace(0.0, 1.0, PATH_SAMPLES + 1)
+        self.paths = np.zeros((capacity, PATH_SAMPLES + 1, 2), dtype=np.float32)
+        self.size = 0  # Rows ever used: scans stop here
+        self.free_rows = list(range(capacity - 1, -1, -1))  # pop() hands out the lowest row first
+        self.views: List[Optional[MovingObject]] = [None] * capacity
+        self.by_id: Dict[int, MovingObject] = {}  # target_id -> view of an active track
+        self.active_count = 0
+        # Optional bounded log of finished tracks, the oldest are forgotten
+        self.retired: Deque[RetiredTrack] = deque(maxlen=history_size)
+
+    def add(self, target_id: int, start_pos: Sequence[float], control_point: Sequence[float],
+            trajectory_type: str, speed_factor: float, creation_time: float) -> Optional[MovingObject]:
+        """Put a track into a free row and return its view, None when the table is full"""
+        if not self.free_rows:
+            return None
+        row = self.free_rows.pop()
+        self.size = max(self.size, row + 1)
+        self.target_id[row] = target_id
+        self.start[row] = start_pos
+        self.control[row] = control_point
+        self.perpendicular[row] = (start_pos[1], -start_pos[0])
+        self.perpendicular[row] /= np.hypot(start_pos[0], start_pos[1])
+        self.kind[row] = TRAJECTORY_TYPES.index(trajectory_type)
+        self.speed[row] = speed_factor
+        self.created[row] = creation_time
+        self.status[row] = STATUSES.index('unknown')
+        self.active[row] = True
+        self.visible[row] = False
+        self.last_sweep[row] = 0.0
+        self.pos[row] = start_pos
+        self.previous_pos[row] = start_pos
+        self.velocity[row] = 0.0
+        self.last_trajectory_update[row] = 0.0
+        self.trajectories.clear(row)
+        self.path_ready[row] = False
+        view = MovingObject(self, row)
+        self.views[row] = view
+        self.by_id[target_id] = view
+        self.active_count += 1
+        return view
+
+    def get(self, target_id: int) -> Optional[MovingObject]:
+        return self.by_id.get(target_id)
+
+    def active_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.active[:self.size])
+
+    def active_views(self) -> List[MovingObject]:
+        return [self.views[row] for row in self.active_rows().tolist()]
+
+    def retire(self, rows: np.ndarray, current_time: float) -> List[int]:
+        """Free the rows of finished tracks; returns their target ids"""
+        target_ids = []
+        for row in rows.tolist():
+            view = self.views[row]
+            if self.retired.maxlen:
+                self.retired.append(RetiredTrack(view.target_id, view.status, view.trajectory_type,
+                                                 view.creation_time, current_time, (float(self.pos[row, 0]), float(self.pos[row, 1]))))
+            target_ids.append(view.target_id)
+            del self.by_id[view.target_id]
+            self.views[row] = None
+            self.free_rows.append(row)
+        self.active[rows] = False
+        self.active_count -= len(rows)
+        return target_ids
+
+    def evaluate(self, rows: np.ndarray, progress: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions and their derivatives d(pos)/d(progress) of rows at flight progress in [0, 1]"""
+        if len(rows) <= SCALAR_ROWS:
+            return self.evaluate_scalar(rows, progress)
+        # Every formula is evaluated for every row and the right one is selected per row:
+        # branch-free for thousands of rows
+        u = np.clip(progress, 0.0, 1.0)[:, None]
+        s, c = self.start[rows], self.control[rows]
+        kind = self.kind[rows][:, None]
+        line, line_derivative = straight(u, s)
+        curve, curve_derivative = bezier(u, s, c)
+        swing, swing_derivative = wave(u, s, self.perpendicular[rows], np.sin, np.cos)
+        pos = np.where(kind == PARABOLIC, curve, np.where(kind == SINUSOIDAL, swing, line))
+        derivative = np.where(kind == PARABOLIC, curve_derivative,
+                              np.where(kind == SINUSOIDAL, swing_derivative, line_derivative))
+        return pos, derivative
+
+    def evaluate_scalar(self, rows: np.ndarray, progress: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """evaluate() one row and coordinate at a time, only the formula of each row's kind"""
+        pos, derivative = [], []
+        for u, start, control, perpendicular, kind in zip(
+                np.clip(progress, 0.0, 1.0).tolist(), self.start[rows].tolist(), self.control[rows].tolist(),
+                self.perpendicular[rows].tolist(), self.kind[rows].tolist()):
+            if kind == PARABOLIC:
+                (x, dx), (y, dy) = bezier(u, start[0], control[0]), bezier(u, start[1], control[1])
+            elif kind == SINUSOIDAL:
+                (x, dx), (y, dy) = (wave(u, start[0], perpendicular[0], math.sin, math.cos),
+                                    wave(u, start[1], perpendicular[1], math.sin, math.cos))
+            else:
+                (x, dx), (y, dy) = straight(u, start[0]), straight(u, start[1])
+            pos.append((x, y))
+            derivative.append((dx, dy))
+        return np.array(pos, dtype=np.float64).reshape(-1, 2), np.array(derivative, dtype=np.float64).reshape(-1, 2)
+
+    def cached_path(self, row: int) -> np.ndarray:
+        """Whole flight of a track at evenly spaced progress, sampled on first use (e.g. first show)"""
+        if not self.path_ready[row]:
+            self.paths[row], _ = self.evaluate(np.full(PATH_SAMPLES + 1, row), self.path_progress)
+            self.path_ready[row] = True
+        return self.paths[row]
+
+    def path_times(self, row: int) -> np.ndarray:
+        """Simulation time at each sample of cached_path, e.g. for intercept or collision checks"""
+        return self.created[row] + self.path_progress * (FLIGHT_DURATION / self.speed[row])
+
+    def future_path(self, row: int, current_time: float) -> np.ndarray:
+        """Remaining part of the cached path: a slice starting at the last sample already passed"""
+        progress = (current_time - self.created[row]) / FLIGHT_DURATION * self.speed[row]
+        first = min(max(int(progress * PATH_SAMPLES), 0), PATH_SAMPLES)
+        return self.cached_path(row)[first:]
+
+    def progress(self, rows: np.ndarray, current_time: float) -> np.ndarray:
+        return (current_time - self.created[rows]) / FLIGHT_DURATION * self.speed[rows]
+
+    def update(self, current_time: float) -> Tuple[np.ndarray, List[int]]:
+        """Move every active track to current_time and retire finished ones;
+        returns the rows still active and the target ids that were retired"""
+        rows = self.active_rows()
+        progress = self.progress(rows, current_time)
+        finished = progress >= 1.0
+        retired_ids = self.retire(rows[finished], current_time) if finished.any() else []
+        rows, progress = rows[~finished], progress[~finished]
+        pos, derivative = self.evaluate(rows, progress)
+        self.previous_pos[rows] = self.pos[rows]
+        self.pos[rows] = pos
+        self.velocity[rows] = derivative * (self.speed[rows] / FLIGHT_DURATION)[:, None]
+        return rows, retired_ids
@@ -0,0 +1,81 @@
+from typing import Optional
+
+import numpy as np
+
+
+def douglas_peucker(points: np.ndarray, epsilon: float) -> np.ndarray:
+    """Indices of the points kept by Douglas–Peucker simplification of a polyline (endpoints always kept)"""
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        inner = points[first + 1:last]
+        chord = end - start
+        length = np.hypot(chord[0], chord[1])
+        if length == 0:
+            distances = np.hypot(inner[:, 0] - start[0], inner[:, 1] - start[1])
+        else:
+            distances = np.abs(chord[0] * (inner[:, 1] - start[1]) - chord[1] * (inner[:, 0] - start[0])) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > epsilon:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.flatnonzero(keep)
+
+
+class TrajectoryHistory:
+    """Past positions of every track row in one preallocated ring buffer.
+
+    Each point is written twice, at slot and slot + length, so the newest points
+    of a row are always one contiguous slice that can be drawn without copying.
+    """
+    def __init__(self, rows: int, length: int = 512, epsilon: Optional[float] = None):
+        self.length = length  # Points kept per track, memory per track never grows past this
+        self.epsilon = epsilon  # Douglas–Peucker tolerance for older points, None only drops the oldest
+        self.points = np.zeros((rows, 2 * length, 2), dtype=np.float32)
+        self.start = np.zeros(rows, dtype=np.int64)  # Absolute index of the oldest kept point
+        self.end = np.zeros(rows, dtype=np.int64)  # Absolute index of the next point
+        # end before which a full row is not simplified again: the older half could not be, until
+        # half a row of new points has arrived only the oldest point is dropped
+        self.retry_at = np.zeros(rows, dtype=np.int64)
+
+    def clear(self, row: int):
+        self.start[row] = self.end[row] = self.retry_at[row] = 0
+
+    def append(self, rows: np.ndarray, points: np.ndarray):
+        """Add one point to each row"""
+        if self.epsilon is not None:
+            full = (self.end[rows] - self.start[rows] == self.length) & (self.end[rows] >= self.retry_at[rows])
+            for row in rows[full].tolist():
+                self._decimate(row)
+        slots = self.end[rows] % self.length
+        self.points[rows, slots] = points
+        self.points[rows, slots + self.length] = points
+        self.end[rows] += 1
+        self.start[rows] = np.maximum(self.start[rows], self.end[rows] - self.length)
+
+    def _decimate(self, row: int):
+        """Simplify the older half of a full row to make room, keeping the recent half exact"""
+        window = self.view(row)
+        half = self.length // 2
+        kept = douglas_peucker(window[:half + 1], self.epsilon)[:-1]  # The joint point stays with the recent half
+        if len(kept) == half:
+            # Nothing to simplify, the oldest point is dropped as usual
+            self.retry_at[row] = self.end[row] + half
+            return
+        simplified = np.concatenate((window[kept], window[half:]))
+        count = len(simplified)
+        self.points[row, :count] = simplified
+        self.points[row, self.length:self.length + count] = simplified
+        self.start[row], self.end[row] = 0, count
+
+    def view(self, row: int) -> np.ndarray:
+        """Contiguous (n, 2) float32 view of the kept points, oldest first"""
+        first = self.start[row] % self.length
+        return self.points[row, first:first + self.end[row] - self.start[row]]
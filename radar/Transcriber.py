@@ -0,0 +1,141 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from radar.LazyImport import lazy_import, ensure_loaded
+from radar.StartupProfiler import StartupProfiler
+
+torch = lazy_import('torch')
+transformers = lazy_import('transformers')
+
+# Backends selectable with model.backend in config.json
+BACKENDS = ('transformers', 'quantized', 'distilled')
+
+
+class Transcriber(ABC):
+    """Speech-to-text interface used by the radar, the recognition worker and the benchmarks"""
+    name = 'base'
+    sample_rate = 16000
+
+    @abstractmethod
+    def transcribe(self, audio) -> str:
+        """Transcribe a WAV path or float32 mono samples at sample_rate"""
+
+    def transcribe_batch(self, audios: List[Any], batch_size: int = 8) -> List[str]:
+        """Transcribe many recordings; backends that can batch override this"""
+        return [self.transcribe(audio) for audio in audios]
+
+
+class PipelineTranscriber(Transcriber):
+    """Transcriber on top of a transformers automatic-speech-recognition pipeline"""
+    def __init__(self, pipe, name: str = 'transformers', generate_kwargs: Optional[Dict[str, Any]] = None,
+                 sample_rate: int = 16000, constraint=None):
+        self.pipe = pipe
+        self.name = name
+        self.sample_rate = sample_rate
+        self.generate_kwargs = generate_kwargs or {"language": "russian"}
+        # Optional GrammarConstraint limiting decoding to the voice-command grammar
+        self.constraint = constraint
+
+    def to_pipeline_input(self, audio):
+        if isinstance(audio, np.ndarray):
+            # In-memory recording: no WAV round trip, samples go straight to the feature extractor
+            return {"raw": audio, "sampling_rate": self.sample_rate}
+        return str(audio)
+
+    def build_generate_kwargs(self) -> dict:
+        generate_kwargs = dict(self.generate_kwargs)
+        if self.constraint is not None:
+            generate_kwargs.update(self.constraint.generate_kwargs())
+        return generate_kwargs
+
+    def transcribe(self, audio) -> str:
+        text = self.pipe(self.to_pipeline_input(audio), generate_kwargs=self.build_generate_kwargs())
+        print(f'Recognized string: {text}')
+        return text['text']
+
+    def transcribe_batch(self, audios: List[Any], batch_size: int = 8) -> List[str]:
+        # The pipeline pads and stacks the features, so the encoder runs once per batch
+        outputs = self.pipe([self.to_pipeline_input(audio) for audio in audios],
+                            batch_size=batch_size, generate_kwargs=self.build_generate_kwargs())
+        return [output['text'] for output in outputs]
+
+
+def load_model(model_path, quantize=False, profiler=None):
+    profiler = profiler or StartupProfiler()
+    # Heavy imports happen here, on the loader thread, so the window is not held up by them
+    with profiler.step('import torch'):
+        ensure_loaded(torch)
+    with profiler.step('import transformers'):
+        ensure_loaded(transformers)
+
+    device = "cuda:0" if torch.cuda.is_available() else "cpu"
+    torch_dtype = torch.float16 if torch.cuda.is_available() else torch.float32
+    if quantize:
+        # Dynamic int8 quantization only runs on CPU, in float32
+        device, torch_dtype = "cpu", torch.float32
+    print(f'Loading model on: {device}')
+    #model_id = "openai/whisper-large-v3"
+
+    with profiler.step('load whisper weights'):
+        model = transformers.AutoModelForSpeechSeq2Seq.from_pretrained(
+            model_path, 
+            torch_dtype=torch_dtype, 
+            low_cpu_mem_usage=True, 
+            use_safetensors=True,
+            #attn_implementation="flash_attention_2"
+        )
+        model.to(device)
+
+    if quantize:
+        with profiler.step('quantize linear layers to int8'):
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    with profiler.step('build ASR pipeline'):
+        processor = transformers.AutoProcessor.from_pretrained(model_path)
+        pipe = transformers.pipeline(
+            "automatic-speech-recognition",
+            model=model,
+            tokenizer=processor.tokenizer,
+            feature_extractor=processor.feature_extractor,
+            torch_dtype=torch_dtype,
+            device=device,
+        )
+    return model, processor, pipe
+
+
+def get_model_path(model_config: dict, backend: str) -> Path:
+    """The distilled backend uses its own (smaller) checkpoint, the others share models_dir"""
+    if backend == 'distilled':
+        return Path(model_config['distilled_models_dir'])
+    return Path(model_config['models_dir'])
+
+
+def create_grammar_constraint(decoding_config: dict, tokenizer, morph=None):
+    """Grammar-aware decoding from model.constrained_decoding; None when it is off"""
+    mode = decoding_config.get('mode', 'off')
+    if mode == 'off':
+        return None
+    from radar.CommandGrammar import CommandGrammar, GrammarConstraint
+    return GrammarConstraint(
+        CommandGrammar(morph),
+        tokenizer,
+        mode=mode,
+        bias=decoding_config.get('bias', 5.0),
+        max_new_tokens=decoding_config.get('max_new_tokens', 32),
+        stop_on_complete=decoding_config.get('stop_on_complete', True)
+    )
+
+
+def create_transcriber(model_config: dict, backend: Optional[str] = None, profiler=None, sample_rate: int = 16000,
+                       morph=None) -> Transcriber:
+    """Build the transcriber selected by model.backend (or an explicit backend name)"""
+    backend = backend or model_config.get('backend', 'transformers')
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown ASR backend: {backend}. Valid options are: {', '.join(BACKENDS)}")
+    model, processor, pipe = load_model(get_model_path(model_config, backend), quantize=backend == 'quantized', profiler=profiler)
+    # morph (when loaded) lets the grammar cover every inflected form of the command words
+    constraint = create_grammar_constraint(model_config.get('constrained_decoding', {}), processor.tokenizer, morph)
+    return PipelineTranscriber(pipe, name=backend, sample_rate=sample_rate, constraint=constraint)
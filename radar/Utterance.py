@@ -0,0 +1,63 @@
+from typing import List, Optional
+
+from radar.LazyImport import lazy_import
+
+natasha = lazy_import('natasha')
+
+
+class AnalyzedUtterance:
+    """One voice command analyzed once: tokens, normal forms and (only on demand) the syntax tree"""
+    def __init__(self, tokens: List[str], morph, syntax_parser=None, segmenter=None, source_text: Optional[str] = None):
+        self.tokens = tokens
+        self.source_text = source_text if source_text is not None else ' '.join(tokens)
+        self.morph = morph  # MorphCache, so repeated words cost a dictionary lookup
+        self.normal_forms = [morph.normal_form(token) for token in tokens]
+        self.segmenter = segmenter
+        self.syntax_parser = syntax_parser
+        self._doc = None
+        self._syntax_parsed = False
+
+    @classmethod
+    def analyze(cls, text: str, segmenter, morph, syntax_parser=None) -> "AnalyzedUtterance":
+        """Segment raw text once; syntax is left for the `doc` property"""
+        doc = natasha.Doc(text)
+        doc.segment(segmenter)  # Split into sentences and tokens
+        utterance = cls([_.text for _ in doc.tokens], morph, syntax_parser, segmenter, source_text=text)
+        utterance._doc = doc
+        return utterance
+
+    @property
+    def text(self) -> str:
+        return ' '.join(self.tokens)
+
+    @property
+    def doc(self):
+        """natasha Doc with the syntax tree, parsed the first time somebody asks for it"""
+        if self._doc is None:
+            self._doc = natasha.Doc(self.source_text)
+            self._doc.segment(self.segmenter)
+        if self.syntax_parser is not None and not self._syntax_parsed:
+            self._doc.parse_syntax(self.syntax_parser)
+            self._syntax_parsed = True
+        return self._doc
+
+    def derive(self, tokens: List[str]) -> "AnalyzedUtterance":
+        """New utterance over rewritten tokens, sharing this one's tools"""
+        return AnalyzedUtterance(tokens, self.morph, self.syntax_parser, self.segmenter)
+
+    def find_forms(self, word: str) -> List[str]:
+        """Normal forms in the utterance equal to the normal form of word"""
+        normalized_word = self.morph.normal_form(word)
+        return [normal for normal in self.normal_forms if normal == normalized_word]
+
+    def index_of(self, normal_form: str, start: int = 0) -> Optional[int]:
+        for i in range(start, len(self.normal_forms)):
+            if self.normal_forms[i] == normal_form:
+                return i
+        return None
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __repr__(self):
+        return f'AnalyzedUtterance({self.text!r})'
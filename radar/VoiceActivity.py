@@ -0,0 +1,77 @@
+from typing import List, Tuple
+
+import numpy as np
+
+
+class VoiceActivityDetector:
+    """Energy / zero-crossing voice activity detection, vectorized over whole recordings"""
+    def __init__(self, energy_threshold=0.015, zcr_threshold=0.25, frame_ms=20, hangover_ms=200,
+                 min_silence_ms=600, sample_rate=16000):
+        self.energy_threshold = energy_threshold  # RMS of a frame in [-1, 1] samples
+        self.zcr_threshold = zcr_threshold  # Quiet but noisy frames (fricatives) still count as speech
+        self.frame_length = max(1, int(sample_rate * frame_ms / 1000))
+        self.hangover_frames = int(hangover_ms / frame_ms)  # Keep this much audio around speech
+        self.min_silence_frames = max(1, int(min_silence_ms / frame_ms))  # Pause that splits utterances
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def from_config(cls, vad_config: dict, sample_rate=16000):
+        return cls(
+            energy_threshold=vad_config.get("energy_threshold", 0.015),
+            zcr_threshold=vad_config.get("zcr_threshold", 0.25),
+            frame_ms=vad_config.get("frame_ms", 20),
+            hangover_ms=vad_config.get("hangover_ms", 200),
+            min_silence_ms=vad_config.get("min_silence_ms", 600),
+            sample_rate=sample_rate
+        )
+
+    def _frames(self, audio) -> np.ndarray:
+        """Reshape samples (int16 blocks or float32) into zero-padded frames of float32"""
+        if isinstance(audio, list):
+            audio = np.concatenate(audio, axis=0) if audio else np.zeros(0, dtype=np.float32)
+        audio = audio.reshape(len(audio), -1)[:, 0] if audio.ndim > 1 else audio
+        samples = audio.astype(np.float32)
+        if audio.dtype == np.int16:
+            samples /= 32768.0
+        n_frames = -(-len(samples) // self.frame_length)
+        padded = np.zeros(n_frames * self.frame_length, dtype=np.float32)
+        padded[:len(samples)] = samples
+        return padded.reshape(n_frames, self.frame_length)
+
+    def speech_mask(self, audio) -> np.ndarray:
+        """Boolean speech flag per frame"""
+        frames = self._frames(audio)
+        if len(frames) == 0:
+            return np.zeros(0, dtype=bool)
+        energy = np.sqrt(np.mean(frames ** 2, axis=1))
+        zcr = np.mean(np.signbit(frames[:, 1:]) != np.signbit(frames[:, :-1]), axis=1)
+        speech = (energy > self.energy_threshold) | \
+                 ((energy > self.energy_threshold * 0.5) & (zcr > self.zcr_threshold))
+        if self.hangover_frames:
+            window = np.ones(2 * self.hangover_frames + 1)
+            speech = np.convolve(speech.astype(np.float32), window, mode='same') > 0
+        return speech
+
+    def has_speech(self, audio) -> bool:
+        return bool(self.speech_mask(audio).any())
+
+    def trim(self, audio) -> Tuple[np.ndarray, float]:
+        """Drop leading and trailing silence; returns a view of the samples and the seconds dropped"""
+        if isinstance(audio, list):
+            audio = np.concatenate(audio, axis=0) if audio else np.zeros(0, dtype=np.float32)
+        speech_frames = np.flatnonzero(self.speech_mask(audio))
+        if len(speech_frames) == 0:
+            return audio[:0], len(audio) / self.sample_rate
+        start = speech_frames[0] * self.frame_length
+        end = min(len(audio), (speech_frames[-1] + 1) * self.frame_length)
+        return audio[start:end], (len(audio) - (end - start)) / self.sample_rate
+
+    def split(self, audio) -> List[np.ndarray]:
+        """Split a long hold into utterances separated by pauses of at least min_silence_ms"""
+        speech_frames = np.flatnonzero(self.speech_mask(audio))
+        if len(speech_frames) == 0:
+            return []
+        breaks = np.flatnonzero(np.diff(speech_frames) > self.min_silence_frames)
+        starts = np.concatenate(([speech_frames[0]], speech_frames[breaks + 1]))
+        ends = np.concatenate((speech_frames[breaks], [speech_frames[-1]])) + 1
+        return [audio[s * self.frame_length:min(len(audio), e * self.frame_length)] for s, e in zip(starts, ends)]
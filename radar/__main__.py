@@ -2,78 +2,175 @@ import os
 import sys
 import argparse
 import wave
-import numpy as np
-import tokenizers
 from pathlib import Path
 import click, json
-import torch
-from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor, pipeline
-from natasha import Segmenter, MorphVocab, NewsEmbedding, NewsSyntaxParser, Doc
-import pymorphy3
-
-from radar.Radar import Radar
-
-
-def load_model(model_path):
-    device = "cuda:0" if torch.cuda.is_available() else "cpu"
-    print(f'Loading model on: {device}')
-    torch_dtype = torch.float16 if torch.cuda.is_available() else torch.float32
-    #model_id = "openai/whisper-large-v3"
-
-    model = AutoModelForSpeechSeq2Seq.from_pretrained(
-        model_path, 
-        torch_dtype=torch_dtype, 
-        low_cpu_mem_usage=True, 
-        use_safetensors=True,
-        #attn_implementation="flash_attention_2"
-    )
-    model.to(device)
-
-    processor = AutoProcessor.from_pretrained(model_path)
-    pipe = pipeline(
-        "automatic-speech-recognition",
-        model=model,
-        tokenizer=processor.tokenizer,
-        feature_extractor=processor.feature_extractor,
-        torch_dtype=torch_dtype,
-        device=device,
-    )
-    return model, processor, pipe
-
-
-def prepare_NER_parser():
+
+from radar.LazyImport import lazy_import, ensure_loaded
+from radar.MorphCache import MorphCache
+from radar.ModelLoader import ModelLoader
+from radar.StartupProfiler import StartupProfiler
+from radar.Transcriber import create_transcriber, get_model_path, BACKENDS
+
+# NLP stack is imported only when the ASR/NLP subsystem is initialized
+natasha = lazy_import('natasha')
+pymorphy3 = lazy_import('pymorphy3')
+
+
+def create_simulation(simulation_config: dict, seed=None):
+    """Simulation with the configured fixed timestep; the seed is printed so a session can be replayed"""
+    from radar.Simulation import Simulation
+    from radar.SimulationClock import SimulationClock
+    clock = SimulationClock(simulation_config.get('timestep', 0.02), simulation_config.get('max_frame_steps', 5))
+    simulation = Simulation(seed if seed is not None else simulation_config.get('seed'), clock,
+                            max_objects=simulation_config.get('max_objects', 10),
+                            retired_history=simulation_config.get('retired_history', 100),
+                            trajectory_length=simulation_config.get('trajectory_length', 512),
+                            trajectory_epsilon=simulation_config.get('trajectory_epsilon'))
+    print(f'Simulation seed: {simulation.seed}')
+    return simulation
+
+
+def prepare_NER_parser(profiler=None):
+    profiler = profiler or StartupProfiler()
+    with profiler.step('import natasha'):
+        ensure_loaded(natasha)
+    with profiler.step('import pymorphy3'):
+        ensure_loaded(pymorphy3)
+
     # Initialize Natasha tools
-    segmenter = Segmenter()  # Splits text into tokens and sentences
-    morph_vocab = MorphVocab()  # Helps normalize token forms
-    emb = NewsEmbedding()  # Pre-trained embeddings for Russian
-    syntax_parser = NewsSyntaxParser(emb)  # Parses syntax tree
+    with profiler.step('load natasha models'):
+        segmenter = natasha.Segmenter()  # Splits text into tokens and sentences
+        morph_vocab = natasha.MorphVocab()  # Helps normalize token forms
+        emb = natasha.NewsEmbedding()  # Pre-trained embeddings for Russian
+        syntax_parser = natasha.NewsSyntaxParser(emb)  # Parses syntax tree
 
     # Initialize morphological analyzer
-    morph = pymorphy3.MorphAnalyzer()
+    with profiler.step('load pymorphy3 dictionaries'):
+        morph = MorphCache(pymorphy3.MorphAnalyzer())
+    with profiler.step('warm morphology cache'):
+        from radar.CommandGrammar import command_words
+        morph.warm(command_words())
     
     return segmenter, syntax_parser, morph
     
  
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option('--config', required=True, type=Path, default="config.json", help='Directory containing config for running model and other params.')
-def main(config: Path):
+@click.option('--profile-startup', is_flag=True, default=False, help='Print how long each import and load step took.')
+@click.pass_context
+def main(ctx, config: Path, profile_startup: bool):
+    ctx.obj = {'config': config}
+    if ctx.invoked_subcommand is None:
+        run_radar(config, profile_startup)
+
+
+def run_radar(config: Path, profile_startup: bool):
     try:
+        profiler = StartupProfiler(profile_startup)
         with open(config) as f:
             config_json = json.loads(f.read())
-            models_dir = Path(config_json['model']['models_dir'])
+            models_dir = get_model_path(config_json['model'], config_json['model'].get('backend', 'transformers'))
             if not models_dir.exists():
                 print(f'Folder with model {str(models_dir)} doesn\'t exist')
                 exit(1)
             dir_to_save_wav = config_json['dir_to_save_wav']
-            model, preprocessor, pipe = load_model(models_dir)
-            print('Model loaded successfully')
-            segmenter, syntax_parser, morph = prepare_NER_parser()
-            radar = Radar(dir_to_save_wav, pipe, segmenter, syntax_parser, morph)
+            # Models load in the background, the radar is usable right away
+            # NLP is loaded first, so the ASR grammar can use its morphological analyzer
+            model_loader = ModelLoader(
+                load_asr=lambda: create_transcriber(
+                    config_json['model'], profiler=profiler,
+                    sample_rate=config_json.get('audio', {}).get('sample_rate', 16000),
+                    morph=model_loader.morph),
+                load_nlp=lambda: prepare_NER_parser(profiler),
+                profiler=profiler
+            )
+            model_loader.start()
+            with profiler.step('import radar display'):
+                from radar.Radar import Radar
+            with profiler.step('open radar window'):
+                radar = Radar(dir_to_save_wav, model_loader, audio_config=config_json.get('audio', {}),
+                              simulation=create_simulation(config_json.get('simulation', {})),
+                              display_config=config_json.get('display', {}))
             radar.run()
     except Exception as e:
         #print(str(e))
         import traceback
         traceback.print_exc()
 
+
+@main.command('benchmark-asr')
+@click.option('--wav-dir', required=True, type=Path, help='Folder with saved <uuid>.wav commands (optional <uuid>.txt references).')
+@click.option('--backend', 'backends', multiple=True, type=click.Choice(BACKENDS), help='Backend to compare, repeatable (default: all).')
+@click.option('--limit', type=int, default=None, help='Only use the first N recordings.')
+@click.pass_context
+def benchmark_asr(ctx, wav_dir: Path, backends, limit):
+    """Compare real-time factor and command accuracy of the ASR backends"""
+    from radar.AsrBenchmark import run_asr_benchmark, find_recordings
+    with open(ctx.obj['config']) as f:
+        config_json = json.loads(f.read())
+    recordings = find_recordings(wav_dir, limit)
+    if not recordings:
+        print(f'No WAV files in {wav_dir}')
+        exit(1)
+    nlp = prepare_NER_parser()
+    run_asr_benchmark(lambda backend: create_transcriber(config_json['model'], backend, morph=nlp[2]),
+                      list(backends) or list(BACKENDS), recordings, nlp)
+
+@main.command('replay')
+@click.option('--wav-dir', required=True, type=Path, help='Folder with saved <uuid>.wav commands.')
+@click.option('--output', type=Path, default=Path('replay_report.jsonl'), help='JSONL report, one line per file.')
+@click.option('--batch-size', default=8, help='Recordings per ASR pipeline batch.')
+@click.option('--workers', default=max(1, (os.cpu_count() or 2) - 1), help='Processes for the NLP stage.')
+@click.option('--backend', type=click.Choice(BACKENDS), default=None, help='ASR backend (default: model.backend).')
+@click.option('--limit', type=int, default=None, help='Only replay the first N recordings.')
+@click.pass_context
+def replay_command(ctx, wav_dir: Path, output: Path, batch_size: int, workers: int, backend, limit):
+    """Reprocess saved recordings without the display and report transcripts, commands and timings"""
+    from radar.AsrBenchmark import find_recordings
+    from radar.Replay import replay
+    from radar.VoiceActivity import VoiceActivityDetector
+    with open(ctx.obj['config']) as f:
+        config_json = json.loads(f.read())
+    recordings = find_recordings(wav_dir, limit)
+    if not recordings:
+        print(f'No WAV files in {wav_dir}')
+        exit(1)
+    audio_config = config_json.get('audio', {})
+    vad = None
+    if audio_config.get('vad', {}).get('enabled', False):
+        vad = VoiceActivityDetector.from_config(audio_config['vad'], audio_config.get('sample_rate', 16000))
+    # The constrained decoder needs the morphology to expand the command vocabulary
+    segmenter, syntax_parser, morph = prepare_NER_parser()
+    transcriber = create_transcriber(config_json['model'], backend, sample_rate=audio_config.get('sample_rate', 16000),
+                                     morph=morph)
+    replay(transcriber, recordings, output, batch_size=batch_size, workers=workers, vad=vad)
+
+
+@main.command('simulate')
+@click.option('--seconds', type=float, default=60.0, help='Simulated seconds to run.')
+@click.option('--seed', type=int, default=None, help='RNG seed (default: simulation.seed from the config, else random).')
+@click.option('--command', 'commands', multiple=True, help='Text voice command to apply before the run, repeatable.')
+@click.pass_context
+def simulate_command(ctx, seconds: float, seed, commands):
+    """Run the radar simulation faster than real time without a window (no pygame/OpenGL)"""
+    import time
+    with open(ctx.obj['config']) as f:
+        config_json = json.loads(f.read())
+    simulation = create_simulation(config_json.get('simulation', {}), seed)
+    if commands:
+        from radar.AlgorithmRecognition import AlgorithmRecognizer
+        recognizer = AlgorithmRecognizer(simulation, *prepare_NER_parser())
+        for command in commands:
+            recognizer.recognize(command.lower())
+    started = time.perf_counter()
+    steps = simulation.run_headless(seconds)
+    elapsed = time.perf_counter() - started
+    active = simulation.tracks.active_count
+    print(f'{steps} ticks in {elapsed:.2f}s ({steps / elapsed:.0f} ticks/s, {seconds / elapsed:.0f}x real time): '
+          f'{simulation.next_target_id - 1} targets spawned, {active} active, {len(simulation.tracks.retired)} in history, '
+          f'{len(simulation.polygon_manager.get_polygons())} polygons, {len(simulation.polygon_manager.get_sectors())} sectors')
+    print(f'State digest: {simulation.state_digest()}')
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,4 @@
 from setuptools import setup, find_packages
-import radar
 
 
 def parse_requirements(filename):
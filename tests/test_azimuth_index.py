@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from radar.AzimuthIndex import AzimuthIndex, in_arc
+from radar.Simulation import Simulation
+
+
+def tracks(count, seed=0):
+    rng = np.random.default_rng(seed)
+    angles = rng.uniform(0, 2 * np.pi, count)
+    radii = rng.uniform(0.1, 1.9, count)
+    rows = rng.permutation(count * 2)[:count]  # Rows of a track table are not contiguous
+    positions = np.column_stack((radii * np.cos(angles), radii * np.sin(angles)))
+    # Tracks exactly on bucket borders and on 0 degrees
+    positions[:4] = [(1.0, 0.0), (0.0, 1.0), (-1.0, -1e-17), (np.cos(np.radians(5.0)), np.sin(np.radians(5.0)))]
+    return rows, positions
+
+
+def brute_force(rows, positions, start, end):
+    if end - start >= 360.0:
+        return set(rows.tolist())
+    azimuth = np.degrees(np.arctan2(positions[:, 1], positions[:, 0])) % 360
+    return set(rows[in_arc(azimuth, start % 360.0, end % 360.0)].tolist())
+
+
+def test_in_arc_wraps_across_zero():
+    azimuth = np.array([0.0, 10.0, 180.0, 350.0, 359.9])
+    np.testing.assert_array_equal(in_arc(azimuth, 340.0, 20.0), [True, True, False, True, True])
+    np.testing.assert_array_equal(in_arc(azimuth, 5.0, 200.0), [False, True, True, False, False])
+
+
+def test_rebuild_groups_rows_by_bucket():
+    rows, positions = tracks(200)
+    index = AzimuthIndex(buckets=72)
+    index.rebuild(rows, positions)
+    assert sorted(index.rows.tolist()) == sorted(rows.tolist())
+    assert index.offsets[0] == 0 and index.offsets[-1] == len(rows)
+    assert np.all(np.diff(index.offsets) >= 0)
+    for bucket in range(72):
+        azimuth = index.azimuth[index.offsets[bucket]:index.offsets[bucket + 1]]
+        assert np.all((azimuth >= bucket * 5.0) & (azimuth < (bucket + 1) * 5.0 + 1e-9))
+
+
+@pytest.mark.parametrize('start, end', [
+    (10.0, 30.0), (-20.0, 0.0), (340.0, 380.0), (-25.0, 12.0), (0.0, 5.0), (5.0, 5.0),
+    (100.0, 297.0), (-180.0, 150.0), (0.0, 360.0), (-20.0, 400.0),
+])
+def test_query_matches_a_brute_force_scan(start, end):
+    rows, positions = tracks(300, seed=1)
+    index = AzimuthIndex(buckets=72)
+    index.rebuild(rows, positions)
+    assert set(index.query(start, end).tolist()) == brute_force(rows, positions, start, end)
+    assert index.count(start, end) == len(brute_force(rows, positions, start, end))
+
+
+def test_random_arcs_match_a_brute_force_scan():
+    rows, positions = tracks(150, seed=2)
+    index = AzimuthIndex(buckets=36)
+    index.rebuild(rows, positions)
+    rng = np.random.default_rng(3)
+    for start, width in zip(rng.uniform(-360, 360, 200), rng.uniform(0, 120, 200)):
+        assert set(index.query(start, start + width).tolist()) == brute_force(rows, positions, start, start + width)
+
+
+@pytest.mark.parametrize('radar_speed', [5.0, 37.0, 97.0, 400.0])
+def test_fast_sweep_reveals_every_target_it_crosses(radar_speed):
+    simulation = Simulation(seed=3)
+    simulation.radar_speed = radar_speed
+    for _ in range(200):
+        # Targets move first, then the sweep turns: this tick reveals the arc crossed by the last turn
+        start, end = simulation.angle - 20, simulation.angle + simulation.sweep_step
+        simulation.step()
+        rows = simulation.tracks.active_rows()
+        swept = brute_force(rows, simulation.tracks.pos[rows], start, end)
+        assert all(simulation.tracks.visible[row] for row in swept)
@@ -0,0 +1,84 @@
+import pytest
+
+from radar.CommandRegistry import CommandRegistry, Slot, find_in_order
+from radar.Utterance import AnalyzedUtterance
+
+
+class Lemmas:
+    """Normal forms from a fixed table, words missing from it are their own normal form"""
+    def __init__(self, forms=None):
+        self.forms = forms or {}
+
+    def normal_form(self, word):
+        return self.forms.get(word, word)
+
+
+def utterance(text, forms=None):
+    return AnalyzedUtterance(text.split(), Lemmas(forms))
+
+
+@pytest.fixture
+def registry():
+    registry = CommandRegistry()
+    registry.register('set_status', [('цель',)], [Slot('obj_id'), Slot('type_obj', 'word', ['враг', 'союзник'])],
+                      lambda obj_id, type_obj: None)
+    registry.register('group_status', [('цель', 'группа')], [Slot('group_id')], lambda group_id: None)
+    registry.register('show_trajectory', [('показать', 'трасса')], [], lambda: None)
+    registry.register('create_sector', [('создать', 'сектор')],
+                      [Slot('distance_km'), Slot('angle_degrees'), Slot('sector_type', 'word', ['ветер'])],
+                      lambda distance_km, angle_degrees, sector_type: None, gaps=True)
+    return registry
+
+
+def test_earliest_trigger_wins(registry):
+    assert registry.match(utterance('показать трасса цель 5 враг')).name == 'show_trajectory'
+    assert registry.match(utterance('цель 5 враг показать трасса')).name == 'set_status'
+
+
+def test_longest_trigger_wins_at_the_same_start(registry):
+    match = registry.match(utterance('цель группа 3'))
+    assert match.name == 'group_status'
+    assert match.slots == {'group_id': 3}
+
+
+def test_slots_are_filled_in_order_after_the_trigger(registry):
+    match = registry.match(utterance('цель 12 врага', {'врага': 'враг'}))
+    assert match.name == 'set_status'
+    assert match.slots == {'obj_id': 12, 'type_obj': 'враг'}
+    assert match.complete
+    # Numbers before the trigger do not fill its slots
+    assert registry.match(utterance('7 цель союзник')).slots == {'type_obj': 'союзник'}
+
+
+def test_missing_slots_are_reported(registry):
+    match = registry.match(utterance('создать сектор 10 ветер'))
+    assert match.slots == {'distance_km': 10, 'sector_type': 'ветер'}
+    assert match.missing == ['angle_degrees']
+    assert not match.complete
+
+
+def test_gapped_trigger_allows_words_between_lemmas(registry):
+    match = registry.match(utterance('создать новый сектор 10 90 ветер'))
+    assert match.name == 'create_sector'
+    assert match.start == 0
+    assert match.slots == {'distance_km': 10, 'angle_degrees': 90, 'sector_type': 'ветер'}
+
+
+def test_contiguous_trigger_needs_adjacent_lemmas(registry):
+    assert registry.match(utterance('показать мне трасса')) is None
+    assert registry.match(utterance('ничего')) is None
+
+
+def test_find_in_order():
+    assert find_in_order(['а', 'создать', 'x', 'сектор', 'y'], ('создать', 'сектор')) == (1, 4)
+    assert find_in_order(['сектор', 'создать'], ('создать', 'сектор')) is None
+    assert find_in_order(['создать', 'создать', 'сектор'], ('создать', 'сектор')) == (0, 3)
+
+
+def test_recognizer_accepts_create_new_sector():
+    pymorphy3 = pytest.importorskip('pymorphy3')
+    from radar.AlgorithmRecognition import AlgorithmRecognizer
+    recognizer = AlgorithmRecognizer(None, None, None, pymorphy3.MorphAnalyzer())
+    match = recognizer.commands.match(AnalyzedUtterance('создайте новый сектор 10 90 ветер'.split(), recognizer.morph))
+    assert match.name == 'create_sector'
+    assert match.complete
@@ -0,0 +1,121 @@
+import random
+
+import pytest
+
+from radar.NumberParser import NUM_WORDS, TRANSDUCER, convert_number_tokens, words_to_number
+
+WORD_BY_VALUE = {}
+for word, value in NUM_WORDS.items():
+    WORD_BY_VALUE.setdefault(value, word)  # Keeps "один"/"два" over "одна"/"две"
+
+
+def spell(number: int):
+    """Normal forms of a number below 10^12, e.g. 2300 -> ['два', 'тысяча', 'триста']"""
+    if number == 0:
+        return [WORD_BY_VALUE[0]]
+    words = []
+    for multiplier in (1_000_000_000, 1_000_000, 1000, 1):
+        group, number = divmod(number, multiplier)
+        if not group:
+            continue
+        hundreds, rest = divmod(group, 100)
+        if hundreds:
+            words.append(WORD_BY_VALUE[hundreds * 100])
+        if rest >= 20:
+            words.append(WORD_BY_VALUE[rest - rest % 10])
+            rest %= 10
+        if rest:
+            words.append(WORD_BY_VALUE[rest])
+        if multiplier > 1:
+            words.append(WORD_BY_VALUE[multiplier])
+    return words
+
+
+def rewrite(text: str) -> str:
+    """Rewrite a command given in normal forms"""
+    tokens = text.split()
+    return ' '.join(convert_number_tokens(tokens, tokens))
+
+
+@pytest.fixture(scope='module')
+def morph():
+    pymorphy3 = pytest.importorskip('pymorphy3')
+    from radar.MorphCache import MorphCache
+    return MorphCache(pymorphy3.MorphAnalyzer())
+
+
+@pytest.mark.parametrize('number', [0, 7, 13, 40, 99, 100, 305, 1000, 2300, 21_015, 1_000_000, 1_200_000,
+                                    2_000_300_015, 999_999_999_999])
+def test_round_trip(number):
+    words = spell(number)
+    assert TRANSDUCER.rewrite(words, words) == [str(number)]
+
+
+def test_random_round_trips():
+    rng = random.Random(0)
+    for _ in range(2000):
+        number = rng.choice([rng.randrange(100), rng.randrange(1000), rng.randrange(10 ** 6), rng.randrange(10 ** 11)])
+        other = rng.randrange(1000)
+        words = spell(number) + ['градус'] + spell(other)
+        assert TRANSDUCER.rewrite(words, words) == [str(number), 'градус', str(other)], ' '.join(words)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('двух тысяч', '2000'),
+    ('курс двухсот сорока пяти градусов', 'курс 245 градусов'),
+    ('одна тысяча трёхсот', '1300'),
+    ('пятью', '5'),
+])
+def test_inflected_forms(morph, text, expected):
+    tokens = text.split()
+    assert ' '.join(convert_number_tokens(tokens, [morph.normal_form(token) for token in tokens])) == expected
+
+
+def test_words_to_number_uses_normal_forms(morph):
+    assert words_to_number(['двух', 'тысяч', 'двадцати'], morph) == 2020
+    assert words_to_number(['курс'], morph) == 0
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('тысяча и один', '1001'),
+    ('двадцать и пять', '25'),
+    ('пять и шесть', '5 и 6'),
+    ('пять и', '5 и'),
+    ('и пять', 'и 5'),
+    ('сто и и два', '100 и и 2'),
+    ('цель один и цель два', 'цель 1 и цель 2'),
+])
+def test_and(text, expected):
+    assert rewrite(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('десять девяносто', '10 90'),
+    ('девяносто десять', '90 10'),
+    ('сто двести', '100 200'),
+    ('два два', '2 2'),
+    ('тысяча тысяча', '1000 1000'),
+    ('двадцать один тридцать', '21 30'),
+])
+def test_separate_runs(text, expected):
+    assert rewrite(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('ноль', '0'),
+    ('ноль пять', '0 5'),
+    ('пять ноль', '5 0'),
+    ('курс ноль ноль', 'курс 0 0'),
+])
+def test_zero(text, expected):
+    assert rewrite(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('пять градус пять', '5 градус 5'),
+    ('цель два курс два', 'цель 2 курс 2'),
+    ('цель двадцать курс два скорость двадцать', 'цель 20 курс 2 скорость 20'),
+])
+def test_repeated_words(text, expected):
+    # Every occurrence is rewritten in place, not only the first one in the text
+    assert rewrite(text) == expected
@@ -0,0 +1,42 @@
+import pytest
+
+from radar.SimulationClock import SimulationClock
+
+
+def test_tick_counts_from_start():
+    clock = SimulationClock(dt=0.02, start=100.0)
+    assert clock.tick() == pytest.approx(100.02)
+    assert clock.tick() == pytest.approx(100.04)
+    assert clock.ticks == 2
+
+
+def test_tick_does_not_drift():
+    clock = SimulationClock(dt=0.1)
+    for _ in range(1000):
+        clock.tick()
+    assert clock.time == 1000 * 0.1
+
+
+def test_advance_keeps_the_remainder():
+    clock = SimulationClock(dt=0.02)
+    assert clock.advance(0.05) == 2
+    assert clock.accumulator == pytest.approx(0.01)
+    assert clock.advance(0.01) == 1
+    assert clock.accumulator == pytest.approx(0.0)
+
+
+def test_advance_clamps_a_stalled_frame():
+    clock = SimulationClock(dt=0.02, max_frame_steps=5)
+    assert clock.advance(1.0) == 5
+    assert clock.accumulator == 0.0  # The backlog is dropped, not carried into the next frames
+    assert clock.advance(0.02) == 1
+
+
+def test_alpha_and_render_time():
+    clock = SimulationClock(dt=0.02, start=10.0)
+    clock.tick()
+    clock.advance(0.005)
+    assert clock.alpha == pytest.approx(0.25)
+    assert clock.render_time() == pytest.approx(10.02 - 0.75 * 0.02)
+    clock.accumulator = 0.05  # Can only exceed dt when set by hand, alpha stays clamped
+    assert clock.alpha == 1.0
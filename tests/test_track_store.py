@@ -0,0 +1,60 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+import radar.TrackStore as track_store
+from radar.TrackStore import TrackStore, TRAJECTORY_TYPES
+
+
+def build(count, seed=0):
+    """A store with count tracks of every trajectory kind, spawned at different times"""
+    rng = random.Random(seed)
+    store = TrackStore(count + 4)
+    for target_id in range(count):
+        angle = rng.uniform(0, 2 * math.pi)
+        store.add(target_id, (1.9 * math.cos(angle), 1.9 * math.sin(angle)), (rng.uniform(-1, 1), rng.uniform(-1, 1)),
+                  TRAJECTORY_TYPES[target_id % len(TRAJECTORY_TYPES)], rng.uniform(0.3, 1.0), rng.uniform(0.0, 2.0))
+    return store
+
+
+@pytest.mark.parametrize('progress', [0.0, 0.1, 0.37, 0.5, 0.99, 1.0, 1.5])
+def test_scalar_and_numpy_evaluate_agree(progress):
+    store = build(12)
+    rows = store.active_rows()
+    at = np.full(len(rows), progress)
+    expected_pos, expected_derivative = store.evaluate(np.repeat(rows, 3), np.repeat(at, 3))  # Above SCALAR_ROWS
+    pos, derivative = store.evaluate_scalar(rows, at)
+    np.testing.assert_array_equal(pos, expected_pos[::3])
+    np.testing.assert_array_equal(derivative, expected_derivative[::3])
+
+
+def test_small_stores_update_like_the_numpy_path(monkeypatch):
+    looped, batched = build(track_store.SCALAR_ROWS), build(track_store.SCALAR_ROWS)
+    for now in (0.5, 1.0, 2.0, 3.5, 5.0, 8.0, 12.0):
+        rows, retired = looped.update(now)
+        monkeypatch.setattr(track_store, 'SCALAR_ROWS', 0)
+        expected_rows, expected_retired = batched.update(now)
+        monkeypatch.undo()
+        np.testing.assert_array_equal(rows, expected_rows)
+        assert retired == expected_retired
+        np.testing.assert_array_equal(looped.active, batched.active)
+        np.testing.assert_array_equal(looped.status, batched.status)
+        np.testing.assert_array_equal(looped.pos, batched.pos)
+        np.testing.assert_array_equal(looped.previous_pos, batched.previous_pos)
+        np.testing.assert_array_equal(looped.velocity, batched.velocity)
+    assert looped.active_count == 0
+
+
+def test_finished_tracks_are_retired_and_rows_reused():
+    store = TrackStore(2)
+    store.add(1, (1.0, 0.0), (0.0, 0.5), 'straight', 1.0, 0.0)
+    store.add(2, (0.0, 1.0), (0.5, 0.0), 'parabolic', 0.5, 0.0)
+    rows, retired = store.update(3.0)
+    assert retired == [1]
+    assert store.get(1) is None and store.get(2) is not None
+    assert store.retired[-1].target_id == 1
+    view = store.add(3, (-1.0, 0.0), (0.0, 0.0), 'sinusoidal', 1.0, 3.0)
+    assert view.row == 0
+    np.testing.assert_array_equal(rows, [1])
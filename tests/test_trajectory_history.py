@@ -0,0 +1,73 @@
+import numpy as np
+
+import radar.TrajectoryHistory as trajectory_history
+from radar.TrajectoryHistory import TrajectoryHistory, douglas_peucker
+
+
+def fill(history, row, points):
+    for point in points:
+        history.append(np.array([row]), np.array([point], dtype=np.float32))
+
+
+def zigzag(count):
+    """Points no simplification can drop"""
+    return [(float(i), float(i % 2)) for i in range(count)]
+
+
+def test_ring_wrap_keeps_the_newest_points():
+    history = TrajectoryHistory(2, length=8)
+    points = [(float(i), -float(i)) for i in range(21)]
+    fill(history, 1, points)
+    np.testing.assert_array_equal(history.view(1), np.array(points[-8:], dtype=np.float32))
+    assert len(history.view(0)) == 0
+
+
+def test_view_is_contiguous_without_copy():
+    history = TrajectoryHistory(1, length=8)
+    fill(history, 0, [(float(i), 0.0) for i in range(13)])
+    view = history.view(0)
+    assert view.flags['C_CONTIGUOUS']
+    assert np.shares_memory(view, history.points)
+    # Every slot is written twice, so the window can start anywhere in the first copy
+    first = history.start[0] % history.length
+    np.testing.assert_array_equal(history.points[0, first:history.length],
+                                  history.points[0, first + history.length:2 * history.length])
+
+
+def test_clear_empties_a_row():
+    history = TrajectoryHistory(1, length=4)
+    fill(history, 0, zigzag(6))
+    history.clear(0)
+    assert len(history.view(0)) == 0
+    fill(history, 0, [(5.0, 5.0)])
+    np.testing.assert_array_equal(history.view(0), [[5.0, 5.0]])
+
+
+def test_douglas_peucker_keeps_corners():
+    points = np.array([(0, 0), (1, 0.01), (2, 0), (2, 1), (2, 2)], dtype=np.float32)
+    np.testing.assert_array_equal(douglas_peucker(points, 0.1), [0, 2, 4])
+
+
+def test_decimation_simplifies_the_older_half():
+    history = TrajectoryHistory(1, length=16, epsilon=0.01)
+    line = [(float(i), 0.0) for i in range(16)]
+    fill(history, 0, line)
+    fill(history, 0, [(16.0, 1.0)])
+    # The straight older half collapses to its first point, the recent half stays exact
+    expected = [line[0]] + line[8:] + [(16.0, 1.0)]
+    np.testing.assert_array_equal(history.view(0), np.array(expected, dtype=np.float32))
+
+
+def test_decimation_is_not_retried_on_every_append(monkeypatch):
+    calls = []
+
+    def counting(points, epsilon):
+        calls.append(len(points))
+        return douglas_peucker(points, epsilon)
+    monkeypatch.setattr(trajectory_history, 'douglas_peucker', counting)
+    history = TrajectoryHistory(1, length=16, epsilon=0.01)
+    points = zigzag(16 + 24)
+    fill(history, 0, points)
+    # Tried when the row filled up, then only after another half row of points
+    assert len(calls) == 3
+    np.testing.assert_array_equal(history.view(0), np.array(points[-16:], dtype=np.float32))
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from radar.Transcriber import Transcriber
+
+
+def test_backend_without_transcribe_fails_on_creation():
+    class Incomplete(Transcriber):
+        name = 'incomplete'
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_transcribe_batch_defaults_to_one_call_per_recording():
+    class Lengths(Transcriber):
+        def transcribe(self, audio) -> str:
+            return str(len(audio))
+
+    audios = [np.zeros(3, dtype=np.float32), np.zeros(16000, dtype=np.float32)]
+    assert Lengths().transcribe_batch(audios) == ['3', '16000']